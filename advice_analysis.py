@@ -5,23 +5,23 @@ from datetime import datetime
 
 def analyze_prediction_advice_categories():
     """
-    Extrait les différentes catégories de conseils (partie avant les ':') 
-    depuis la table Prediction et les sauvegarde dans un CSV
+    Compte les prédictions par catégorie de conseil (Prediction.advice_category,
+    partie avant les ':' renseignée à la synchronisation) et les sauvegarde dans un CSV
     """
     try:
         # Connexion à la base de données
         conn = sqlite3.connect('data/football.db')
         cursor = conn.cursor()
         
-        # Requête pour obtenir les catégories d'advice avec leur fréquence
+        # Requête pour obtenir les catégories d'advice avec leur fréquence (groupement sur l'index)
         query = """
         SELECT 
-            TRIM(substr(advice, 1, instr(advice, ':') - 1)) as category,
+            advice_category as category,
             COUNT(*) as count
         FROM predictions 
-        WHERE advice IS NOT NULL 
-            AND advice LIKE '%:%'
-        GROUP BY TRIM(substr(advice, 1, instr(advice, ':') - 1))
+        WHERE advice_category IS NOT NULL
+            AND advice_selection IS NOT NULL
+        GROUP BY advice_category
         ORDER BY count DESC;
         """
         
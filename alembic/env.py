@@ -17,10 +17,15 @@ data_dir.mkdir(exist_ok=True)
 
 # Import des modèles
 from app.models.base import Base
+from app.models.api_usage import ApiUsage
 from app.models.league import League, Season
 from app.models.match import Match
 from app.models.odds import OddsBookmaker, OddsValue
 from app.models.prediction import Prediction, PredictionComparison, PredictionTeam
+from app.models.prediction_accuracy import PredictionAccuracy
+from app.models.sync_job import SyncJob
+from app.models.sync_state import SyncState
+from app.models.sync_stats import SyncStats
 
 
 # this is the Alembic Config object
@@ -0,0 +1,52 @@
+"""ajout categorie et selection d'advice sur predictions
+
+Revision ID: 2382e94a99ff
+Revises: dd71ec617e72
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '2382e94a99ff'
+down_revision: Union[str, None] = 'dd71ec617e72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+def _parse_advice(advice):
+    """Copie de predictions_service.parse_advice (la migration ne dépend pas du code applicatif)"""
+    if not advice or not advice.strip():
+        return None, None
+    category, separator, selection = advice.partition(':')
+    if not separator:
+        return advice.strip(), None
+    return category.strip() or None, selection.strip() or None
+
+def upgrade() -> None:
+    op.add_column('predictions', sa.Column('advice_category', sa.String(length=50), nullable=True))
+    op.add_column('predictions', sa.Column('advice_selection', sa.String(length=255), nullable=True))
+
+    # Renseigner les prédictions existantes
+    conn = op.get_bind()
+    rows = conn.execute(text("SELECT id, advice FROM predictions WHERE advice IS NOT NULL")).fetchall()
+    updates = []
+    for prediction_id, advice in rows:
+        category, selection = _parse_advice(advice)
+        updates.append({"id": prediction_id, "category": category, "selection": selection})
+    for i in range(0, len(updates), BATCH_SIZE):
+        conn.execute(
+            text("UPDATE predictions SET advice_category = :category, advice_selection = :selection WHERE id = :id"),
+            updates[i:i + BATCH_SIZE]
+        )
+
+    op.create_index(op.f('ix_predictions_advice_category'), 'predictions', ['advice_category'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_predictions_advice_category'), table_name='predictions')
+    op.drop_column('predictions', 'advice_selection')
+    op.drop_column('predictions', 'advice_category')
@@ -0,0 +1,51 @@
+"""ajout table sync_jobs
+
+Revision ID: 33acd9cea0f4
+Revises: 41bcf1dccccd
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '33acd9cea0f4'
+down_revision: Union[str, None] = '41bcf1dccccd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table('sync_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('params', sa.Text(), nullable=True),
+        sa.Column('progress_done', sa.Integer(), nullable=False),
+        sa.Column('progress_total', sa.Integer(), nullable=True),
+        sa.Column('message', sa.String(length=255), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+        sa.Column('worker', sa.String(length=100), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_jobs_type_status'), 'sync_jobs', ['job_type', 'status'], unique=False)
+    op.create_index(op.f('ix_sync_jobs_status_id'), 'sync_jobs', ['status', 'id'], unique=False)
+    # Une seule tâche en attente ou en cours par type, garanti par la base (voir submit_job)
+    active = sa.text("status IN ('pending', 'running')")
+    op.create_index(
+        op.f('ix_sync_jobs_active_type'), 'sync_jobs', ['job_type'], unique=True,
+        sqlite_where=active, postgresql_where=active
+    )
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sync_jobs_active_type'), table_name='sync_jobs')
+    op.drop_index(op.f('ix_sync_jobs_status_id'), table_name='sync_jobs')
+    op.drop_index(op.f('ix_sync_jobs_type_status'), table_name='sync_jobs')
+    op.drop_table('sync_jobs')
@@ -0,0 +1,32 @@
+"""ajout table api_usage
+
+Revision ID: 3d34955e2f56
+Revises: 5eda0e9af196
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3d34955e2f56'
+down_revision: Union[str, None] = '5eda0e9af196'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table('api_usage',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('calls_made', sa.Integer(), nullable=False),
+        sa.Column('reset_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_api_usage_date'), 'api_usage', ['date'], unique=True)
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_api_usage_date'), table_name='api_usage')
+    op.drop_table('api_usage')
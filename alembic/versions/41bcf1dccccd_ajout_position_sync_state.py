@@ -0,0 +1,22 @@
+"""ajout position sync_state
+
+Revision ID: 41bcf1dccccd
+Revises: dbd3e2a05511
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '41bcf1dccccd'
+down_revision: Union[str, None] = 'dbd3e2a05511'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column('sync_state', sa.Column('position', sa.Integer(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('sync_state', 'position')
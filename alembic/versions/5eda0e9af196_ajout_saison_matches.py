@@ -0,0 +1,37 @@
+"""ajout saison sur matches
+
+Revision ID: 5eda0e9af196
+Revises: 1f65acdd9a4c
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '5eda0e9af196'
+down_revision: Union[str, None] = '1f65acdd9a4c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column('matches', sa.Column('season', sa.Integer(), nullable=True))
+
+    # Renseigner la saison des matchs existants d'après les dates des saisons
+    conn = op.get_bind()
+    conn.execute(text("""
+        UPDATE matches
+        SET season = (
+            SELECT s.year
+            FROM seasons s
+            WHERE s.league_id = matches.league_id
+              AND date(matches.date) BETWEEN date(s.start_date) AND date(s.end_date)
+            ORDER BY s.year DESC
+            LIMIT 1
+        )
+    """))
+
+def downgrade() -> None:
+    op.drop_column('matches', 'season')
@@ -0,0 +1,63 @@
+"""ajout table sync_stats
+
+Revision ID: b273236b385b
+Revises: 2382e94a99ff
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = 'b273236b385b'
+down_revision: Union[str, None] = '2382e94a99ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table('sync_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('league_id', sa.Integer(), nullable=False),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('total_matches', sa.Integer(), nullable=False),
+        sa.Column('finished_matches', sa.Integer(), nullable=False),
+        sa.Column('upcoming_matches', sa.Integer(), nullable=False),
+        sa.Column('synced_predictions', sa.Integer(), nullable=False),
+        sa.Column('matches_last_sync', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('predictions_last_sync', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('league_id', 'season', name='uq_sync_stats_scope')
+    )
+
+    # Compteurs initiaux : par ligue/saison puis ligne globale (0, 0)
+    conn = op.get_bind()
+    aggregates = """
+        COUNT(id),
+        COALESCE(SUM(CASE WHEN status = 'FT' THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN status = 'NS' THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN predictions_synced THEN 1 ELSE 0 END), 0),
+        MAX(updated_at),
+        MAX(last_predictions_sync)
+    """
+    columns = """
+        league_id, season, total_matches, finished_matches, upcoming_matches,
+        synced_predictions, matches_last_sync, predictions_last_sync
+    """
+    conn.execute(text(f"""
+        INSERT INTO sync_stats ({columns})
+        SELECT league_id, COALESCE(season, 0), {aggregates}
+        FROM matches
+        GROUP BY league_id, COALESCE(season, 0)
+    """))
+    conn.execute(text(f"""
+        INSERT INTO sync_stats ({columns})
+        SELECT 0, 0, {aggregates}
+        FROM matches
+    """))
+
+def downgrade() -> None:
+    op.drop_table('sync_stats')
@@ -0,0 +1,96 @@
+"""ajout index sync et evaluation
+
+Revision ID: dbd3e2a05511
+Revises: b273236b385b
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = 'dbd3e2a05511'
+down_revision: Union[str, None] = 'b273236b385b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nom, table, colonnes, unique)
+INDEXES = [
+    ('ix_matches_league_season', 'matches', ['league_id', 'season'], False),
+    ('ix_matches_status_date', 'matches', ['status', 'date'], False),
+    ('ix_matches_predictions_synced_id', 'matches', ['predictions_synced', 'id'], False),
+    ('ix_match_results_match_id', 'match_results', ['match_id'], True),
+    ('ix_predictions_match_id', 'predictions', ['match_id'], True),
+    ('ix_prediction_teams_prediction_home', 'prediction_teams', ['prediction_id', 'is_home'], False),
+    ('ix_prediction_comparisons_prediction_id', 'prediction_comparisons', ['prediction_id'], True),
+    ('ix_prediction_outcomes_prediction_id', 'prediction_outcomes', ['prediction_id'], True),
+    ('ix_seasons_league_year', 'seasons', ['league_id', 'year'], True),
+]
+
+# Classement de PredictionAccuracyRollup (prediction_type_expression), sur advice_category
+# (2382e94a99ff). Seule copie dans les migrations : prediction_accuracy n'est calculé qu'ici
+PREDICTION_TYPE_SQL = """
+    CASE
+        WHEN lower(p.advice_category) LIKE '%double chance%' THEN
+            CASE WHEN lower(p.advice_category) LIKE '%combo%' THEN 'Combo Double chance' ELSE 'Double chance' END
+        WHEN lower(p.advice_category) LIKE '%winner%' THEN
+            CASE WHEN lower(p.advice_category) LIKE '%combo%' THEN 'Combo Winner' ELSE 'Winner' END
+        ELSE 'Unknown'
+    END
+"""
+
+def _rebuild_prediction_accuracy(conn) -> None:
+    """
+    Calcule prediction_accuracy comme PredictionAccuracyRollup.rebuild, une fois les outcomes
+    en double supprimés (la table est créée vide par f12d31069263)
+    """
+    conn.execute(text("DELETE FROM prediction_accuracy"))
+    scopes = [
+        ("0", "0", ""),
+        ("m.league_id", "0", "WHERE m.league_id IS NOT NULL AND m.league_id <> 0"),
+        ("m.league_id", "m.season", "WHERE m.league_id IS NOT NULL AND m.league_id <> 0 AND m.season IS NOT NULL AND m.season <> 0"),
+    ]
+    for league_expr, season_expr, scope_filter in scopes:
+        conn.execute(text(f"""
+            INSERT INTO prediction_accuracy (prediction_type, league_id, season, correct, total)
+            SELECT {PREDICTION_TYPE_SQL} AS prediction_type,
+                   {league_expr},
+                   {season_expr},
+                   SUM(CASE WHEN o.winner_prediction_correct THEN 1 ELSE 0 END),
+                   COUNT(o.id)
+            FROM prediction_outcomes o
+            JOIN predictions p ON p.id = o.prediction_id
+            JOIN matches m ON m.id = p.match_id
+            {scope_filter}
+            GROUP BY 1, 2, 3
+        """))
+
+def _delete_duplicates(conn, table: str, key: str) -> None:
+    """Conserve la première ligne (plus petit id) par clé avant de poser l'index unique"""
+    conn.execute(text(f"""
+        DELETE FROM {table}
+        WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {key})
+    """))
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Prédictions en double pour un même match : on supprime d'abord leurs enfants
+    duplicate_predictions = "SELECT id FROM predictions WHERE id NOT IN (SELECT MIN(id) FROM predictions GROUP BY match_id)"
+    for child in ('prediction_teams', 'prediction_comparisons', 'prediction_outcomes'):
+        conn.execute(text(f"DELETE FROM {child} WHERE prediction_id IN ({duplicate_predictions})"))
+    _delete_duplicates(conn, 'predictions', 'match_id')
+    _delete_duplicates(conn, 'match_results', 'match_id')
+    _delete_duplicates(conn, 'prediction_comparisons', 'prediction_id')
+    _delete_duplicates(conn, 'prediction_outcomes', 'prediction_id')
+    _delete_duplicates(conn, 'seasons', 'league_id, year')
+    # Cumul des outcomes restants
+    _rebuild_prediction_accuracy(conn)
+
+    for name, table, columns, unique in INDEXES:
+        op.create_index(op.f(name), table, columns, unique=unique)
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(op.f(name), table_name=table)
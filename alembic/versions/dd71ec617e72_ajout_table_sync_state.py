@@ -0,0 +1,31 @@
+"""ajout table sync_state
+
+Revision ID: dd71ec617e72
+Revises: f12d31069263
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'dd71ec617e72'
+down_revision: Union[str, None] = 'f12d31069263'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table('sync_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_state_name'), 'sync_state', ['name'], unique=True)
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sync_state_name'), table_name='sync_state')
+    op.drop_table('sync_state')
@@ -0,0 +1,35 @@
+"""ajout table prediction_accuracy
+
+Revision ID: f12d31069263
+Revises: 3d34955e2f56
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f12d31069263'
+down_revision: Union[str, None] = '3d34955e2f56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Table créée vide : le cumul des outcomes existants est calculé une seule fois par
+    # dbd3e2a05511, quand advice_category est renseigné et les outcomes en double supprimés
+    op.create_table('prediction_accuracy',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('prediction_type', sa.String(length=50), nullable=False),
+        sa.Column('league_id', sa.Integer(), nullable=False),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('correct', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('prediction_type', 'league_id', 'season', name='uq_prediction_accuracy_scope')
+    )
+
+def downgrade() -> None:
+    op.drop_table('prediction_accuracy')
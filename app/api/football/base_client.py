@@ -0,0 +1,125 @@
+from typing import Dict, Any, Optional
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
+import random
+import httpx
+from app.core.config import settings
+from app.api.football.http_client import get_http_client
+from app.api.football.response_cache import get_response_cache, default_ttl
+from app.services.apiRate_limiter_service import get_rate_limiter
+import json
+
+# Statuts HTTP transitoires pour lesquels un GET est rejoué
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Marqueur : TTL de cache déterminé par endpoint (voir response_cache.default_ttl)
+DEFAULT_CACHE_TTL = object()
+
+class BaseAPIClient:
+    """Base commune des clients API-Football : chemin de requête unique sur le pool partagé"""
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = "https://v3.football.api-sports.io"
+        self.headers = {
+            "x-apisports-key": settings.API_KEY,
+        }
+        self._http_client = http_client
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        return self._http_client or get_http_client()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Backoff exponentiel avec jitter complet (attempt commence à 1)"""
+        ceiling = min(settings.API_RETRY_BACKOFF_MAX, settings.API_RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Délai demandé par le serveur via Retry-After (secondes ou date HTTP)"""
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(0.0, delay), settings.API_RETRY_BACKOFF_MAX)
+
+    @staticmethod
+    def _is_rate_limit_error(data: Dict[str, Any]) -> bool:
+        """API-Football signale parfois le dépassement de quota en 200 avec errors.rateLimit"""
+        errors = data.get("errors")
+        return isinstance(errors, dict) and "rateLimit" in errors
+
+    async def _make_request(self, endpoint: str, params: Dict = None, cache_ttl=DEFAULT_CACHE_TTL) -> Dict[str, Any]:
+        """
+        Méthode générique pour faire des requêtes à l'API.
+        Les GET étant idempotents, timeouts, erreurs réseau, 429 et 5xx sont rejoués
+        jusqu'à API_RETRY_ATTEMPTS tentatives (backoff exponentiel, Retry-After respecté).
+        Args:
+            cache_ttl: Optionnel, durée de cache en secondes (None = sans expiration, 0 = pas de cache)
+        """
+        cache = get_response_cache()
+        if cache is not None and cache_ttl != 0:
+            cached = await cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+
+        limiter = get_rate_limiter()
+        attempts = max(1, settings.API_RETRY_ATTEMPTS)
+
+        for attempt in range(1, attempts + 1):
+            # Attend un jeton du limiteur partagé (quota minute et jour)
+            await limiter.acquire()
+            retry_delay = None
+            try:
+                response = await self.http_client.get(
+                    f"{self.base_url}/{endpoint}",
+                    headers=self.headers,
+                    params=params
+                )
+                # Recaler le limiteur sur les quotas restants annoncés par l'API
+                limiter.update_from_headers(response.headers)
+
+                if response.status_code in RETRYABLE_STATUS_CODES and attempt < attempts:
+                    print(f"HTTP {response.status_code} on {endpoint} (attempt {attempt}/{attempts})")
+                    retry_delay = self._retry_after(response)
+                    if retry_delay is None:
+                        retry_delay = self._backoff_delay(attempt)
+                else:
+                    response.raise_for_status()
+
+                    try:
+                        data = response.json()
+                    except json.JSONDecodeError as e:
+                        print(f"JSON Decode Error: {str(e)}")
+                        print(f"Response content: {response.content}")
+                        raise Exception("Invalid JSON response from API")
+
+                    if self._is_rate_limit_error(data) and attempt < attempts:
+                        print(f"Rate limit error on {endpoint}: {data['errors']['rateLimit']}")
+                        retry_delay = self._backoff_delay(attempt)
+                    else:
+                        if cache is not None and not data.get("errors"):
+                            ttl = default_ttl(endpoint, params, data) if cache_ttl is DEFAULT_CACHE_TTL else cache_ttl
+                            await cache.set(endpoint, params, data, ttl)
+                        return data
+
+            except httpx.TransportError as e:
+                # Timeouts et erreurs de connexion
+                if attempt >= attempts:
+                    print(f"HTTP Error: {str(e)}")
+                    raise Exception(f"Error fetching data from API: {str(e)}")
+                print(f"Transport error on {endpoint} (attempt {attempt}/{attempts}): {str(e)}")
+                retry_delay = self._backoff_delay(attempt)
+
+            except httpx.HTTPError as e:
+                print(f"HTTP Error: {str(e)}")
+                raise Exception(f"Error fetching data from API: {str(e)}")
+
+            print(f"Retrying {endpoint} in {retry_delay:.1f}s")
+            await asyncio.sleep(retry_delay)
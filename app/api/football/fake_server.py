@@ -0,0 +1,392 @@
+"""
+Serveur API-Football factice pour les tests et benchmarks hors ligne.
+
+Utilisation :
+    fake = FakeFootballAPI(SyntheticDataset(leagues=200), latency=0.05)
+    await init_http_client(transport=fake.transport())
+
+Les réponses viennent soit d'enregistrements (voir RecordingTransport),
+soit d'un jeu de données synthétique généré à la demande.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone, date
+from collections import Counter
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import random
+import time
+import httpx
+from app.api.football.fixture_status import LIVE_STATUSES
+
+TEAMS_PER_LEAGUE = 20
+MATCHES_PER_ROUND = 10
+
+
+def request_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """Clé stable d'une requête (endpoint + paramètres triés)"""
+    canonical = json.dumps({"endpoint": endpoint, "params": {str(k): str(v) for k, v in params.items()}}, sort_keys=True)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _envelope(endpoint: str, params: Dict[str, Any], items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "get": endpoint,
+        "parameters": params,
+        "errors": [],
+        "results": len(items),
+        "paging": {"current": 1, "total": 1},
+        "response": items
+    }
+
+
+class SyntheticDataset:
+    """
+    Jeu de données réaliste généré de façon déterministe à partir des identifiants.
+    Rien n'est matérialisé : 200 leagues x 380 matchs ne coûtent que ce qui est demandé.
+    """
+
+    def __init__(
+        self,
+        leagues: int = 20,
+        seasons: Tuple[int, ...] = (2022, 2023, 2024),
+        fixtures_per_season: int = 380,
+        first_league_id: int = 1,
+        now: Optional[datetime] = None
+    ):
+        self.league_ids = list(range(first_league_id, first_league_id + leagues))
+        self.seasons = tuple(seasons)
+        self.fixtures_per_season = fixtures_per_season
+        self.now = now or datetime.now(timezone.utc)
+        # Surcharges (statut, score) par fixture : simulation de matchs en direct
+        self.overrides: Dict[int, Dict[str, Any]] = {}
+
+    # Identifiants
+    def fixture_id(self, league_id: int, season: int, index: int) -> int:
+        return (league_id * 100 + self.seasons.index(season)) * 1000 + index
+
+    def parse_fixture_id(self, fixture_id: int) -> Optional[Tuple[int, int, int]]:
+        league_id, rest = divmod(fixture_id, 100_000)
+        season_index, index = divmod(rest, 1000)
+        if (league_id not in self.league_ids or season_index >= len(self.seasons)
+                or index >= self.fixtures_per_season):
+            return None
+        return league_id, self.seasons[season_index], index
+
+    @property
+    def total_fixtures(self) -> int:
+        return len(self.league_ids) * len(self.seasons) * self.fixtures_per_season
+
+    def set_fixture_state(self, fixture_id: int, status: str, home: Optional[int] = None, away: Optional[int] = None) -> None:
+        """Force le statut et le score d'un match (ex: passage en 2H puis FT)"""
+        self.overrides[fixture_id] = {"status": status, "home": home, "away": away}
+
+    # Leagues
+    def league(self, league_id: int) -> Dict[str, Any]:
+        coverage = {
+            "fixtures": {"events": True, "lineups": True, "statistics_fixtures": True, "statistics_players": True},
+            "standings": True, "players": True, "top_scorers": True, "top_assists": True,
+            "top_cards": True, "injuries": True, "predictions": True, "odds": league_id % 3 == 0
+        }
+        return {
+            "league": {
+                "id": league_id,
+                "name": f"League {league_id}",
+                "type": "League" if league_id % 5 else "Cup",
+                "logo": f"https://media.example/leagues/{league_id}.png"
+            },
+            "country": {"name": f"Country {league_id % 50}", "code": f"C{league_id % 50}", "flag": None},
+            "seasons": [
+                {
+                    "year": season,
+                    "start": f"{season}-08-01",
+                    "end": f"{season + 1}-05-31",
+                    "current": season == self.seasons[-1],
+                    "coverage": coverage
+                }
+                for season in self.seasons
+            ]
+        }
+
+    def leagues(self) -> List[Dict[str, Any]]:
+        return [self.league(league_id) for league_id in self.league_ids]
+
+    # Fixtures
+    def _teams(self, league_id: int, index: int) -> Tuple[int, int]:
+        home = (index * 7) % TEAMS_PER_LEAGUE
+        away = (home + 1 + index % (TEAMS_PER_LEAGUE - 1)) % TEAMS_PER_LEAGUE
+        return league_id * 100 + home, league_id * 100 + away
+
+    def kickoff(self, season: int, index: int) -> datetime:
+        start = datetime(season, 8, 1, 15, 0, tzinfo=timezone.utc)
+        return start + timedelta(days=7 * (index // MATCHES_PER_ROUND), hours=2 * (index % 4))
+
+    def fixture(self, fixture_id: int) -> Optional[Dict[str, Any]]:
+        parsed = self.parse_fixture_id(fixture_id)
+        if parsed is None:
+            return None
+        league_id, season, index = parsed
+        rng = random.Random(fixture_id)
+        home_id, away_id = self._teams(league_id, index)
+        kickoff = self.kickoff(season, index)
+
+        if kickoff < self.now:
+            status, home_goals, away_goals = "FT", rng.randint(0, 4), rng.randint(0, 3)
+        else:
+            status, home_goals, away_goals = "NS", None, None
+        override = self.overrides.get(fixture_id)
+        if override:
+            status, home_goals, away_goals = override["status"], override["home"], override["away"]
+
+        return {
+            "fixture": {
+                "id": fixture_id,
+                "referee": None,
+                "timezone": "UTC",
+                "date": kickoff.isoformat(),
+                "timestamp": int(kickoff.timestamp()),
+                "venue": {"id": home_id, "name": f"Stadium {home_id}", "city": f"City {home_id}"},
+                "status": {"long": status, "short": status, "elapsed": 90 if status == "FT" else None}
+            },
+            "league": {
+                "id": league_id,
+                "name": f"League {league_id}",
+                "country": f"Country {league_id % 50}",
+                "season": season,
+                "round": f"Regular Season - {index // MATCHES_PER_ROUND + 1}"
+            },
+            "teams": {
+                "home": {"id": home_id, "name": f"Team {home_id}", "logo": None,
+                         "winner": None if home_goals is None else home_goals > away_goals},
+                "away": {"id": away_id, "name": f"Team {away_id}", "logo": None,
+                         "winner": None if away_goals is None else away_goals > home_goals}
+            },
+            "goals": {"home": home_goals, "away": away_goals},
+            "score": {
+                "halftime": {"home": None, "away": None},
+                "fulltime": {"home": home_goals, "away": away_goals},
+                "extratime": {"home": None, "away": None},
+                "penalty": {"home": None, "away": None}
+            }
+        }
+
+    def fixtures(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if "ids" in params:
+            ids = [int(i) for i in params["ids"].split("-") if i]
+            return [f for f in (self.fixture(i) for i in ids) if f]
+        if params.get("live") == "all":
+            return [f for f in (self.fixture(i) for i in self.overrides) if f and f["fixture"]["status"]["short"] in LIVE_STATUSES]
+        if "id" in params:
+            found = self.fixture(int(params["id"]))
+            return [found] if found else []
+
+        league_ids = [int(params["league"])] if "league" in params else self.league_ids
+        seasons = [int(params["season"])] if "season" in params else list(self.seasons)
+        day_from = date.fromisoformat(params.get("from") or params.get("date") or "0001-01-01")
+        day_to = date.fromisoformat(params.get("to") or params.get("date") or "9999-12-31")
+
+        items = []
+        for league_id in league_ids:
+            if league_id not in self.league_ids:
+                continue
+            for season in seasons:
+                if season not in self.seasons:
+                    continue
+                for index in range(self.fixtures_per_season):
+                    if day_from <= self.kickoff(season, index).date() <= day_to:
+                        items.append(self.fixture(self.fixture_id(league_id, season, index)))
+        return items
+
+    # Predictions
+    def prediction(self, fixture_id: int) -> Optional[Dict[str, Any]]:
+        fixture = self.fixture(fixture_id)
+        if fixture is None:
+            return None
+        rng = random.Random(-fixture_id)
+        home, away = fixture["teams"]["home"], fixture["teams"]["away"]
+        league = fixture["league"]
+
+        percent_home = rng.choice([10, 20, 45, 50])
+        percent_draw = rng.choice([10, 25, 45])
+        percent_away = max(0, 100 - percent_home - percent_draw)
+        favourite = home if percent_home >= percent_away else away
+        advice = rng.choice([
+            f"Double chance : {favourite['name']} or draw",
+            f"Combo Double chance : {favourite['name']} or draw and target Over 1.5",
+            f"Winner : {favourite['name']}",
+            f"Combo Winner : {favourite['name']} and target Under 3.5",
+        ])
+
+        def pct() -> str:
+            return f"{rng.randint(0, 100)}%"
+
+        def team(data: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "id": data["id"],
+                "name": data["name"],
+                "logo": f"https://media.example/teams/{data['id']}.png",
+                "last_5": {
+                    "played": 5, "form": pct(), "att": pct(), "def": pct(),
+                    "goals": {
+                        "for": {"total": rng.randint(0, 12), "average": f"{rng.uniform(0, 2.5):.1f}"},
+                        "against": {"total": rng.randint(0, 12), "average": f"{rng.uniform(0, 2.5):.1f}"}
+                    }
+                },
+                "league": {
+                    "form": "".join(rng.choice("WDL") for _ in range(5)),
+                    "clean_sheet": {"home": 1, "away": 1, "total": 2},
+                    "failed_to_score": {"home": 1, "away": 0, "total": 1}
+                }
+            }
+
+        return {
+            "predictions": {
+                "winner": {"id": favourite["id"], "name": favourite["name"], "comment": "Win or draw"},
+                "win_or_draw": advice.startswith(("Double chance", "Combo Double chance")),
+                "under_over": rng.choice(["-3.5", "+1.5", "-2.5", None]),
+                "goals": {"home": rng.choice(["-1.5", "-2.5"]), "away": rng.choice(["-0.5", "-1.5"])},
+                "advice": advice,
+                "percent": {"home": f"{percent_home}%", "draw": f"{percent_draw}%", "away": f"{percent_away}%"}
+            },
+            "league": {
+                "id": league["id"], "name": league["name"], "country": league["country"],
+                "logo": f"https://media.example/leagues/{league['id']}.png", "flag": None, "season": league["season"]
+            },
+            "teams": {"home": team(home), "away": team(away)},
+            "comparison": {
+                key: {"home": f"{value}%", "away": f"{100 - value}%"}
+                for key, value in (
+                    (key, rng.randint(0, 100))
+                    for key in ("form", "att", "def", "poisson_distribution", "h2h", "goals", "total")
+                )
+            },
+            "h2h": []
+        }
+
+
+class FakeFootballAPI:
+    """
+    Handler httpx rejouant des réponses enregistrées ou synthétiques, avec latence,
+    taux d'erreur et en-têtes de quota configurables.
+    """
+
+    def __init__(
+        self,
+        dataset: Optional[SyntheticDataset] = None,
+        recordings_dir: Optional[str] = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_per_minute: Optional[int] = None,
+        daily_limit: Optional[int] = None,
+        seed: int = 0
+    ):
+        self.dataset = dataset or SyntheticDataset()
+        self.recordings = load_recordings(recordings_dir) if recordings_dir else {}
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.daily_limit = daily_limit
+        self._rng = random.Random(seed)
+        self._minute_window: List[float] = []
+        self.calls: Counter = Counter()  # Appels reçus par endpoint
+        self.errors_returned = 0
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
+
+    def _quota_headers(self) -> Tuple[Dict[str, str], bool]:
+        """En-têtes X-RateLimit-* ; True si la requête dépasse un quota"""
+        now = time.monotonic()
+        self._minute_window = [t for t in self._minute_window if now - t < 60]
+        self._minute_window.append(now)
+        headers = {}
+        exceeded = False
+        if self.rate_limit_per_minute is not None:
+            remaining = self.rate_limit_per_minute - len(self._minute_window)
+            exceeded = remaining < 0
+            headers["X-RateLimit-Limit"] = str(self.rate_limit_per_minute)
+            headers["X-RateLimit-Remaining"] = str(max(0, remaining))
+        if self.daily_limit is not None:
+            remaining = self.daily_limit - sum(self.calls.values())
+            exceeded = exceeded or remaining < 0
+            headers["x-ratelimit-requests-limit"] = str(self.daily_limit)
+            headers["x-ratelimit-requests-remaining"] = str(max(0, remaining))
+        return headers, exceeded
+
+    def payload(self, endpoint: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        recorded = self.recordings.get(request_key(endpoint, params))
+        if recorded is not None:
+            return recorded
+        if endpoint == "leagues":
+            return _envelope(endpoint, params, self.dataset.leagues())
+        if endpoint == "fixtures":
+            return _envelope(endpoint, params, self.dataset.fixtures(params))
+        if endpoint == "predictions":
+            prediction = self.dataset.prediction(int(params.get("fixture", 0)))
+            return _envelope(endpoint, params, [prediction] if prediction else [])
+        if endpoint == "status":
+            return _envelope(endpoint, params, [])
+        return None
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if self.latency or self.latency_jitter:
+            await asyncio.sleep(self.latency + self._rng.uniform(0, self.latency_jitter))
+
+        endpoint = request.url.path.rstrip("/").rsplit("/", 1)[-1]
+        params = dict(request.url.params)
+        self.calls[endpoint] += 1
+        headers, exceeded = self._quota_headers()
+
+        if exceeded:
+            self.errors_returned += 1
+            return httpx.Response(429, headers={**headers, "Retry-After": "1"}, json={"errors": {"rateLimit": "Too many requests"}})
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors_returned += 1
+            return httpx.Response(500, headers=headers, json={"errors": {"server": "Synthetic failure"}})
+
+        data = self.payload(endpoint, params)
+        if data is None:
+            return httpx.Response(404, headers=headers, json={"errors": {"endpoint": "Unknown endpoint"}})
+        return httpx.Response(200, headers=headers, json=data)
+
+
+def load_recordings(directory: str) -> Dict[str, Dict[str, Any]]:
+    """Charge les réponses enregistrées par RecordingTransport"""
+    recordings = {}
+    for path in Path(directory).glob("*/*.json"):
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        recordings[request_key(entry["endpoint"], entry["params"])] = entry["body"]
+    return recordings
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport qui enregistre les réponses réelles de l'API pour les rejouer hors ligne"""
+
+    def __init__(self, directory: str, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.directory = Path(directory)
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        if response.status_code == 200:
+            endpoint = request.url.path.rstrip("/").rsplit("/", 1)[-1]
+            params = dict(request.url.params)
+            target = self.directory / endpoint / f"{request_key(endpoint, params)}.json"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(
+                json.dumps({"endpoint": endpoint, "params": params, "body": json.loads(body)}),
+                encoding="utf-8"
+            )
+        # Le corps est déjà décodé : ne pas republier les en-têtes d'encodage
+        headers = [
+            (name, value) for name, value in response.headers.items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
@@ -0,0 +1,11 @@
+# Statuts courts des fixtures API-Football (fixture.status.short), partagés par
+# la sync des matchs, le suivi live, le cache des réponses et l'évaluation
+
+# Match en cours (score provisoire)
+LIVE_STATUSES = ("1H", "HT", "2H", "ET", "BT", "P", "SUSP", "INT", "LIVE")
+
+# Match joué jusqu'au bout : score final, prédictions évaluables
+PLAYED_STATUSES = ("FT", "AET", "PEN")
+
+# Statuts qui n'évolueront plus (joués, annulés, abandonnés, sur tapis vert)
+FINISHED_STATUSES = frozenset({*PLAYED_STATUSES, "CANC", "ABD", "AWD", "WO"})
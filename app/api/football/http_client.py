@@ -0,0 +1,67 @@
+from typing import Optional
+import httpx
+from app.core.config import settings
+
+# Client HTTP partagé par tous les clients API-Football (un seul pool par process)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """HTTP/2 nécessite le paquet optionnel `h2`"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """
+    Crée un client httpx avec pool de connexions keep-alive.
+    Args:
+        transport: Optionnel, transport à utiliser à la place du réseau (tests, benchmarks)
+    Returns:
+        Client httpx configuré depuis les settings
+    """
+    http2 = settings.API_HTTP2 and _http2_available()
+    if settings.API_HTTP2 and not http2:
+        print("Paquet h2 absent, utilisation de HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.API_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.API_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.API_POOL_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(settings.API_TIMEOUT),
+        transport=transport
+    )
+
+
+async def init_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """Ouvre le client partagé (appelé au démarrage de l'application)"""
+    global _client
+    await close_http_client()
+    _client = create_http_client(transport)
+    print("Client HTTP API initialisé")
+    return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retourne le client partagé.
+    Le client est créé à la demande pour les scripts lancés hors FastAPI.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Ferme le client partagé et ses connexions (appelé à l'arrêt de l'application)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,48 +1,28 @@
-from typing import Dict, Any
-import httpx
-from app.core.config import settings
-import json
+from datetime import date
+from typing import Dict, Any, List, Optional
+from app.api.football.base_client import BaseAPIClient, DEFAULT_CACHE_TTL
+from app.services.apiRate_limiter_service import ApiQuotaExceeded
 
-class MatchAPIClient:
-    def __init__(self):
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {
-           "x-apisports-key": settings.API_KEY, 
-        }
-
-    async def _make_request(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
-        """Méthode générique pour faire des requêtes à l'API"""
-        print(f"Making request to {endpoint} with params: {params}")
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/{endpoint}",
-                    headers=self.headers,
-                    params=params,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-
-                try:
-                    data = response.json()
-                    print(f"Response status: {response.status_code}")
-                    print(f"Response contains {len(data.get('response', []))} items")
-                    return data
-                except json.JSONDecodeError as e:
-                    print(f"JSON Decode Error: {str(e)}")
-                    print(f"Response content: {response.content}")
-                    raise Exception("Invalid JSON response from API")
+# Nombre maximal d'ids acceptés par fixtures?ids=
+MAX_IDS_PER_REQUEST = 20
 
-            except httpx.HTTPError as e:
-                print(f"HTTP Error: {str(e)}")
-                raise Exception(f"Error fetching data from API: {str(e)}")
-
-    async def get_matches(self, league_id: int, season: int) -> Dict[str, Any]:
+class MatchAPIClient(BaseAPIClient):
+    async def get_matches(
+        self,
+        league_id: int,
+        season: int,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        cache_ttl=DEFAULT_CACHE_TTL
+    ) -> Dict[str, Any]:
         """
         Récupère les matchs pour une league et une saison données
         Args:
             league_id: ID de la league
             season: Année de la saison
+            date_from: Optionnel, premier jour de la fenêtre (from)
+            date_to: Optionnel, dernier jour de la fenêtre (to)
+            cache_ttl: Optionnel, durée de cache (0 pour relire des matchs qui évoluent)
         Returns:
             Dict contenant la réponse de l'API
         """
@@ -50,12 +30,57 @@ class MatchAPIClient:
             "league": league_id,
             "season": season
         }
+        if date_from is not None:
+            params["from"] = date_from.isoformat()
+        if date_to is not None:
+            params["to"] = date_to.isoformat()
 
         try:
-            print(f"Fetching matches for league {league_id} and season {season}...")
-            data = await self._make_request("fixtures", params)
+            window = f" from {date_from} to {date_to}" if date_from or date_to else ""
+            print(f"Fetching matches for league {league_id} and season {season}{window}...")
+            data = await self._make_request("fixtures", params, cache_ttl=cache_ttl)
             print(f"Successfully fetched {data.get('results', 0)} matches")
             return data
+        except ApiQuotaExceeded:
+            # Propagé tel quel : l'appelant doit arrêter la sync, pas compter une erreur par saison
+            raise
         except Exception as e:
             print(f"Error in get_matches: {str(e)}")
-            raise Exception(f"Error fetching matches: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error fetching matches: {str(e)}")
+
+    async def get_matches_by_ids(self, fixture_ids: List[int], cache_ttl=DEFAULT_CACHE_TTL) -> Dict[str, Any]:
+        """
+        Récupère jusqu'à MAX_IDS_PER_REQUEST matchs par leurs ids API
+        Args:
+            fixture_ids: IDs API des matchs
+            cache_ttl: Optionnel, durée de cache (0 pour des matchs en cours)
+        Returns:
+            Dict contenant la réponse de l'API
+        """
+        if len(fixture_ids) > MAX_IDS_PER_REQUEST:
+            raise ValueError(f"{MAX_IDS_PER_REQUEST} ids maximum par requête")
+        params = {"ids": "-".join(str(fixture_id) for fixture_id in fixture_ids)}
+
+        try:
+            print(f"Fetching {len(fixture_ids)} matches by id...")
+            data = await self._make_request("fixtures", params, cache_ttl=cache_ttl)
+            print(f"Successfully fetched {data.get('results', 0)} matches")
+            return data
+        except ApiQuotaExceeded:
+            # Propagé tel quel : l'appelant doit arrêter la sync, pas compter une erreur par saison
+            raise
+        except Exception as e:
+            print(f"Error in get_matches_by_ids: {str(e)}")
+            raise Exception(f"Error fetching matches: {str(e)}")
+
+    async def get_live_matches(self) -> Dict[str, Any]:
+        """
+        Récupère en une requête tous les matchs en cours (fixtures?live=all, jamais mis en cache)
+        Returns:
+            Dict contenant la réponse de l'API
+        """
+        try:
+            return await self._make_request("fixtures", {"live": "all"}, cache_ttl=0)
+        except Exception as e:
+            print(f"Error in get_live_matches: {str(e)}")
+            raise Exception(f"Error fetching live matches: {str(e)}")
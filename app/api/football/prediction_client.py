@@ -1,57 +1,35 @@
-from typing import Dict, Any
-import httpx
-from app.core.config import settings
-import json
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from app.api.football.base_client import BaseAPIClient, DEFAULT_CACHE_TTL
+from app.services.apiRate_limiter_service import ApiQuotaExceeded
 
-class PredictionAPIClient:
-    def __init__(self):
-        self.base_url = "https://v3.football.api-sports.io"
-        self.headers = {
-            "x-apisports-key": settings.API_KEY, 
-        }
+class PredictionAPIClient(BaseAPIClient):
+    @staticmethod
+    def _cache_ttl(kickoff: Optional[datetime]):
+        """Les prédictions évoluent jusqu'au coup d'envoi, puis sont figées"""
+        if kickoff is None:
+            return DEFAULT_CACHE_TTL
+        if kickoff.tzinfo is None:
+            kickoff = kickoff.replace(tzinfo=timezone.utc)
+        remaining = (kickoff - datetime.now(timezone.utc)).total_seconds()
+        return remaining if remaining > 0 else None
 
-    async def _make_request(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
-        """Méthode générique pour faire des requêtes à l'API"""
-        print(f"Making request to {endpoint} with params: {params}")
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/{endpoint}",
-                    headers=self.headers,
-                    params=params,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-
-                try:
-                    data = response.json()
-                    print(f"Response status: {response.status_code}")
-                    print(f"Response contains {len(data.get('response', []))} items")
-                    return data
-                except json.JSONDecodeError as e:
-                    print(f"JSON Decode Error: {str(e)}")
-                    print(f"Response content: {response.content}")
-                    raise Exception("Invalid JSON response from API")
-
-            except httpx.HTTPError as e:
-                print(f"HTTP Error: {str(e)}")
-                raise Exception(f"Error fetching data from API: {str(e)}")
-
-    async def get_predictions(self, fixture_id: int) -> Dict[str, Any]:
+    async def get_predictions(self, fixture_id: int, kickoff: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Récupère les prédictions pour un match spécifique.
         Args:
             fixture_id: ID du match pour lequel récupérer les prédictions.
+            kickoff: Optionnel, date du match (la réponse est mise en cache jusqu'au coup d'envoi).
         Returns:
             Dict contenant la réponse de l'API.
         """
         params = {"fixture": fixture_id}
 
         try:
-            print(f"Fetching predictions for fixture {fixture_id}...")
-            data = await self._make_request("predictions", params)
-            print(f"Successfully fetched predictions for fixture {fixture_id}")
-            return data
+            return await self._make_request("predictions", params, cache_ttl=self._cache_ttl(kickoff))
+        except ApiQuotaExceeded:
+            # Propagé tel quel : l'appelant doit arrêter le parcours, pas compter une erreur par match
+            raise
         except Exception as e:
             print(f"Error in get_predictions: {str(e)}")
             raise Exception(f"Error fetching predictions: {str(e)}")
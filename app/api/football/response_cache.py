@@ -0,0 +1,149 @@
+from typing import Dict, Any, Optional
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from app.core.config import settings
+from app.api.football.fixture_status import FINISHED_STATUSES
+
+# TTL spécial : conserver sans expiration
+NO_EXPIRY = None
+
+
+def default_ttl(endpoint: str, params: Optional[Dict], data: Dict[str, Any]) -> Optional[float]:
+    """
+    TTL par endpoint (en secondes, None = pas d'expiration, 0 = ne pas mettre en cache).
+      - leagues : CACHE_TTL_LEAGUES
+      - fixtures : jamais pour le live, sans expiration si tous les matchs sont terminés
+      - autres : CACHE_TTL
+    """
+    params = params or {}
+    if endpoint == "leagues":
+        return settings.CACHE_TTL_LEAGUES
+    if endpoint == "fixtures":
+        if "live" in params:
+            return 0
+        fixtures = data.get("response") or []
+        if fixtures and all(f.get("fixture", {}).get("status", {}).get("short") in FINISHED_STATUSES for f in fixtures):
+            return NO_EXPIRY
+    return settings.CACHE_TTL
+
+
+class ResponseCache:
+    """Cache disque (SQLite) des réponses GET, clé = endpoint + paramètres triés, éviction LRU"""
+
+    def __init__(self, path: str, max_bytes: int, prefix: str = ""):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    def make_key(self, endpoint: str, params: Optional[Dict]) -> str:
+        canonical = json.dumps(
+            {"endpoint": endpoint, "params": {str(k): str(v) for k, v in (params or {}).items()}},
+            sort_keys=True
+        )
+        return f"{self.prefix}:{endpoint}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+    def _get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            body, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return body
+
+    def _set(self, key: str, endpoint: str, body: bytes, ttl: Optional[float]) -> None:
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, len(body), expires_at, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Supprime les entrées expirées puis les moins récemment lues au-delà de max_bytes"""
+        self._conn.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        to_free = total - self.max_bytes
+        freed = 0
+        keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            keys.append((key,))
+            freed += size
+            if freed >= to_free:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    async def get(self, endpoint: str, params: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        body = await asyncio.to_thread(self._get, self.make_key(endpoint, params))
+        return json.loads(body) if body is not None else None
+
+    async def set(self, endpoint: str, params: Optional[Dict], data: Dict[str, Any], ttl: Optional[float]) -> None:
+        if ttl is not None and ttl <= 0:
+            return
+        body = json.dumps(data).encode()
+        await asyncio.to_thread(self._set, self.make_key(endpoint, params), endpoint, body, ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Cache partagé par tous les clients API du process
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Retourne le cache partagé, ou None s'il est désactivé"""
+    global _cache
+    if not settings.CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ResponseCache(settings.CACHE_PATH, settings.CACHE_MAX_BYTES, settings.CACHE_PREFIX)
+    return _cache
+
+
+def close_response_cache() -> None:
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
@@ -2,7 +2,9 @@ from pydantic_settings import BaseSettings
 from functools import lru_cache
 from pathlib import Path
 import os
-from typing import ClassVar, Dict
+import ssl
+from typing import ClassVar, Dict, List, Optional
+from sqlalchemy.engine import make_url
 
 # Chemin de base
 BASE_DIR = Path(__file__).parent.parent.parent
@@ -18,6 +20,24 @@ class Settings(BaseSettings):
     # Database
     DB_URL: str = f"sqlite+aiosqlite:///{DATA_DIR}/football.db"
     DB_ECHO: bool = False
+
+    # Profil SQLite appliqué à chaque connexion (ignoré pour les autres bases)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Les lectures ne sont plus bloquées par les transactions de sync
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # fsync au checkpoint WAL plutôt qu'à chaque commit
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # Négatif : taille en KiB (~64 Mo)
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT: int = 5000  # Millisecondes d'attente d'un verrou d'écriture
+
+    # Profil PostgreSQL (asyncpg) : connexions par process = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # Secondes avant de recycler une connexion (coupures côté serveur/proxy)
+    DB_SSL_CA_PATH: str = str(BASE_DIR / "ca.pem")
+    DB_SSL_CA_HOST: Optional[str] = None  # Hôte de la base managée signée par ce CA : verify-full si sslmode est absent
+    DB_STATEMENT_CACHE_SIZE: int = 100  # Requêtes préparées côté serveur par connexion (0 derrière pgbouncer)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # Cache SQLAlchemy des requêtes préparées asyncpg
     
     # API Football
     API_KEY: str
@@ -49,10 +69,67 @@ class Settings(BaseSettings):
     API_RATE_LIMIT: int = 450
     API_TIMEOUT: int = 30
     API_MAX_CALLS_PER_DAY: int = 75000
+    API_USAGE_FLUSH_INTERVAL: float = 30.0  # Secondes entre deux sauvegardes du compteur d'appels
+    API_RATE_LIMIT_HEADROOM: int = 5  # Appels gardés en réserve sous les quotas annoncés par l'API
+    API_RETRY_ATTEMPTS: int = 4  # Tentatives max par requête (timeouts, 429, 5xx)
+    API_RETRY_BACKOFF_BASE: float = 1.0
+    API_RETRY_BACKOFF_MAX: float = 60.0
+
+    # HTTP client (pool partagé par les clients API)
+    API_HTTP2: bool = True
+    API_POOL_MAX_CONNECTIONS: int = 100
+    API_POOL_MAX_KEEPALIVE: int = 20
+    API_POOL_KEEPALIVE_EXPIRY: float = 30.0
+
+    # Sync matchs incrémentale : jours à venir relus à chaque passage
+    MATCH_SYNC_LOOKAHEAD_DAYS: int = 14
+
+    # Suivi des matchs en direct (fixtures?live=all)
+    LIVE_POLL_ENABLED: bool = False
+    LIVE_POLL_INTERVAL: float = 60.0  # Secondes entre deux requêtes live
+
+    # Tâches de synchronisation en arrière-plan (table sync_jobs)
+    JOB_RUNNER_ENABLED: bool = True  # False si un worker séparé (python -m app.worker) exécute les tâches
+    JOB_POLL_INTERVAL: float = 2.0  # Secondes entre deux ticks du runner
+    JOB_STALE_AFTER: float = 120.0  # Tâche en cours sans signe de vie depuis ce délai = worker perdu
+
+    # Planification des tâches (expressions cron à 5 champs, heure UTC)
+    SCHEDULER_ENABLED: bool = False
+    SCHEDULER_INTERVAL: float = 30.0  # Secondes entre deux vérifications des échéances
+    SCHEDULER_JITTER: float = 300.0  # Décalage aléatoire max (secondes) de chaque échéance
+    SYNC_SCHEDULES: Dict[str, str] = {  # Type de tâche -> expression cron (type absent = non planifié)
+        "leagues": "0 4 * * 1",  # Chaque lundi à 04:00
+        "matches": "5 * * * *",  # Toutes les heures (incrémental)
+        "predictions": "20 * * * *",  # Préchargement priorisé : matchs imminents d'abord
+        "evaluation": "40 * * * *",  # Après la sync des matchs : évalue les matchs terminés
+    }
+
+    # Sync prédictions (pipeline workers -> writer)
+    PREDICTION_SYNC_WORKERS: int = 8
+    PREDICTION_SYNC_BATCH_SIZE: int = 100
+    PREDICTION_SYNC_FLUSH_INTERVAL: float = 5.0
+    PREDICTION_SYNC_PAGE_SIZE: int = 1000  # Matchs lus par page (keyset sur id)
+
+    # Préchargement priorisé des prédictions (voir prediction_planner)
+    PREDICTION_IMMINENT_HOURS: int = 48
+    PREDICTION_UPCOMING_DAYS: int = 14
+    PREDICTION_RECENT_DAYS: int = 3
+    PREDICTION_PRIORITY_LEAGUES: List[int] = []  # Ids API des leagues, de la plus importante à la moins importante
+    PREDICTION_DAILY_BUDGETS: Dict[str, int] = {  # Appels par jour et par classe (classe absente = 0)
+        "imminent": 20000,
+        "upcoming": 20000,
+        "recent": 10000,
+        "history": 10000,
+    }
     
     # Cache
     CACHE_TTL: int = 3600
     CACHE_PREFIX: str = "lwc"
+    CACHE_ENABLED: bool = True
+    CACHE_PATH: str = str(DATA_DIR / "api_cache.db")
+    CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    CACHE_TTL_LEAGUES: int = 86400
+    DASHBOARD_STATS_TTL: float = 30.0  # Durée de vie des stats du dashboard en mémoire (invalidées par les syncs)
     
     # Analysis
     MIN_MATCHES_REQUIRED: int = 5
@@ -74,13 +151,85 @@ class Settings(BaseSettings):
     
     @property
     def ASYNC_DATABASE_URL(self) -> str:
-        return self.DB_URL
-    
+        """URL du driver async : postgres:// et postgresql:// passent par asyncpg"""
+        if not self.is_postgresql:
+            return self.DB_URL
+        url = make_url(self.DB_URL)
+        # asyncpg ne comprend pas sslmode dans l'URL : il est traduit dans connect_args (ssl_connect_arg)
+        url = url.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+        return url.render_as_string(hide_password=False)
+
+    @property
+    def is_postgresql(self) -> bool:
+        return make_url(self.DB_URL).get_backend_name() in ("postgres", "postgresql")
+
+    @property
+    def db_ssl_mode(self) -> Optional[str]:
+        """sslmode (libpq) demandé dans DB_URL, None s'il est absent"""
+        mode = make_url(self.DB_URL).query.get("sslmode")
+        return mode[-1] if isinstance(mode, tuple) else mode
+
+    def ssl_context(self, check_hostname: bool = True):
+        """Contexte SSL vérifiant le serveur avec le CA du projet (None si le fichier est absent)"""
+        if not self.DB_SSL_CA_PATH or not os.path.exists(self.DB_SSL_CA_PATH):
+            return None
+        context = ssl.create_default_context(purpose=ssl.Purpose.SERVER_AUTH, cafile=self.DB_SSL_CA_PATH)
+        context.check_hostname = check_hostname
+        return context
+
+    def ssl_connect_arg(self):
+        """
+        Argument ssl d'asyncpg correspondant au sslmode de DB_URL (None : défaut d'asyncpg).
+        Seuls verify-ca et verify-full construisent un contexte vérifiant le serveur avec le CA
+        du projet ; disable, allow, prefer et require sont transmis tels quels. Sans sslmode,
+        verify-full n'est appliqué que si DB_URL cible explicitement DB_SSL_CA_HOST.
+        Raises:
+            ValueError: verify-ca / verify-full demandé sans fichier CA
+        """
+        mode = self.db_ssl_mode
+        if mode is None and self.DB_SSL_CA_HOST and make_url(self.DB_URL).host == self.DB_SSL_CA_HOST:
+            mode = "verify-full"
+        if mode in ("verify-ca", "verify-full"):
+            context = self.ssl_context(check_hostname=mode == "verify-full")
+            if context is None:
+                raise ValueError(f"sslmode={mode} exige le certificat CA (DB_SSL_CA_PATH={self.DB_SSL_CA_PATH})")
+            return context
+        return mode
+
     @property
     def engine_kwargs(self) -> dict:
+        if not self.is_postgresql:
+            return {
+                "echo": self.DB_ECHO,
+                "connect_args": {"check_same_thread": False}
+            }
+
+        connect_args = {
+            "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": self.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": {"application_name": self.APP_NAME},
+        }
+        ssl_arg = self.ssl_connect_arg()
+        if ssl_arg is not None:
+            connect_args["ssl"] = ssl_arg
         return {
             "echo": self.DB_ECHO,
-            "connect_args": {"check_same_thread": False}
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "connect_args": connect_args
+        }
+    
+    @property
+    def sqlite_pragmas(self) -> Dict[str, object]:
+        return {
+            "journal_mode": self.SQLITE_JOURNAL_MODE,
+            "synchronous": self.SQLITE_SYNCHRONOUS,
+            "mmap_size": self.SQLITE_MMAP_SIZE,
+            "cache_size": self.SQLITE_CACHE_SIZE,
+            "temp_store": self.SQLITE_TEMP_STORE,
+            "busy_timeout": self.SQLITE_BUSY_TIMEOUT,
         }
     
     class Config:
@@ -1,15 +1,32 @@
 # app/db/session.py
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from app.models.base import Base
 
+def apply_sqlite_pragmas(engine: AsyncEngine, pragmas: dict = None) -> AsyncEngine:
+    """Applique le profil SQLite (WAL, synchronous, mmap, cache...) à chaque nouvelle connexion"""
+    if engine.dialect.name != "sqlite":
+        return engine
+    pragmas = settings.sqlite_pragmas if pragmas is None else pragmas
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            if value is not None:
+                cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
 # Création du moteur async
-engine = create_async_engine(
+engine = apply_sqlite_pragmas(create_async_engine(
     settings.ASYNC_DATABASE_URL,
     pool_pre_ping=True,
     **settings.engine_kwargs  # Utilise les paramètres prédéfinis dans settings
-)
+))
 
 # Configuration du sessionmaker
 AsyncSessionLocal = sessionmaker(
@@ -0,0 +1,54 @@
+# app/db/upsert.py
+from typing import Any, Dict, Iterable, List, Sequence
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Nombre de lignes par executemany
+UPSERT_CHUNK_SIZE = 500
+
+
+def dialect_insert(db: AsyncSession, model):
+    """Retourne un INSERT propre au dialecte (nécessaire pour ON CONFLICT)"""
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return postgresql.insert(model)
+    if dialect_name == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Upsert non supporté pour le dialecte {dialect_name}")
+
+
+def chunked(items: Sequence[Any], size: int = UPSERT_CHUNK_SIZE) -> Iterable[Sequence[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def upsert_rows(
+    db: AsyncSession,
+    model,
+    rows: List[Dict[str, Any]],
+    index_elements: List[str],
+    update_columns: List[str],
+    increment_columns: Sequence[str] = ()
+) -> None:
+    """
+    INSERT ... ON CONFLICT DO UPDATE par lots (SQLite et PostgreSQL).
+    Args:
+        model: Modèle ORM cible
+        rows: Lignes à écrire, toutes avec les mêmes clés
+        index_elements: Colonnes de la contrainte d'unicité
+        update_columns: Colonnes mises à jour en cas de conflit
+        increment_columns: Colonnes additionnées à la valeur existante en cas de conflit (deltas)
+    """
+    if not rows:
+        return
+
+    stmt = dialect_insert(db, model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={
+            **{column: stmt.excluded[column] for column in update_columns},
+            **{column: model.__table__.c[column] + stmt.excluded[column] for column in increment_columns}
+        }
+    )
+    for chunk in chunked(rows):
+        await db.execute(stmt, list(chunk))
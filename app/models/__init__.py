@@ -1,11 +1,17 @@
 from .base import Base
+from .api_usage import ApiUsage
 from .league import League, Season
 from .match import Match, MatchResult
 from .odds import OddsBookmaker, OddsValue
 from .prediction import Prediction, PredictionTeam, PredictionComparison, PredictionOutcome
+from .prediction_accuracy import PredictionAccuracy
+from .sync_job import SyncJob
+from .sync_state import SyncState
+from .sync_stats import SyncStats
 
 __all__ = [
     "Base",
+    "ApiUsage",
     "League",
     "Season",
     "Match",
@@ -15,5 +21,9 @@ __all__ = [
     "Prediction",
     "PredictionTeam",
     "PredictionComparison",
-    "PredictionOutcome"
+    "PredictionOutcome",
+    "PredictionAccuracy",
+    "SyncJob",
+    "SyncState",
+    "SyncStats"
 ]
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Date, DateTime
+from sqlalchemy.sql import func
+from .base import Base
+
+class ApiUsage(Base):
+    __tablename__ = 'api_usage'
+
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False, unique=True, index=True)
+    calls_made = Column(Integer, nullable=False, default=0)
+    reset_time = Column(DateTime(timezone=True), nullable=True)  # Prochaine réinitialisation du quota
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -22,6 +22,9 @@ class League(Base):
 
 class Season(Base):
    __tablename__ = 'seasons'
+   __table_args__ = (
+       Index('ix_seasons_league_year', 'league_id', 'year', unique=True),
+   )
    
    id = Column(Integer, primary_key=True)
    league_id = Column(Integer, ForeignKey('leagues.id'), nullable=False)
@@ -1,14 +1,20 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func 
 from .base import Base
 
 class Match(Base):
     __tablename__ = 'matches'
+    __table_args__ = (
+        Index('ix_matches_league_season', 'league_id', 'season'),  # Sync par ligue/saison, sync_stats
+        Index('ix_matches_status_date', 'status', 'date'),  # Évaluation (FT), matchs en cours
+        Index('ix_matches_predictions_synced_id', 'predictions_synced', 'id'),  # File des prédictions à synchroniser
+    )
     
     id = Column(Integer, primary_key=True)
     api_fixture_id = Column(Integer, unique=True, index=True)
     league_id = Column(Integer, ForeignKey('leagues.id'), nullable=False)
+    season = Column(Integer, nullable=True)  # Année de la saison (league.season dans l'API)
     date = Column(DateTime(timezone=True), nullable=False) 
     status = Column(String(20), nullable=False, default='NOT_STARTED')
     home_team = Column(String(255), nullable=False)
@@ -41,7 +47,7 @@ class MatchResult(Base):
     __tablename__ = 'match_results'
     
     id = Column(Integer, primary_key=True)
-    match_id = Column(Integer, ForeignKey('matches.id'), nullable=False)
+    match_id = Column(Integer, ForeignKey('matches.id'), nullable=False, unique=True, index=True)
     
     # Score
     home_score = Column(Integer, nullable=False)  # goals.home dans l'API
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
@@ -7,7 +7,7 @@ class Prediction(Base):
     __tablename__ = 'predictions'
     
     id = Column(Integer, primary_key=True)
-    match_id = Column(Integer, ForeignKey('matches.id'), nullable=False)
+    match_id = Column(Integer, ForeignKey('matches.id'), nullable=False, unique=True, index=True)
     
     # Winner info
     winner_id = Column(Integer, nullable=True)
@@ -22,6 +22,8 @@ class Prediction(Base):
     
     # Advice and percentages
     advice = Column(Text, nullable=True)
+    advice_category = Column(String(50), nullable=True, index=True)  # Partie avant ':' (ex : Combo Winner)
+    advice_selection = Column(String(255), nullable=True)  # Partie après ':'
     percent_home = Column(Float, nullable=True)
     percent_draw = Column(Float, nullable=True)
     percent_away = Column(Float, nullable=True)
@@ -38,6 +40,9 @@ class Prediction(Base):
 
 class PredictionTeam(Base):
     __tablename__ = 'prediction_teams'
+    __table_args__ = (
+        Index('ix_prediction_teams_prediction_home', 'prediction_id', 'is_home'),
+    )
 
     id = Column(Integer, primary_key=True)
     prediction_id = Column(Integer, ForeignKey('predictions.id', ondelete="CASCADE"), nullable=False)
@@ -85,7 +90,7 @@ class PredictionComparison(Base):
     __tablename__ = 'prediction_comparisons'
 
     id = Column(Integer, primary_key=True)
-    prediction_id = Column(Integer, ForeignKey('predictions.id', ondelete="CASCADE"), nullable=False)
+    prediction_id = Column(Integer, ForeignKey('predictions.id', ondelete="CASCADE"), nullable=False, unique=True, index=True)
 
     # Form comparison
     form_home = Column(Float, nullable=True)
@@ -120,7 +125,7 @@ class PredictionOutcome(Base):
     __tablename__ = 'prediction_outcomes'
     
     id = Column(Integer, primary_key=True)
-    prediction_id = Column(Integer, ForeignKey('predictions.id', ondelete="CASCADE"), nullable=False)
+    prediction_id = Column(Integer, ForeignKey('predictions.id', ondelete="CASCADE"), nullable=False, unique=True, index=True)
     
     # Évaluation de la prédiction winner
     winner_prediction_correct = Column(Boolean, nullable=True)
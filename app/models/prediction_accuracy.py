@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from .base import Base
+
+class PredictionAccuracy(Base):
+    """Précision des prédictions winner par type, tenue à jour à chaque écriture d'outcomes"""
+    __tablename__ = 'prediction_accuracy'
+    __table_args__ = (
+        UniqueConstraint('prediction_type', 'league_id', 'season', name='uq_prediction_accuracy_scope'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    prediction_type = Column(String(50), nullable=False)  # Voir PredictionEvaluationService._get_prediction_type
+    league_id = Column(Integer, nullable=False, default=0)  # 0 = toutes ligues
+    season = Column(Integer, nullable=False, default=0)  # 0 = toutes saisons
+    correct = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index, text
+from sqlalchemy.sql import func
+from .base import Base
+
+# Statuts actifs : au plus une tâche par type (index unique partiel)
+ACTIVE_STATUS_CLAUSE = text("status IN ('pending', 'running')")
+
+class SyncJob(Base):
+    """Tâche de synchronisation exécutée en arrière-plan (file persistante, une tâche active par type)"""
+    __tablename__ = 'sync_jobs'
+    __table_args__ = (
+        Index('ix_sync_jobs_type_status', 'job_type', 'status'),
+        Index('ix_sync_jobs_status_id', 'status', 'id'),
+        Index(
+            'ix_sync_jobs_active_type', 'job_type', unique=True,
+            sqlite_where=ACTIVE_STATUS_CLAUSE, postgresql_where=ACTIVE_STATUS_CLAUSE
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    job_type = Column(String(50), nullable=False)  # leagues, matches, predictions, evaluation
+    status = Column(String(20), nullable=False, default='pending')  # pending, running, succeeded, failed, cancelled
+    params = Column(Text, nullable=True)  # Paramètres JSON du traitement
+
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=True)  # None = total inconnu
+    message = Column(String(255), nullable=True)
+    result = Column(Text, nullable=True)  # Résultat JSON du traitement
+    error = Column(Text, nullable=True)
+
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    worker = Column(String(100), nullable=True)  # Process qui exécute la tâche
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Signe de vie du worker
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from .base import Base
+
+class SyncState(Base):
+    """Point de reprise (watermark) des traitements incrémentaux"""
+    __tablename__ = 'sync_state'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False, unique=True, index=True)  # Ex : prediction_evaluation
+    watermark = Column(DateTime(timezone=True), nullable=True)  # Début du dernier passage réussi (UTC)
+    position = Column(Integer, nullable=True)  # Dernier id traité d'un parcours interrompu (reprise)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from .base import Base
+
+class SyncStats(Base):
+    """Compteurs de synchronisation par ligue/saison, tenus à jour par les services de sync"""
+    __tablename__ = 'sync_stats'
+    __table_args__ = (
+        UniqueConstraint('league_id', 'season', name='uq_sync_stats_scope'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    league_id = Column(Integer, nullable=False, default=0)  # 0 = toutes ligues (ligne globale)
+    season = Column(Integer, nullable=False, default=0)  # 0 = toutes saisons ou saison inconnue
+
+    total_matches = Column(Integer, nullable=False, default=0)
+    finished_matches = Column(Integer, nullable=False, default=0)  # Statut FT
+    upcoming_matches = Column(Integer, nullable=False, default=0)  # Statut NS
+    synced_predictions = Column(Integer, nullable=False, default=0)  # Matchs avec predictions_synced
+    matches_last_sync = Column(DateTime(timezone=True), nullable=True)
+    predictions_last_sync = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
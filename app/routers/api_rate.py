@@ -1,10 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
-from app.db.session import get_db
-from sqlalchemy import select
-from app.models.api_usage import ApiUsage
-from app.core.config import settings
+from fastapi import APIRouter
+from app.services.apiRate_limiter_service import get_rate_limiter
 from pydantic import BaseModel
 
 class ApiUsageStats(BaseModel):
@@ -18,18 +13,12 @@ router = APIRouter()
     response_model=ApiUsageStats,
     summary="Récupère les statistiques d'utilisation des appels API",
 )
-async def get_api_usage_stats(db: AsyncSession = Depends(get_db)):
+async def get_api_usage_stats():
     """
     Récupère les statistiques d'utilisation des appels API pour aujourd'hui.
+    Les compteurs sont lus dans le limiteur en mémoire (la base n'est sauvegardée que périodiquement).
     """
-    today = datetime.now().date()
-    stmt = select(ApiUsage.calls_made).where(ApiUsage.date == today)
+    limiter = get_rate_limiter()
+    limiter.can_make_call()  # Applique le passage à minuit éventuel
 
-    try:
-        result = await db.execute(stmt)
-        calls_made_today = result.scalar_one_or_none() or 0
-        max_calls_per_day = settings.API_MAX_CALLS_PER_DAY
-    except Exception as e:
-        raise HTTPException(status_code=500, detail="Erreur lors de la récupération des statistiques")
-
-    return {"calls_made_today": calls_made_today, "max_calls_per_day": max_calls_per_day}
+    return {"calls_made_today": limiter.calls_made_today, "max_calls_per_day": limiter.max_calls_per_day}
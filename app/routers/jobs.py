@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any
+
+from app.db.session import get_db
+from app.models.sync_job import SyncJob
+from app.services.job_service import (
+    JobAlreadyActive, submit_job, request_cancel, list_jobs, job_as_dict, get_job_runner
+)
+
+router = APIRouter(prefix="/api/jobs")
+
+
+async def accept_job(db: AsyncSession, job_type: str, params: Dict[str, Any], label: str) -> Dict[str, Any]:
+    """
+    Enregistre une tâche de synchronisation et répond immédiatement (202) ;
+    l'avancement se lit sur GET /api/jobs/{job_id}
+    """
+    try:
+        job = await submit_job(db, job_type, params)
+    except JobAlreadyActive as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": f"{label} déjà en cours", "job_id": e.job_id}
+        )
+    get_job_runner().wake()
+    return {
+        "status": "accepted",
+        "message": f"{label} lancée",
+        "data": {"job_id": job.id, "job_type": job.job_type}
+    }
+
+
+@router.get("")
+async def get_jobs(limit: int = 20, db: AsyncSession = Depends(get_db)):
+    """
+    Dernières tâches de synchronisation, de la plus récente à la plus ancienne
+    """
+    return [job_as_dict(job) for job in await list_jobs(db, limit)]
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Statut, avancement et résultat d'une tâche
+    """
+    job = await db.get(SyncJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Tâche {job_id} non trouvée")
+    return job_as_dict(job)
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Annule une tâche en attente, ou demande l'arrêt d'une tâche en cours
+    (prise en compte au tick suivant du worker)
+    """
+    job = await request_cancel(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Tâche {job_id} non trouvée")
+    get_job_runner().wake()
+    return job_as_dict(job)
@@ -1,20 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
-from app.services.sync.league_service import LeagueSyncService
+from app.routers.jobs import accept_job
 
 router = APIRouter(prefix="/api/sync")
 
-@router.post("/leagues")
+@router.post("/leagues", status_code=202)
 async def sync_leagues(db: AsyncSession = Depends(get_db)):
-    try:
-        service = LeagueSyncService(db)
-        result = await service.sync_leagues()
-        return result
-    
-    except Exception as e:
-        print(f"Sync Error: {str(e)}")  # Log l'erreur côté serveur
-        raise HTTPException(
-            status_code=500,
-            detail=str(e)
-        )
\ No newline at end of file
+    """
+    Lance la synchronisation des ligues en arrière-plan (suivi sur /api/jobs/{job_id})
+    """
+    return await accept_job(db, "leagues", {}, "Synchronisation des ligues")
@@ -1,24 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
-from app.services.sync.match_service import MatchSyncService
-from app.api.football.match_schemas import MatchSyncResponse
+from app.routers.jobs import accept_job
 
 router = APIRouter(prefix="/api/sync")
 
 
-@router.post("/matches", response_model=MatchSyncResponse)
-async def sync_matches(db: AsyncSession = Depends(get_db)):
+@router.post("/matches", status_code=202)
+async def sync_matches(incremental: bool = True, db: AsyncSession = Depends(get_db)):
     """
-    Endpoint pour synchroniser les matchs
+    Lance la synchronisation des matchs en arrière-plan (suivi sur /api/jobs/{job_id})
+    (incremental=false pour relire entièrement toutes les saisons)
     """
-    try:
-        service = MatchSyncService(db)
-        result = await service.sync_matches()
-        return result
-    except Exception as e:
-        print(f"Sync Error: {str(e)}")  # Log l'erreur côté serveur
-        raise HTTPException(
-            status_code=500,
-            detail=str(e)
-        )
+    return await accept_job(db, "matches", {"incremental": incremental}, "Synchronisation des matchs")
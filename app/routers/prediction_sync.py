@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, case
+from sqlalchemy import select
 from datetime import datetime
 from typing import Dict, Any
 from pydantic import BaseModel
 
 from app.db.session import get_db
 from app.services.sync.predictions_service import PredictionSyncService
+from app.services.sync_stats_service import get_sync_stats
+from app.routers.jobs import accept_job
 from app.models.match import Match
 
 # Response models
@@ -22,51 +24,25 @@ class SyncStatsResponse(BaseModel):
 
 router = APIRouter(prefix="/api/sync")
 
-@router.post("/predictions", response_model=SyncResponseBase)
-async def sync_predictions(db: AsyncSession = Depends(get_db)):
+@router.post("/predictions", response_model=SyncResponseBase, status_code=202)
+async def sync_predictions(prioritized: bool = False, db: AsyncSession = Depends(get_db)):
     """
-    Synchronise les prédictions pour tous les matchs non synchronisés
+    Lance la synchronisation des prédictions en arrière-plan (suivi sur /api/jobs/{job_id})
+    (prioritized=true : matchs les plus proches du coup d'envoi d'abord, dans les budgets quotidiens)
     """
-    try:
-        service = PredictionSyncService(db)
-        result = await service.sync_predictions()
-        
-        return {
-            "status": "success",
-            "message": f"Synchronisation terminée - {result['synced_matches']}/{result['total_matches']} matchs traités",
-            "data": {
-                "total_matches": result["total_matches"],
-                "synced_matches": result["synced_matches"],
-                "error_count": len(result["errors"]),
-                "errors": result["errors"][:5] if result["errors"] else []
-            }
-        }
-        
-    except Exception as e:
-        print(f"Erreur lors de la synchronisation: {str(e)}")
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Erreur lors de la synchronisation: {str(e)}"
-        )
+    return await accept_job(db, "predictions", {"prioritized": prioritized}, "Synchronisation des prédictions")
 
 @router.get("/predictions/status", response_model=SyncStatsResponse)
 async def get_predictions_status(db: AsyncSession = Depends(get_db)):
     """
-    Retourne les statistiques de synchronisation des prédictions
+    Retourne les statistiques de synchronisation des prédictions (ligne globale de sync_stats)
     """
     try:
-        query = select(
-            func.count(Match.id).label('total'),
-            func.sum(case((Match.predictions_synced == True, 1), else_=0)).label('synced'),
-            func.max(Match.last_predictions_sync).label('last_sync')
-        )
-        
-        result = await db.execute(query)
-        stats = result.first()
+        stats = await get_sync_stats(db)
         
-        total = stats.total or 0
-        synced = stats.synced or 0
-        last_sync = stats.last_sync.isoformat() if stats.last_sync else None
+        total = stats.total_matches if stats else 0
+        synced = stats.synced_predictions if stats else 0
+        last_sync = stats.predictions_last_sync.isoformat() if stats and stats.predictions_last_sync else None
         
         return {
             "status": "success",
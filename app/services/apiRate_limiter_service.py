@@ -1,103 +1,232 @@
 from datetime import datetime, timedelta
+from typing import Mapping, Optional
 import asyncio
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+import time
+from app.core.config import settings
+from app.db.upsert import upsert_rows
 from app.models.api_usage import ApiUsage
+from sqlalchemy import select
+
+class ApiQuotaExceeded(Exception):
+    """Le quota quotidien d'appels API est épuisé"""
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
 
 class ApiRateLimiter:
-    def __init__(self, max_calls_per_day: int, db: AsyncSession):
+    def __init__(self, calls_per_minute: int, max_calls_per_day: int, session_factory=None, headroom: int = 0):
         """
-        Initialise le limiteur d'appels API.
+        Initialise le limiteur d'appels API (token bucket en mémoire).
 
+        :param calls_per_minute: Limite d'appels API par minute (taille et débit du bucket)
         :param max_calls_per_day: Limite d'appels API par jour
-        :param db: Session de base de données
+        :param session_factory: Fabrique de sessions pour persister le compteur (AsyncSessionLocal par défaut)
+        :param headroom: Appels gardés en réserve sous les quotas restants annoncés par l'API
         """
+        self.configured_calls_per_minute = calls_per_minute
+        self.configured_max_calls_per_day = max_calls_per_day
+        self.calls_per_minute = calls_per_minute
         self.max_calls_per_day = max_calls_per_day  # Limite quotidienne
-        self.db = db  # Session de base de données
+        self.headroom = headroom
+        self.session_factory = session_factory
+        self.tokens = float(calls_per_minute)  # Jetons disponibles pour la minute en cours
         self.calls_made_today = 0  # Nombre d'appels effectués aujourd'hui
+        self.usage_date = datetime.now().date()
         self.reset_time = self._calculate_next_reset_time()  # Heure de réinitialisation
+        self._last_refill = time.monotonic()
+        self._unflushed_calls = 0  # Appels de ce process pas encore ajoutés au compteur en base
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
 
     def _calculate_next_reset_time(self):
         """
         Calcule la prochaine réinitialisation (minuit).
-        
+
         :return: Heure de la prochaine réinitialisation
         """
         now = datetime.now()
         next_reset = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
         return next_reset
 
-    async def _get_usage_from_db(self, today):
-        """
-        Récupère les données d'utilisation API pour la date actuelle depuis la base.
+    @property
+    def refill_rate(self) -> float:
+        """Jetons ajoutés par seconde"""
+        return self.calls_per_minute / 60.0
 
-        :param today: Date actuelle
-        :return: Objet ApiUsage ou None
-        """
-        stmt = select(ApiUsage).where(ApiUsage.date == today)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
-
-    async def _save_usage_to_db(self, today):
-        """
-        Crée une nouvelle entrée pour l'utilisation API.
+    def _refill(self) -> None:
+        """Ajoute les jetons accumulés depuis le dernier remplissage"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self.tokens = min(float(self.calls_per_minute), self.tokens + elapsed * self.refill_rate)
 
-        :param today: Date actuelle
-        """
-        new_usage = ApiUsage(date=today, calls_made=0, reset_time=self.reset_time)
-        self.db.add(new_usage)
-        await self.db.commit()
-
-    async def _update_usage(self, today):
-        """
-        Met à jour le nombre d'appels effectués aujourd'hui.
-
-        :param today: Date actuelle
-        """
-        stmt = (
-            update(ApiUsage)
-            .where(ApiUsage.date == today)
-            .values(calls_made=self.calls_made_today)
-        )
-        await self.db.execute(stmt)
-        await self.db.commit()
+    def _roll_day(self) -> None:
+        """Remet le compteur quotidien à zéro après minuit"""
+        today = datetime.now().date()
+        if today != self.usage_date:
+            self.usage_date = today
+            self.calls_made_today = 0
+            self._unflushed_calls = 0
+            self.reset_time = self._calculate_next_reset_time()
 
-    async def can_make_call(self) -> bool:
+    def can_make_call(self) -> bool:
         """
-        Vérifie si un appel API peut être effectué en respectant les limites.
+        Vérifie si le quota quotidien permet encore un appel.
 
         :return: True si un appel peut être effectué, False sinon
         """
-        today = datetime.now().date()
-        usage = await self._get_usage_from_db(today)
-
-        if usage:
-            self.calls_made_today = usage.calls_made
-        else:
-            # Initialiser une nouvelle entrée pour aujourd'hui si elle n'existe pas
-            self.calls_made_today = 0
-            await self._save_usage_to_db(today)
-
+        self._roll_day()
         return self.calls_made_today < self.max_calls_per_day
 
-    async def record_call(self):
-        """
-        Enregistre un appel API effectué.
-        """
-        today = datetime.now().date()
-
-        # Vérifie si un appel peut être effectué
-        if await self.can_make_call():
-            self.calls_made_today += 1
-            await self._update_usage(today)  # Mise à jour de la base
-        else:
-            raise Exception("Limite d'appels API atteinte pour aujourd'hui.")
-
-    async def reset_limits(self):
+    async def acquire(self) -> None:
+        """
+        Réserve un appel API : attend qu'un jeton soit disponible dans la minute,
+        lève ApiQuotaExceeded si le quota quotidien est atteint.
+        """
+        while True:
+            async with self._lock:
+                if not self.can_make_call():
+                    raise ApiQuotaExceeded("Limite d'appels API atteinte pour aujourd'hui.")
+
+                if self.calls_per_minute <= 0:
+                    wait = 0.0
+                else:
+                    self._refill()
+                    wait = (1.0 - self.tokens) / self.refill_rate
+
+                if wait <= 0:
+                    self.tokens -= 1.0
+                    self.calls_made_today += 1
+                    self._unflushed_calls += 1
+                    return
+
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Recale les budgets sur les quotas renvoyés par API-Football.
+
+        :param headers: En-têtes de la réponse (X-RateLimit-* pour la minute,
+                        x-ratelimit-requests-* pour la journée)
+        """
+        minute_limit = _int_header(headers, "x-ratelimit-limit")
+        minute_remaining = _int_header(headers, "x-ratelimit-remaining")
+        day_limit = _int_header(headers, "x-ratelimit-requests-limit")
+        day_remaining = _int_header(headers, "x-ratelimit-requests-remaining")
+
+        if minute_limit:
+            self.calls_per_minute = min(self.configured_calls_per_minute, minute_limit)
+        if day_limit:
+            self.max_calls_per_day = min(self.configured_max_calls_per_day, day_limit)
+
+        if minute_remaining is not None:
+            # Ne jamais disposer de plus de jetons que ce que le serveur accepte encore
+            self._refill()
+            self.tokens = min(self.tokens, float(max(0, minute_remaining - self.headroom)))
+        if day_remaining is not None:
+            self._roll_day()
+            # Appels vus par le serveur (autres process compris) : pris en compte sans être persistés
+            used_by_server = self.max_calls_per_day - max(0, day_remaining - self.headroom)
+            self.calls_made_today = max(self.calls_made_today, used_by_server)
+
+    def _get_session_factory(self):
+        if self.session_factory is None:
+            from app.db.session import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+        return self.session_factory
+
+    async def load(self) -> None:
+        """Reprend le compteur du jour depuis la base (redémarrage dans la journée)"""
+        async with self._get_session_factory()() as db:
+            result = await db.execute(select(ApiUsage.calls_made).where(ApiUsage.date == self.usage_date))
+            calls_made = result.scalar_one_or_none()
+        if calls_made:
+            self.calls_made_today = max(self.calls_made_today, calls_made)
+
+    async def flush(self) -> None:
+        """
+        Ajoute au compteur du jour en base les appels faits depuis la dernière sauvegarde,
+        puis relit le total : le web et le worker partagent le même compteur sans s'écraser.
+        """
+        usage_date = self.usage_date
+        delta = self._unflushed_calls
+        self._unflushed_calls = 0
+        try:
+            async with self._get_session_factory()() as db:
+                if delta:
+                    await upsert_rows(
+                        db, ApiUsage,
+                        [{
+                            "date": usage_date,
+                            "calls_made": delta,
+                            "reset_time": self.reset_time,
+                            "updated_at": datetime.utcnow()
+                        }],
+                        index_elements=["date"],
+                        update_columns=["reset_time", "updated_at"],
+                        increment_columns=["calls_made"]
+                    )
+                    await db.commit()
+                result = await db.execute(select(ApiUsage.calls_made).where(ApiUsage.date == usage_date))
+                calls_made = result.scalar_one_or_none()
+        except Exception as e:
+            if usage_date == self.usage_date:
+                self._unflushed_calls += delta
+            print(f"Erreur sauvegarde compteur API: {str(e)}")
+            return
+        if calls_made and usage_date == self.usage_date:
+            self.calls_made_today = max(self.calls_made_today, calls_made + self._unflushed_calls)
+
+    async def _flush_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    async def start(self, flush_interval: float = None) -> None:
+        """Charge le compteur et lance la sauvegarde périodique (démarrage de l'application)"""
+        try:
+            await self.load()
+        except Exception as e:
+            print(f"Erreur chargement compteur API: {str(e)}")
+        interval = flush_interval or settings.API_USAGE_FLUSH_INTERVAL
+        self._flush_task = asyncio.create_task(self._flush_periodically(interval))
+
+    async def stop(self) -> None:
+        """Arrête la sauvegarde périodique et persiste le compteur (arrêt de l'application)"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    def reset_limits(self):
         """
         Réinitialise les limites quotidiennes (à minuit).
         """
-        today = datetime.now().date()
+        self.usage_date = datetime.now().date()
         self.calls_made_today = 0
+        self.calls_per_minute = self.configured_calls_per_minute
+        self.max_calls_per_day = self.configured_max_calls_per_day
+        self.tokens = float(self.calls_per_minute)
         self.reset_time = self._calculate_next_reset_time()
-        await self._save_usage_to_db(today)  # Réinitialiser dans la base
+        self._unflushed_calls = 0
+
+# Limiteur partagé par tous les clients API du process
+_limiter: Optional[ApiRateLimiter] = None
+
+def get_rate_limiter() -> ApiRateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = ApiRateLimiter(
+            settings.API_RATE_LIMIT,
+            settings.API_MAX_CALLS_PER_DAY,
+            headroom=settings.API_RATE_LIMIT_HEADROOM
+        )
+    return _limiter
@@ -0,0 +1,344 @@
+import asyncio
+import json
+import os
+import socket
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.sync_job import SyncJob
+
+# Statuts d'une tâche
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = [PENDING, RUNNING]
+
+# Erreurs conservées dans le résultat d'une tâche (le total est dans error_count)
+MAX_RESULT_ERRORS = 20
+
+
+class JobAlreadyActive(Exception):
+    """Une tâche du même type est déjà en attente ou en cours"""
+
+    def __init__(self, job_id: int):
+        super().__init__(f"Tâche {job_id} déjà en attente ou en cours")
+        self.job_id = job_id
+
+
+class JobProgress:
+    """Avancement déclaré par le traitement, persisté par le runner à chaque tick"""
+
+    def __init__(self):
+        self.done = 0
+        self.total: Optional[int] = None
+        self.message: Optional[str] = None
+
+
+_current_progress: ContextVar[Optional[JobProgress]] = ContextVar("sync_job_progress", default=None)
+
+
+def report_progress(done: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+    """Déclare l'avancement de la tâche en cours (sans effet hors d'une tâche)"""
+    progress = _current_progress.get()
+    if progress is None:
+        return
+    progress.done = done
+    if total is not None:
+        progress.total = total
+    if message is not None:
+        progress.message = message[:255]
+
+
+# Traitements exécutables : job_type -> coroutine(db, params)
+async def _run_leagues(db: AsyncSession, params: Dict[str, Any]):
+    from app.services.sync.league_service import LeagueSyncService
+    return await LeagueSyncService(db).sync_leagues()
+
+
+async def _run_matches(db: AsyncSession, params: Dict[str, Any]):
+    from app.services.sync.match_service import MatchSyncService
+    return await MatchSyncService(db).sync_matches(incremental=params.get("incremental", True))
+
+
+async def _run_predictions(db: AsyncSession, params: Dict[str, Any]):
+    from app.services.sync.predictions_service import PredictionSyncService
+    service = PredictionSyncService(db)
+    if params.get("prioritized"):
+        return await service.prefetch_predictions()
+    return await service.sync_predictions()
+
+
+async def _run_evaluation(db: AsyncSession, params: Dict[str, Any]):
+    from prediction_outcome_service import PredictionEvaluationService
+    return await PredictionEvaluationService(db).evaluate_all_predictions(full=params.get("full", False))
+
+
+JOB_TYPES: Dict[str, Callable[[AsyncSession, Dict[str, Any]], Awaitable[Any]]] = {
+    "leagues": _run_leagues,
+    "matches": _run_matches,
+    "predictions": _run_predictions,
+    "evaluation": _run_evaluation,
+}
+
+
+def _serialize_result(result: Any) -> str:
+    """Résultat JSON de la tâche, liste d'erreurs tronquée"""
+    if hasattr(result, "model_dump"):
+        result = result.model_dump()
+    if isinstance(result, dict) and isinstance(result.get("errors"), list):
+        errors = result["errors"]
+        result = {**result, "errors": errors[:MAX_RESULT_ERRORS], "error_count": len(errors)}
+    return json.dumps(result, default=str)
+
+
+def job_as_dict(job: SyncJob) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "params": json.loads(job.params) if job.params else {},
+        "progress": {"done": job.progress_done, "total": job.progress_total, "message": job.message},
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "cancel_requested": job.cancel_requested,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+async def _fail_stale_jobs(db: AsyncSession, now: datetime) -> None:
+    """Marque en échec les tâches dont le worker ne donne plus signe de vie (sans commit)"""
+    await db.execute(
+        update(SyncJob)
+        .where(
+            SyncJob.status == RUNNING,
+            SyncJob.heartbeat_at < now - timedelta(seconds=settings.JOB_STALE_AFTER)
+        )
+        .values(status=FAILED, error="Worker arrêté pendant la tâche", finished_at=now)
+    )
+
+
+async def submit_job(db: AsyncSession, job_type: str, params: Optional[Dict[str, Any]] = None) -> SyncJob:
+    """
+    Enregistre une tâche en attente. L'unicité par type est garantie par l'index unique
+    partiel ix_sync_jobs_active_type : deux soumissions concurrentes ne créent qu'une tâche.
+    Raises:
+        ValueError: type de tâche inconnu
+        JobAlreadyActive: une tâche du même type est déjà en attente ou en cours
+    """
+    if job_type not in JOB_TYPES:
+        raise ValueError(f"Type de tâche inconnu : {job_type}")
+    await _fail_stale_jobs(db, datetime.utcnow())
+    job = SyncJob(
+        job_type=job_type, status=PENDING, params=json.dumps(params or {}),
+        progress_done=0, cancel_requested=False
+    )
+    try:
+        # Savepoint : un refus de l'index n'expire pas les objets déjà chargés par l'appelant
+        async with db.begin_nested():
+            db.add(job)
+    except IntegrityError:
+        await db.commit()
+        active_id = await db.scalar(
+            select(SyncJob.id)
+            .where(SyncJob.job_type == job_type, SyncJob.status.in_(ACTIVE_STATUSES))
+            .limit(1)
+        )
+        raise JobAlreadyActive(active_id)
+    await db.commit()
+    return job
+
+
+async def request_cancel(db: AsyncSession, job_id: int) -> Optional[SyncJob]:
+    """Annule une tâche en attente, ou demande l'arrêt d'une tâche en cours au worker"""
+    # Mises à jour conditionnelles : le worker peut réclamer la tâche entre-temps
+    cancelled = await db.execute(
+        update(SyncJob)
+        .where(SyncJob.id == job_id, SyncJob.status == PENDING)
+        .values(status=CANCELLED, finished_at=datetime.utcnow())
+    )
+    if cancelled.rowcount == 0:
+        await db.execute(
+            update(SyncJob)
+            .where(SyncJob.id == job_id, SyncJob.status == RUNNING)
+            .values(cancel_requested=True)
+        )
+    await db.commit()
+    return await db.get(SyncJob, job_id, populate_existing=True)
+
+
+async def list_jobs(db: AsyncSession, limit: int = 20) -> List[SyncJob]:
+    result = await db.execute(select(SyncJob).order_by(SyncJob.id.desc()).limit(limit))
+    return list(result.scalars())
+
+
+class JobRunner:
+    """
+    Exécute les tâches en attente de sync_jobs : un tick réclame les nouvelles tâches
+    (au plus une en cours par type, tous process confondus), persiste l'avancement
+    et le signe de vie des tâches en cours et relaie les demandes d'annulation.
+    Peut tourner dans le process web ou dans le worker (python -m app.worker).
+    """
+
+    def __init__(self, session_factory=None, poll_interval: float = None, worker_name: str = None):
+        """
+        :param session_factory: Fabrique de sessions (AsyncSessionLocal par défaut)
+        :param poll_interval: Secondes entre deux ticks (JOB_POLL_INTERVAL par défaut)
+        """
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        self.worker_name = worker_name or f"{socket.gethostname()}:{os.getpid()}"
+        self._jobs: Dict[int, Tuple[str, asyncio.Task, JobProgress]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def _get_session_factory(self):
+        if self.session_factory is None:
+            from app.db.session import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+        return self.session_factory
+
+    def wake(self) -> None:
+        """Déclenche un tick sans attendre l'intervalle (nouvelle tâche soumise)"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _execute(self, job_id: int, job_type: str, params: Dict[str, Any], progress: JobProgress) -> None:
+        _current_progress.set(progress)
+        values: Dict[str, Any] = {}
+        try:
+            async with self._get_session_factory()() as db:
+                result = await JOB_TYPES[job_type](db, params)
+            values = {"status": SUCCEEDED, "result": _serialize_result(result)}
+        except asyncio.CancelledError:
+            values = {"status": CANCELLED}
+        except Exception as e:
+            print(f"Erreur tâche {job_id} ({job_type}): {str(e)}")
+            values = {"status": FAILED, "error": str(e)}
+        finally:
+            values.update(
+                progress_done=progress.done, progress_total=progress.total, message=progress.message,
+                finished_at=datetime.utcnow()
+            )
+            async with self._get_session_factory()() as db:
+                await db.execute(update(SyncJob).where(SyncJob.id == job_id).values(**values))
+                await db.commit()
+            print(f"Tâche {job_id} ({job_type}) : {values['status']}")
+
+    async def _refresh_running(self, db: AsyncSession, now: datetime) -> None:
+        """Persiste avancement et signe de vie, annule les tâches dont l'arrêt est demandé"""
+        for job_id, (_, task, progress) in list(self._jobs.items()):
+            if task.done():
+                del self._jobs[job_id]
+                continue
+            await db.execute(
+                update(SyncJob).where(SyncJob.id == job_id).values(
+                    heartbeat_at=now, progress_done=progress.done,
+                    progress_total=progress.total, message=progress.message
+                )
+            )
+        if self._jobs:
+            result = await db.execute(
+                select(SyncJob.id).where(SyncJob.id.in_(list(self._jobs)), SyncJob.cancel_requested.is_(True))
+            )
+            for job_id in result.scalars():
+                self._jobs[job_id][1].cancel()
+
+    async def _claim_pending(self, db: AsyncSession, now: datetime) -> None:
+        """Réclame les tâches en attente dont le type n'a pas de tâche en cours"""
+        running_types = set(
+            (await db.execute(select(SyncJob.job_type).where(SyncJob.status == RUNNING))).scalars()
+        )
+        pending = (await db.execute(
+            select(SyncJob.id, SyncJob.job_type, SyncJob.params)
+            .where(SyncJob.status == PENDING)
+            .order_by(SyncJob.id)
+        )).all()
+        for job_id, job_type, params in pending:
+            if job_type in running_types:
+                continue
+            # Réclamation atomique : un autre process peut viser la même tâche
+            claimed = await db.execute(
+                update(SyncJob)
+                .where(SyncJob.id == job_id, SyncJob.status == PENDING)
+                .values(status=RUNNING, worker=self.worker_name, started_at=now, heartbeat_at=now)
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                continue
+            running_types.add(job_type)
+            if job_type not in JOB_TYPES:
+                await db.execute(
+                    update(SyncJob).where(SyncJob.id == job_id)
+                    .values(status=FAILED, error=f"Type de tâche inconnu : {job_type}", finished_at=now)
+                )
+                await db.commit()
+                continue
+            progress = JobProgress()
+            task = asyncio.create_task(self._execute(job_id, job_type, json.loads(params or "{}"), progress))
+            self._jobs[job_id] = (job_type, task, progress)
+            print(f"Tâche {job_id} ({job_type}) démarrée par {self.worker_name}")
+
+    async def run_once(self) -> None:
+        """Un tick du runner"""
+        now = datetime.utcnow()
+        async with self._get_session_factory()() as db:
+            await self._refresh_running(db, now)
+            await _fail_stale_jobs(db, now)
+            await db.commit()
+            await self._claim_pending(db, now)
+
+    async def join(self) -> None:
+        """Attend la fin des tâches lancées par ce runner"""
+        while self._jobs:
+            await asyncio.gather(*(task for _, task, _ in self._jobs.values()), return_exceptions=True)
+            self._jobs = {job_id: job for job_id, job in self._jobs.items() if not job[1].done()}
+
+    async def _run_periodically(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Erreur runner de tâches: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def start(self) -> None:
+        """Lance le runner (démarrage de l'application ou du worker)"""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run_periodically())
+
+    async def stop(self) -> None:
+        """Arrête le runner ; les tâches en cours sont annulées"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for _, task, _ in self._jobs.values():
+            task.cancel()
+        await self.join()
+
+
+_runner: Optional[JobRunner] = None
+
+def get_job_runner() -> JobRunner:
+    global _runner
+    if _runner is None:
+        _runner = JobRunner()
+    return _runner
@@ -1,76 +1,87 @@
+import time
 from datetime import datetime
-from sqlalchemy import select, func, case
+from typing import Any, Awaitable, Callable, Dict, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.match import Match
+from app.core.config import settings
+from app.services.sync_stats_service import get_sync_stats
 
-async def get_dashboard_stats(db: AsyncSession) -> dict:
-    """
-    Récupère toutes les statistiques pour le dashboard
-    """
-    try:
-        # Stats des matchs
-        total_matches_query = select(func.count(Match.id))
-        result = await db.execute(total_matches_query)
-        total_matches = result.scalar_one() or 0
+# Instantanés des stats du dashboard : clé -> (expiration, stats)
+_snapshots: Dict[str, Tuple[float, dict]] = {}
+# Incrémenté à chaque invalidation pour ne pas mémoriser un calcul lancé avant un commit
+_generation = 0
 
-        # Stats des matchs par status
-        ft_query = select(func.count(Match.id)).where(Match.status == 'FT')
-        result = await db.execute(ft_query)
-        ft_matches = result.scalar_one() or 0
+def invalidate_dashboard_stats() -> None:
+    """Invalide les stats du dashboard (appelé par les synchronisations après commit)"""
+    global _generation
+    _generation += 1
+    _snapshots.clear()
 
-        ns_query = select(func.count(Match.id)).where(Match.status == 'NS')
-        result = await db.execute(ns_query)
-        ns_matches = result.scalar_one() or 0
+async def cached_dashboard_stats(key: str, loader: Callable[[], Awaitable[dict]]) -> dict:
+    """Retourne l'instantané encore valide pour key, sinon le recalcule via loader"""
+    now = time.monotonic()
+    snapshot = _snapshots.get(key)
+    if snapshot is not None and snapshot[0] > now:
+        return snapshot[1]
 
-        # Stats des prédictions
-        synced_query = select(func.count(Match.id)).where(Match.predictions_synced == True)
-        result = await db.execute(synced_query)
-        synced_matches = result.scalar_one() or 0
+    generation = _generation
+    stats = await loader()
+    if generation == _generation:
+        _snapshots[key] = (now + settings.DASHBOARD_STATS_TTL, stats)
+    return stats
 
-        pending_matches = total_matches - synced_matches
+async def _load_match_stats(db: AsyncSession) -> Dict[str, Any]:
+    """Stats des matchs lues dans la ligne globale de sync_stats (tenue à jour par les syncs)"""
+    stats = await get_sync_stats(db)
 
-        # Dates de dernière mise à jour
-        matches_update_query = select(func.max(Match.updated_at))
-        result = await db.execute(matches_update_query)
-        matches_last_sync = result.scalar_one_or_none()
-        
-        predictions_update_query = select(func.max(Match.last_predictions_sync))
-        result = await db.execute(predictions_update_query)
-        predictions_last_sync = result.scalar_one_or_none()
-        
-        # Formater les dates
-        matches_formatted_date = matches_last_sync.strftime("%d/%m/%Y %H:%M:%S") if matches_last_sync else "Jamais"
-        predictions_formatted_date = predictions_last_sync.strftime("%d/%m/%Y %H:%M:%S") if predictions_last_sync else "Jamais"
+    total_matches = stats.total_matches if stats else 0
+    ft_matches = stats.finished_matches if stats else 0
+    ns_matches = stats.upcoming_matches if stats else 0
+    synced_matches = stats.synced_predictions if stats else 0
+    pending_matches = total_matches - synced_matches
+    matches_last_sync = stats.matches_last_sync if stats else None
+    predictions_last_sync = stats.predictions_last_sync if stats else None
 
-        return {
-            # Stats des matchs
-            "total_matches": total_matches,
-            "match_status": {
-                "Terminés": {
-                    "count": ft_matches,
-                    "percentage": round((ft_matches/total_matches*100), 1) if total_matches > 0 else 0
-                },
-                "À venir": {
-                    "count": ns_matches,
-                    "percentage": round((ns_matches/total_matches*100), 1) if total_matches > 0 else 0
-                }
+    # Formater les dates
+    matches_formatted_date = matches_last_sync.strftime("%d/%m/%Y %H:%M:%S") if matches_last_sync else "Jamais"
+    predictions_formatted_date = predictions_last_sync.strftime("%d/%m/%Y %H:%M:%S") if predictions_last_sync else "Jamais"
+
+    return {
+        # Stats des matchs
+        "total_matches": total_matches,
+        "match_status": {
+            "Terminés": {
+                "count": ft_matches,
+                "percentage": round((ft_matches/total_matches*100), 1) if total_matches > 0 else 0
             },
-            "matches_last_sync": matches_formatted_date,
-            
-            # Stats des prédictions
-            "total_predictions": total_matches,
-            "predictions_status": {
-                "Synchronisés": {
-                    "count": synced_matches,
-                    "percentage": round((synced_matches/total_matches*100), 1) if total_matches > 0 else 0
-                },
-                "En attente": {
-                    "count": pending_matches,
-                    "percentage": round((pending_matches/total_matches*100), 1) if total_matches > 0 else 0
-                }
+            "À venir": {
+                "count": ns_matches,
+                "percentage": round((ns_matches/total_matches*100), 1) if total_matches > 0 else 0
+            }
+        },
+        "matches_last_sync": matches_formatted_date,
+
+        # Stats des prédictions
+        "total_predictions": total_matches,
+        "predictions_status": {
+            "Synchronisés": {
+                "count": synced_matches,
+                "percentage": round((synced_matches/total_matches*100), 1) if total_matches > 0 else 0
             },
-            "predictions_last_sync": predictions_formatted_date
-        }
+            "En attente": {
+                "count": pending_matches,
+                "percentage": round((pending_matches/total_matches*100), 1) if total_matches > 0 else 0
+            }
+        },
+        "predictions_last_sync": predictions_formatted_date
+    }
+
+async def get_dashboard_stats(db: AsyncSession) -> dict:
+    """
+    Récupère toutes les statistiques pour le dashboard
+    (lecture de sync_stats, mise en cache DASHBOARD_STATS_TTL secondes)
+    """
+    try:
+        return await cached_dashboard_stats("matches", lambda: _load_match_stats(db))
 
     except Exception as e:
         print(f"Erreur lors de la récupération des stats: {str(e)}")
@@ -0,0 +1,133 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, delete, insert, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.upsert import upsert_rows, chunked
+from app.models.match import Match
+from app.models.prediction import Prediction, PredictionOutcome
+from app.models.prediction_accuracy import PredictionAccuracy
+
+# Portée globale (toutes ligues / toutes saisons)
+ALL = 0
+
+Scope = Tuple[str, int, int]
+
+
+def prediction_type_expression(advice_category):
+    """Équivalent SQL de PredictionEvaluationService._get_prediction_type"""
+    lowered = func.lower(advice_category)
+    return case(
+        (lowered.like('%double chance%'), case((lowered.like('%combo%'), "Combo Double chance"), else_="Double chance")),
+        (lowered.like('%winner%'), case((lowered.like('%combo%'), "Combo Winner"), else_="Winner")),
+        else_="Unknown"
+    )
+
+
+def _scopes(prediction_type: str, league_id: Optional[int], season: Optional[int]):
+    """Lignes de cumul touchées par un outcome : global, ligue, ligue + saison"""
+    yield prediction_type, ALL, ALL
+    if league_id:
+        yield prediction_type, league_id, ALL
+        if season:
+            yield prediction_type, league_id, season
+
+
+class PredictionAccuracyRollup:
+    """
+    Cumul correct/total des prédictions winner par type, ligue et saison.
+    Chargé en mémoire pour l'évaluation, les variations sont écrites en deltas
+    dans la même transaction que les outcomes.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.counts: Dict[Scope, list] = {}
+        self._pending: Dict[Scope, list] = defaultdict(lambda: [0, 0])
+
+    async def load(self) -> None:
+        result = await self.db.execute(
+            select(
+                PredictionAccuracy.prediction_type,
+                PredictionAccuracy.league_id,
+                PredictionAccuracy.season,
+                PredictionAccuracy.correct,
+                PredictionAccuracy.total
+            )
+        )
+        self.counts = {(row[0], row[1], row[2]): [row[3], row[4]] for row in result.all()}
+        self._pending.clear()
+
+    def add(self, prediction_type: str, league_id: Optional[int], season: Optional[int],
+            correct_delta: int, total_delta: int) -> None:
+        """Enregistre la variation due à un outcome créé (total +1) ou réévalué (total inchangé)"""
+        if not correct_delta and not total_delta:
+            return
+        for scope in _scopes(prediction_type, league_id, season):
+            counts = self.counts.setdefault(scope, [0, 0])
+            counts[0] += correct_delta
+            counts[1] += total_delta
+            pending = self._pending[scope]
+            pending[0] += correct_delta
+            pending[1] += total_delta
+
+    def accuracy(self, prediction_type: str, league_id: int = ALL, season: int = ALL) -> float:
+        """Précision (0-100%) pour un type de prédiction, 0 sans historique"""
+        correct, total = self.counts.get((prediction_type, league_id, season), (0, 0))
+        return (correct / total) * 100 if total else 0
+
+    async def flush(self) -> None:
+        """Écrit les deltas en attente (INSERT ... ON CONFLICT DO UPDATE SET total = total + delta)"""
+        if not self._pending:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {
+                "prediction_type": prediction_type,
+                "league_id": league_id,
+                "season": season,
+                "correct": correct,
+                "total": total,
+                "updated_at": now
+            }
+            for (prediction_type, league_id, season), (correct, total) in self._pending.items()
+        ]
+        await upsert_rows(
+            self.db, PredictionAccuracy, rows,
+            index_elements=["prediction_type", "league_id", "season"],
+            update_columns=["updated_at"],
+            increment_columns=["correct", "total"]
+        )
+        self._pending.clear()
+
+    async def rebuild(self) -> None:
+        """Recalcule entièrement le cumul à partir des outcomes (sans commit)"""
+        prediction_type = prediction_type_expression(Prediction.advice_category)
+        result = await self.db.execute(
+            select(
+                prediction_type,
+                Match.league_id,
+                Match.season,
+                func.count(case((PredictionOutcome.winner_prediction_correct.is_(True), 1))),
+                func.count(PredictionOutcome.id)
+            )
+            .join(Prediction, PredictionOutcome.prediction_id == Prediction.id)
+            .join(Match, Prediction.match_id == Match.id)
+            .group_by(prediction_type, Match.league_id, Match.season)
+        )
+
+        self.counts = {}
+        for type_, league_id, season, correct, total in result.all():
+            for scope in _scopes(type_, league_id, season):
+                counts = self.counts.setdefault(scope, [0, 0])
+                counts[0] += correct
+                counts[1] += total
+        self._pending.clear()
+
+        await self.db.execute(delete(PredictionAccuracy))
+        rows = [
+            {"prediction_type": type_, "league_id": league_id, "season": season, "correct": correct, "total": total}
+            for (type_, league_id, season), (correct, total) in self.counts.items()
+        ]
+        for chunk in chunked(rows):
+            await self.db.execute(insert(PredictionAccuracy), list(chunk))
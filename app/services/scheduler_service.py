@@ -0,0 +1,205 @@
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.sync_state import SyncState
+from app.services.job_service import JOB_TYPES, JobAlreadyActive, submit_job, get_job_runner
+from app.services.sync_state_service import set_watermark
+
+# Préfixe des lignes sync_state des planifications : watermark = dernier déclenchement
+SCHEDULE_STATE_PREFIX = "schedule_"
+
+# Paramètres des tâches lancées par le planificateur
+SCHEDULED_JOB_PARAMS: Dict[str, Dict] = {
+    "matches": {"incremental": True},
+    "predictions": {"prioritized": True},
+    "evaluation": {"full": False},
+}
+
+# Bornes des champs cron : minute, heure, jour du mois, mois, jour de la semaine (0 ou 7 = dimanche)
+CRON_FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+class CronSchedule:
+    """
+    Expression cron à 5 champs (minute heure jour mois jour_semaine), en heure UTC.
+    Syntaxe : *, valeurs, listes (1,15), plages (1-5) et pas (*/15, 0-30/10).
+    Comme cron, si jour du mois et jour de la semaine sont tous deux restreints,
+    l'un ou l'autre suffit.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Expression cron invalide (5 champs attendus) : {expression}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(field, low, high, expression) for field, (low, high) in zip(fields, CRON_FIELDS)
+        )
+        if 7 in self.weekdays:
+            self.weekdays = (self.weekdays - {7}) | {0}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int, expression: str) -> Set[int]:
+        values: Set[int] = set()
+        try:
+            for part in field.split(","):
+                bounds, _, step = part.partition("/")
+                step = int(step) if step else 1
+                if bounds == "*":
+                    start, end = low, high
+                elif "-" in bounds:
+                    start, end = (int(value) for value in bounds.split("-", 1))
+                else:
+                    start = int(bounds)
+                    end = high if step > 1 else start
+                if not low <= start <= end <= high or step < 1:
+                    raise ValueError(part)
+                values.update(range(start, end + 1, step))
+        except ValueError:
+            raise ValueError(f"Expression cron invalide : {expression}") from None
+        return values
+
+    def _day_matches(self, day: date) -> bool:
+        in_days = day.day in self.days
+        in_weekdays = day.isoweekday() % 7 in self.weekdays
+        if self._any_day:
+            return in_weekdays
+        if self._any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Première échéance strictement postérieure à moment"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Un 29 février peut être distant de 8 ans
+        limit = candidate + timedelta(days=366 * 8)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Expression cron sans échéance : {self.expression}")
+
+
+class SyncScheduler:
+    """
+    Déclenche les tâches de synchronisation selon SYNC_SCHEDULES (job_type -> expression cron).
+    Chaque échéance est décalée d'un délai aléatoire (au plus SCHEDULER_JITTER secondes,
+    identique pour tous les process) pour étaler les appels API et la charge base.
+    Le dernier déclenchement est persisté dans sync_state : après un arrêt, les échéances
+    manquées donnent une seule exécution. Une échéance dont la tâche précédente du même
+    type est encore active est ignorée (pas de chevauchement, voir submit_job).
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        interval: float = None,
+        schedules: Optional[Dict[str, str]] = None,
+        jitter: Optional[float] = None
+    ):
+        """
+        :param session_factory: Fabrique de sessions (AsyncSessionLocal par défaut)
+        :param interval: Secondes entre deux vérifications (SCHEDULER_INTERVAL par défaut)
+        :param schedules: Planifications (SYNC_SCHEDULES par défaut)
+        :param jitter: Décalage aléatoire max en secondes (SCHEDULER_JITTER par défaut)
+        """
+        self.session_factory = session_factory
+        self.interval = interval or settings.SCHEDULER_INTERVAL
+        self.jitter = settings.SCHEDULER_JITTER if jitter is None else jitter
+        schedules = settings.SYNC_SCHEDULES if schedules is None else schedules
+        for job_type in schedules:
+            if job_type not in JOB_TYPES:
+                raise ValueError(f"Type de tâche inconnu dans la planification : {job_type}")
+        self.schedules = {job_type: CronSchedule(expression) for job_type, expression in schedules.items()}
+        self._task: Optional[asyncio.Task] = None
+
+    def _get_session_factory(self):
+        if self.session_factory is None:
+            from app.db.session import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+        return self.session_factory
+
+    def _jitter(self, job_type: str, due: datetime) -> timedelta:
+        """Décalage de l'échéance, tiré de (type, échéance) : tous les process tirent le même"""
+        rng = random.Random(f"{job_type}:{due.isoformat()}")
+        return timedelta(seconds=rng.uniform(0, max(0.0, self.jitter)))
+
+    async def run_once(self, now: Optional[datetime] = None) -> List[str]:
+        """Une vérification : soumet les tâches arrivées à échéance, retourne leurs types"""
+        now = now or datetime.utcnow()
+        submitted = []
+        async with self._get_session_factory()() as db:
+            result = await db.execute(
+                select(SyncState.name, SyncState.watermark)
+                .where(SyncState.name.in_([SCHEDULE_STATE_PREFIX + job_type for job_type in self.schedules]))
+            )
+            last_runs = {
+                name[len(SCHEDULE_STATE_PREFIX):]: watermark.replace(tzinfo=None)
+                for name, watermark in result.all() if watermark is not None
+            }
+
+            for job_type, schedule in self.schedules.items():
+                last_run = last_runs.get(job_type)
+                if last_run is not None:
+                    due = schedule.next_after(last_run)
+                    if now < due + self._jitter(job_type, due):
+                        continue
+                    try:
+                        job = await submit_job(db, job_type, SCHEDULED_JOB_PARAMS.get(job_type, {}))
+                        submitted.append(job_type)
+                        print(f"Planification {job_type} ({schedule.expression}) : tâche {job.id} soumise")
+                    except JobAlreadyActive as e:
+                        print(f"Planification {job_type} ignorée : tâche {e.job_id} encore active")
+                # Première vérification : l'échéance suivante part de maintenant (pas de rattrapage)
+                await set_watermark(db, SCHEDULE_STATE_PREFIX + job_type, now)
+                await db.commit()
+
+        if submitted:
+            get_job_runner().wake()
+        return submitted
+
+    async def _run_periodically(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Erreur planificateur: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        """Lance le planificateur (démarrage de l'application ou du worker)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_periodically())
+
+    async def stop(self) -> None:
+        """Arrête le planificateur"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_scheduler: Optional[SyncScheduler] = None
+
+def get_scheduler() -> SyncScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = SyncScheduler()
+    return _scheduler
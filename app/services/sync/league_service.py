@@ -1,49 +1,51 @@
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, distinct
+from sqlalchemy import select, func, distinct, case, insert, update
 from app.api.football.league_client import FootballAPIClient
 from app.api.football.league_schemas import ApiResponse, LeagueSyncResponse
+from app.db.upsert import upsert_rows, chunked
 from app.models.league import League, Season
+from app.services.matches_stats_services import cached_dashboard_stats, invalidate_dashboard_stats
+
+# Colonnes réécrites quand une league existe déjà
+LEAGUE_UPDATE_COLUMNS = ["name", "country", "logo", "flag", "type", "updated_at"]
 
 class LeagueSyncService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.client = FootballAPIClient()
 
+    async def _load_dashboard_stats_league(self) -> dict:
+        """Nombre de leagues avec prédictions et dernière mise à jour, en une requête"""
+        query = select(
+            func.count(distinct(case((Season.has_predictions.is_(True), Season.league_id)))).label("leagues_count"),
+            select(func.max(League.updated_at)).scalar_subquery().label("last_sync")
+        )
+        result = await self.db.execute(query)
+        stats = result.one()
+        leagues_count = stats.leagues_count or 0
+        last_sync = stats.last_sync
+        print(f"\nNombre total de leagues avec prédictions: {leagues_count}")
+
+        formatted_date = "Jamais"
+        if last_sync:
+            try:
+                formatted_date = last_sync.strftime("%d/%m/%Y %H:%M:%S")
+            except Exception as e:
+                print(f"Erreur lors du formatage de la date: {str(e)}")
+                formatted_date = "Erreur format"
+
+        return {
+            "leagues_count": leagues_count,
+            "last_sync": formatted_date
+        }
+
     async def get_dashboard_stats_league (self) -> dict:
         """
-        Récupère les statistiques pour le dashboard
+        Récupère les statistiques pour le dashboard (mises en cache DASHBOARD_STATS_TTL secondes)
         """
         try:
-            print("\n=== Début récupération des stats dashboard ===")
-
-            # Compter les leagues avec prédictions
-            count_query = select(func.count(distinct(League.id))).select_from(League).join(
-                Season,
-                (League.id == Season.league_id) & (Season.has_predictions.is_(True))
-            )
-            count_result = await self.db.execute(count_query)
-            leagues_count = count_result.scalar_one_or_none() or 0
-            print(f"\nNombre total de leagues avec prédictions: {leagues_count}")
-
-            # Récupérer la dernière mise à jour
-            update_query = select(func.max(League.updated_at)).select_from(League)
-            update_result = await self.db.execute(update_query)
-            last_sync = update_result.scalar_one_or_none()
-
-            formatted_date = "Jamais"
-            if last_sync:
-                try:
-                    formatted_date = last_sync.strftime("%d/%m/%Y %H:%M:%S")
-                except Exception as e:
-                    print(f"Erreur lors du formatage de la date: {str(e)}")
-                    formatted_date = "Erreur format"
-
-            print("\n=== Fin récupération des stats dashboard ===")
-            return {
-                "leagues_count": leagues_count,
-                "last_sync": formatted_date
-            }
+            return await cached_dashboard_stats("leagues", self._load_dashboard_stats_league)
 
         except Exception as e:
             print(f"\nErreur dans get_dashboard_stats: {str(e)}")
@@ -56,7 +58,9 @@ class LeagueSyncService:
 
     async def sync_leagues(self) -> LeagueSyncResponse:
         """
-        Synchronise toutes les leagues depuis l'API
+        Synchronise toutes les leagues depuis l'API.
+        Leagues et saisons existantes sont chargées en une fois, le diff est calculé
+        en mémoire et seules les lignes nouvelles ou modifiées sont écrites.
         """
         try:
             print("\n=== Début synchronisation des leagues ===")
@@ -69,6 +73,7 @@ class LeagueSyncService:
             api_response = ApiResponse(**api_data)
 
             total_leagues = len(api_response.response)
+            total_seasons = sum(len(league_data.seasons) for league_data in api_response.response)
             synced_leagues = 0
             synced_seasons = 0
             created_leagues = 0
@@ -77,92 +82,106 @@ class LeagueSyncService:
 
             print(f"\nTraitement de {total_leagues} leagues...")
 
+            # État actuel de la base, indexé par clé naturelle
+            result = await self.db.execute(
+                select(League.api_id, League.id, League.name, League.country,
+                       League.logo, League.flag, League.type)
+            )
+            db_leagues = {row.api_id: row for row in result.all()}
+
+            result = await self.db.execute(
+                select(Season.league_id, Season.year, Season.id, Season.current,
+                       Season.has_predictions, Season.has_odds)
+            )
+            db_seasons = {(row.league_id, row.year): row for row in result.all()}
+
+            # Diff des leagues
+            league_rows = []
             for league_data in api_response.response:
-                try:
-                    stmt = select(League).where(League.api_id == league_data.league.id)
-                    result = await self.db.execute(stmt)
-                    db_league = result.scalar_one_or_none()
-
-                    if db_league:
-                        db_league.name = league_data.league.name
-                        db_league.country = league_data.country.name
-                        db_league.logo = league_data.league.logo
-                        db_league.flag = league_data.country.flag
-                        db_league.type = league_data.league.type
-                        db_league.updated_at = current_time
-                        updated_leagues += 1
-                        print(f"Mise à jour league: {db_league.name}")
-                    else:
-                        db_league = League(
-                            api_id=league_data.league.id,
-                            name=league_data.league.name,
-                            country=league_data.country.name,
-                            logo=league_data.league.logo,
-                            flag=league_data.country.flag,
-                            type=league_data.league.type,
-                            created_at=current_time,
-                            updated_at=current_time
-                        )
-                        self.db.add(db_league)
-                        created_leagues += 1
-                        print(f"Création league: {db_league.name}")
-
-                    await self.db.flush()
-
-                    for season_data in league_data.seasons:
-                        try:
-                            stmt = select(Season).where(
-                                Season.league_id == db_league.id,
-                                Season.year == season_data.year
-                            )
-                            result = await self.db.execute(stmt)
-                            db_season = result.scalar_one_or_none()
-
-                            if db_season:
-                                db_season.current = season_data.current
-                                db_season.has_predictions = season_data.coverage.predictions
-                                db_season.has_odds = season_data.coverage.odds
-                                db_season.updated_at = current_time
-                                print(f"Mise à jour saison {season_data.year} pour {db_league.name}")
-                            else:
-                                db_season = Season(
-                                    league_id=db_league.id,
-                                    year=season_data.year,
-                                    start_date=datetime.strptime(season_data.start, "%Y-%m-%d"),
-                                    end_date=datetime.strptime(season_data.end, "%Y-%m-%d"),
-                                    current=season_data.current,
-                                    has_predictions=season_data.coverage.predictions,
-                                    has_odds=season_data.coverage.odds,
-                                    created_at=current_time,
-                                    updated_at=current_time
-                                )
-                                self.db.add(db_season)
-                                print(f"Création saison {season_data.year} pour {db_league.name}")
-
-                            synced_seasons += 1
-
-                        except Exception as e:
-                            error_msg = f"Erreur traitement saison {season_data.year} pour league {db_league.name}: {str(e)}"
-                            print(error_msg)
-                            errors.append(error_msg)
-                            continue
-
-                    synced_leagues += 1
-                    await self.db.commit()
-
-                except Exception as e:
-                    await self.db.rollback()
-                    error_msg = f"Erreur traitement league {league_data.league.name}: {str(e)}"
-                    print(error_msg)
-                    errors.append(error_msg)
+                values = {
+                    "api_id": league_data.league.id,
+                    "name": league_data.league.name,
+                    "country": league_data.country.name,
+                    "logo": league_data.league.logo,
+                    "flag": league_data.country.flag,
+                    "type": league_data.league.type
+                }
+                db_league = db_leagues.get(league_data.league.id)
+                if db_league is None:
+                    created_leagues += 1
+                elif any(getattr(db_league, key) != value for key, value in values.items()):
+                    updated_leagues += 1
+                else:
                     continue
+                league_rows.append({**values, "created_at": current_time, "updated_at": current_time})
 
+            await upsert_rows(
+                self.db, League, league_rows,
+                index_elements=["api_id"],
+                update_columns=LEAGUE_UPDATE_COLUMNS
+            )
+
+            league_ids = {api_id: row.id for api_id, row in db_leagues.items()}
+            new_api_ids = [row["api_id"] for row in league_rows if row["api_id"] not in league_ids]
+            for chunk in chunked(new_api_ids):
+                result = await self.db.execute(
+                    select(League.api_id, League.id).where(League.api_id.in_(chunk))
+                )
+                league_ids.update({row.api_id: row.id for row in result.all()})
+
+            # Diff des saisons
+            new_seasons = []
+            changed_seasons = []
+            for league_data in api_response.response:
+                league_id = league_ids[league_data.league.id]
+                for season_data in league_data.seasons:
+                    try:
+                        db_season = db_seasons.get((league_id, season_data.year))
+                        values = {
+                            "current": season_data.current,
+                            "has_predictions": season_data.coverage.predictions,
+                            "has_odds": season_data.coverage.odds
+                        }
+                        if db_season is None:
+                            new_seasons.append({
+                                "league_id": league_id,
+                                "year": season_data.year,
+                                "start_date": datetime.strptime(season_data.start, "%Y-%m-%d"),
+                                "end_date": datetime.strptime(season_data.end, "%Y-%m-%d"),
+                                **values,
+                                "created_at": current_time,
+                                "updated_at": current_time
+                            })
+                        elif any(getattr(db_season, key) != value for key, value in values.items()):
+                            changed_seasons.append({"id": db_season.id, **values, "updated_at": current_time})
+
+                        synced_seasons += 1
+
+                    except Exception as e:
+                        error_msg = f"Erreur traitement saison {season_data.year} pour league {league_data.league.name}: {str(e)}"
+                        print(error_msg)
+                        errors.append(error_msg)
+                        continue
+
+                synced_leagues += 1
+
+            for chunk in chunked(new_seasons):
+                await self.db.execute(insert(Season), list(chunk))
+            for chunk in chunked(changed_seasons):
+                await self.db.execute(update(Season), list(chunk))
+
+            if league_rows or new_seasons or changed_seasons:
+                await self.db.commit()
+                invalidate_dashboard_stats()
+
+            print(f"Leagues: {created_leagues} créées, {updated_leagues} mises à jour")
+            print(f"Saisons: {len(new_seasons)} créées, {len(changed_seasons)} mises à jour")
             print("\n=== Fin synchronisation des leagues ===")
 
             return LeagueSyncResponse(
                 total_leagues=total_leagues,
                 synced_leagues=synced_leagues,
-                total_seasons=total_leagues * len(api_response.response[0].seasons),
+                total_seasons=total_seasons,
                 synced_seasons=synced_seasons,
                 created_leagues=created_leagues,
                 updated_leagues=updated_leagues,
@@ -170,5 +189,6 @@ class LeagueSyncService:
             )
 
         except Exception as e:
+            await self.db.rollback()
             print(f"\nErreur lors de la synchronisation: {str(e)}")
-            raise Exception(f"Erreur lors de la synchronisation: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Erreur lors de la synchronisation: {str(e)}")
@@ -0,0 +1,139 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.api.football.fixture_status import LIVE_STATUSES
+from app.api.football.match_client import MAX_IDS_PER_REQUEST
+from app.api.football.match_schemas import ApiResponse, MatchResponse
+from app.db.upsert import chunked
+from app.models.league import League
+from app.models.match import Match
+from app.services.matches_stats_services import invalidate_dashboard_stats
+from app.services.sync.match_service import MatchSyncService
+from prediction_outcome_service import PredictionEvaluationService
+
+
+class LiveMatchPoller:
+    """
+    Suivi des matchs en direct : une requête fixtures?live=all par tick.
+    Les matchs sortis de la liste live depuis le tick précédent (terminés, interrompus)
+    sont relus par ids, les changements écrits en une transaction, puis les
+    prédictions des matchs passés FT sont évaluées.
+    """
+
+    def __init__(self, session_factory=None, interval: float = None):
+        """
+        :param session_factory: Fabrique de sessions (AsyncSessionLocal par défaut)
+        :param interval: Secondes entre deux ticks (LIVE_POLL_INTERVAL par défaut)
+        """
+        self.session_factory = session_factory
+        self.interval = interval or settings.LIVE_POLL_INTERVAL
+        self._live_ids: Optional[Set[int]] = None  # Matchs live au tick précédent (api_fixture_id)
+        self._task: Optional[asyncio.Task] = None
+
+    def _get_session_factory(self):
+        if self.session_factory is None:
+            from app.db.session import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+        return self.session_factory
+
+    async def _fetch_changes(self, service: MatchSyncService, leagues_map: Dict[int, int]) -> List[MatchResponse]:
+        """Matchs live des leagues suivies + matchs sortis du live depuis le tick précédent"""
+        live = [
+            fixture for fixture in ApiResponse(**await service.client.get_live_matches()).response
+            if fixture.league.id in leagues_map
+        ]
+        live_ids = {fixture.fixture.id for fixture in live}
+
+        fixtures = list(live)
+        dropped = sorted(self._live_ids - live_ids)
+        for chunk in chunked(dropped, MAX_IDS_PER_REQUEST):
+            api_data = await service.client.get_matches_by_ids(list(chunk), cache_ttl=0)
+            fixtures.extend(ApiResponse(**api_data).response)
+
+        self._live_ids = live_ids
+        return fixtures
+
+    async def poll_once(self) -> Dict[str, Any]:
+        """Un tick : lit le live, applique les changements et évalue les matchs terminés"""
+        current_time = datetime.utcnow()
+        stats = {"live_matches": 0, "updated_matches": 0, "finished_matches": 0, "evaluated_predictions": 0}
+
+        async with self._get_session_factory()() as db:
+            service = MatchSyncService(db)
+            result = await db.execute(select(League.api_id, League.id).where(League.is_active.is_(True)))
+            leagues_map = {league.api_id: league.id for league in result.fetchall()}
+            if not leagues_map:
+                return stats
+
+            if self._live_ids is None:
+                # Au démarrage : les matchs encore live en base ont pu se terminer pendant l'arrêt
+                result = await db.execute(select(Match.api_fixture_id).where(Match.status.in_(LIVE_STATUSES)))
+                self._live_ids = set(result.scalars())
+
+            previous_live = self._live_ids
+            fixtures = await self._fetch_changes(service, leagues_map)
+            stats["live_matches"] = len(self._live_ids)
+            if not fixtures:
+                return stats
+
+            try:
+                created, updated, played_ids = await service.apply_fixtures(fixtures, leagues_map, current_time)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                self._live_ids = previous_live
+                raise
+            if created or updated:
+                invalidate_dashboard_stats()
+            stats["updated_matches"] = created + updated
+            stats["finished_matches"] = len(played_ids)
+
+            if played_ids:
+                try:
+                    evaluation = await PredictionEvaluationService(db).evaluate_all_predictions(match_ids=played_ids)
+                    stats["evaluated_predictions"] = evaluation["successful_evaluations"]
+                except Exception as e:
+                    # Les résultats sont enregistrés : l'évaluation incrémentale les reprendra
+                    print(f"Erreur évaluation des matchs terminés: {str(e)}")
+
+        print(
+            f"Live : {stats['live_matches']} en cours, {stats['updated_matches']} mis à jour, "
+            f"{stats['finished_matches']} terminés, {stats['evaluated_predictions']} prédictions évaluées"
+        )
+        return stats
+
+    async def _poll_periodically(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                print(f"Erreur suivi live: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        """Lance le suivi périodique (démarrage de l'application)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll_periodically())
+
+    async def stop(self) -> None:
+        """Arrête le suivi périodique (arrêt de l'application)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_poller: Optional[LiveMatchPoller] = None
+
+def get_live_poller() -> LiveMatchPoller:
+    global _poller
+    if _poller is None:
+        _poller = LiveMatchPoller()
+    return _poller
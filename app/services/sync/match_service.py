@@ -1,10 +1,28 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from app.api.football.match_client import MatchAPIClient
-from app.api.football.match_schemas import ApiResponse, MatchSyncResponse
+from sqlalchemy import select, update, insert
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.api.football.base_client import DEFAULT_CACHE_TTL
+from app.api.football.match_client import MatchAPIClient, MAX_IDS_PER_REQUEST
+from app.api.football.fixture_status import LIVE_STATUSES, PLAYED_STATUSES
+from app.api.football.match_schemas import ApiResponse, MatchResponse, MatchSyncResponse
+from app.db.upsert import upsert_rows, chunked
 from app.models.match import Match, MatchResult
 from app.models.league import League, Season
+from app.services.apiRate_limiter_service import ApiQuotaExceeded
+from app.services.matches_stats_services import invalidate_dashboard_stats
+from app.services.sync_stats_service import SyncStatsDelta
+from app.services.job_service import report_progress
+
+# Colonnes réécrites quand un match existe déjà
+MATCH_UPDATE_COLUMNS = ["date", "status", "home_team", "away_team", "round", "season", "updated_at"]
+
+# Statuts pouvant encore évoluer (à venir, en cours, reportés)
+UNFINISHED_STATUSES = ["TBD", "NS", *LIVE_STATUSES, "PST"]
+
+# Erreur unique enregistrée quand le quota API quotidien interrompt la sync
+QUOTA_EXHAUSTED_ERROR = "Quota API quotidien épuisé : saisons restantes reportées au prochain passage"
 
 class MatchSyncService:
     def __init__(self, db: AsyncSession):
@@ -14,7 +32,268 @@ class MatchSyncService:
     def parse_date(self, date_str: str) -> datetime:
         return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
 
-    async def sync_matches(self) -> MatchSyncResponse:
+    @staticmethod
+    def _as_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+        """Normalise une date pour comparer valeurs API et valeurs lues en base"""
+        if value is None or value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    async def _load_existing_matches(self, fixture_ids: List[int]) -> Dict[int, tuple]:
+        """Charge en une requête (par lot) les matchs déjà connus : api_fixture_id -> ligne"""
+        existing = {}
+        for chunk in chunked(fixture_ids):
+            result = await self.db.execute(
+                select(
+                    Match.api_fixture_id, Match.id, Match.date, Match.status,
+                    Match.home_team, Match.away_team, Match.round, Match.season,
+                    Match.league_id, Match.predictions_synced
+                ).where(Match.api_fixture_id.in_(chunk))
+            )
+            for row in result.all():
+                existing[row.api_fixture_id] = row
+        return existing
+
+    async def _load_existing_results(self, match_ids: List[int]) -> Dict[int, tuple]:
+        """Charge les résultats existants : match_id -> ligne"""
+        existing = {}
+        for chunk in chunked(match_ids):
+            result = await self.db.execute(
+                select(MatchResult.match_id, MatchResult.id, MatchResult.home_score, MatchResult.away_score)
+                .where(MatchResult.match_id.in_(chunk))
+            )
+            for row in result.all():
+                existing[row.match_id] = row
+        return existing
+
+    async def _upsert_fixtures(
+        self,
+        fixtures: List[MatchResponse],
+        leagues_map: Dict[int, int],
+        current_time: datetime,
+        existing: Optional[Dict[int, tuple]] = None
+    ) -> Tuple[int, int]:
+        """
+        Écrit un lot de fixtures API en quelques requêtes groupées (sans commit).
+        Args:
+            fixtures: Fixtures issues de l'API
+            leagues_map: api_id de league -> id en base
+            current_time: Horodatage de la synchronisation (sync_stats)
+            existing: Optionnel, matchs déjà chargés (sinon lus en base)
+        Returns:
+            (matchs créés, matchs mis à jour)
+        """
+        fixtures = [f for f in fixtures if f.league.id in leagues_map]
+        if not fixtures:
+            return 0, 0
+
+        # updated_at = heure d'écriture du lot, pas du début de la sync (qui peut durer des heures) :
+        # l'évaluation incrémentale filtre sur updated_at >= watermark de son dernier passage
+        written_at = datetime.utcnow()
+
+        if existing is None:
+            existing = await self._load_existing_matches([f.fixture.id for f in fixtures])
+
+        match_rows = []
+        created_ids = []
+        updated_matches = 0
+        stats = SyncStatsDelta()
+        for match_data in fixtures:
+            fixture = match_data.fixture
+            teams = match_data.teams
+            match_date = self.parse_date(fixture.date)
+            row = {
+                "api_fixture_id": fixture.id,
+                "league_id": leagues_map[match_data.league.id],
+                "season": match_data.league.season,
+                "date": match_date,
+                "status": fixture.status.short,
+                "home_team": teams.home.name,
+                "home_team_id": teams.home.id,
+                "home_team_logo": teams.home.logo,
+                "away_team": teams.away.name,
+                "away_team_id": teams.away.id,
+                "away_team_logo": teams.away.logo,
+                "venue": fixture.venue.name if fixture.venue else None,
+                "round": match_data.league.round,
+                "created_at": written_at,
+                "updated_at": written_at
+            }
+
+            db_match = existing.get(fixture.id)
+            if db_match is None:
+                created_ids.append(fixture.id)
+                match_rows.append(row)
+                stats.add_match(row["league_id"], row["season"], row["status"])
+            elif (
+                self._as_utc_naive(db_match.date) != self._as_utc_naive(match_date)
+                or db_match.status != row["status"]
+                or db_match.home_team != row["home_team"]
+                or db_match.away_team != row["away_team"]
+                or db_match.round != row["round"]
+                or db_match.season != row["season"]
+            ):
+                updated_matches += 1
+                match_rows.append(row)
+                # league_id n'est pas réécrit en cas de conflit
+                stats.add_match(db_match.league_id, db_match.season, db_match.status, db_match.predictions_synced, sign=-1)
+                stats.add_match(db_match.league_id, row["season"], row["status"], db_match.predictions_synced)
+
+        await upsert_rows(
+            self.db, Match, match_rows,
+            index_elements=["api_fixture_id"],
+            update_columns=MATCH_UPDATE_COLUMNS
+        )
+        await stats.apply(self.db, matches_synced_at=current_time)
+
+        # Résultats des matchs terminés, score provisoire des matchs en cours
+        finished = [f for f in fixtures if f.fixture.status.short in (*PLAYED_STATUSES, *LIVE_STATUSES)]
+        if finished:
+            match_ids = {fixture_id: row.id for fixture_id, row in existing.items()}
+            if created_ids:
+                match_ids.update(
+                    {row.api_fixture_id: row.id for row in (await self._load_existing_matches(created_ids)).values()}
+                )
+            existing_results = await self._load_existing_results(
+                [match_ids[f.fixture.id] for f in finished if f.fixture.id in match_ids]
+            )
+
+            new_results = []
+            changed_results = []
+            for match_data in finished:
+                match_id = match_ids.get(match_data.fixture.id)
+                if match_id is None:
+                    continue
+                home_score = match_data.goals.home or 0
+                away_score = match_data.goals.away or 0
+                db_result = existing_results.get(match_id)
+                if db_result is None:
+                    new_results.append({
+                        "match_id": match_id,
+                        "home_score": home_score,
+                        "away_score": away_score,
+                        "updated_at": written_at
+                    })
+                elif (db_result.home_score, db_result.away_score) != (home_score, away_score):
+                    changed_results.append({
+                        "id": db_result.id,
+                        "home_score": home_score,
+                        "away_score": away_score,
+                        "updated_at": written_at
+                    })
+
+            for chunk in chunked(new_results):
+                await self.db.execute(insert(MatchResult), list(chunk))
+            for chunk in chunked(changed_results):
+                await self.db.execute(update(MatchResult), list(chunk))
+
+        return len(created_ids), updated_matches
+
+    async def apply_fixtures(
+        self,
+        fixtures: List[MatchResponse],
+        leagues_map: Dict[int, int],
+        current_time: datetime
+    ) -> Tuple[int, int, List[int]]:
+        """
+        Écrit des fixtures API (sans commit) et repère les matchs qui viennent d'être joués
+        (passage à un statut de PLAYED_STATUSES) : leurs prédictions sont à évaluer.
+        Returns:
+            (matchs créés, matchs mis à jour, ids en base des matchs nouvellement joués)
+        """
+        fixtures = [f for f in fixtures if f.league.id in leagues_map]
+        existing = await self._load_existing_matches([f.fixture.id for f in fixtures])
+        played_ids = [
+            f.fixture.id for f in fixtures
+            if f.fixture.status.short in PLAYED_STATUSES
+            and (f.fixture.id not in existing or existing[f.fixture.id].status not in PLAYED_STATUSES)
+        ]
+        created, updated = await self._upsert_fixtures(fixtures, leagues_map, current_time, existing)
+        played_match_ids = []
+        if played_ids:
+            played_match_ids = [row.id for row in (await self._load_existing_matches(played_ids)).values()]
+        return created, updated, played_match_ids
+
+    def _sync_window(
+        self,
+        matches_synced: bool,
+        current: bool,
+        last_match_sync: Optional[datetime],
+        end_date: Optional[datetime],
+        current_time: datetime
+    ) -> Optional[Tuple[Optional[date], Optional[date]]]:
+        """
+        Fenêtre de dates à récupérer pour une saison en mode incrémental :
+          - (None, None) : saison jamais synchronisée, récupération complète
+          - (from, to) : saison en cours ou terminée depuis la dernière sync
+          - None : saison terminée et déjà à jour, rien à récupérer
+        """
+        last_sync = self._as_utc_naive(last_match_sync)
+        if not matches_synced or last_sync is None:
+            return None, None
+        end = self._as_utc_naive(end_date)
+        if not current and end is not None and last_sync > end + timedelta(days=1):
+            return None
+        date_from = (last_sync - timedelta(days=1)).date()
+        date_to = (current_time + timedelta(days=settings.MATCH_SYNC_LOOKAHEAD_DAYS)).date()
+        return date_from, date_to
+
+    async def _refresh_overdue_matches(
+        self,
+        leagues_map: Dict[int, int],
+        fetched_ids: Set[int],
+        current_time: datetime,
+        errors: List[str]
+    ) -> Tuple[int, int, int]:
+        """
+        Recharge via fixtures?ids= les matchs non terminés dont la date est passée
+        et qu'aucune fenêtre n'a couverts (reports, saisons closes).
+        Returns:
+            (matchs reçus, matchs créés, matchs mis à jour)
+        """
+        result = await self.db.execute(
+            select(Match.api_fixture_id)
+            .where(
+                Match.status.in_(UNFINISHED_STATUSES),
+                Match.date < current_time,
+                Match.league_id.in_(list(leagues_map.values()))
+            )
+        )
+        overdue = [fixture_id for fixture_id in result.scalars() if fixture_id not in fetched_ids]
+
+        received = created_matches = updated_matches = 0
+        for chunk in chunked(overdue, MAX_IDS_PER_REQUEST):
+            try:
+                # Matchs en retard : leur statut a changé depuis la dernière lecture, pas de cache
+                api_data = await self.client.get_matches_by_ids(list(chunk), cache_ttl=0)
+                api_response = ApiResponse(**api_data)
+                created, updated = await self._upsert_fixtures(api_response.response, leagues_map, current_time)
+                await self.db.commit()
+                received += len(api_response.response)
+                created_matches += created
+                updated_matches += updated
+            except ApiQuotaExceeded:
+                await self.db.rollback()
+                print(QUOTA_EXHAUSTED_ERROR)
+                errors.append(QUOTA_EXHAUSTED_ERROR)
+                break
+            except Exception as e:
+                await self.db.rollback()
+                error_msg = f"Erreur pour les matchs en retard {list(chunk)}: {str(e)}"
+                print(error_msg)
+                errors.append(error_msg)
+        return received, created_matches, updated_matches
+
+    async def sync_matches(self, incremental: bool = True) -> MatchSyncResponse:
+        """
+        Synchronise les matchs des saisons avec prédictions.
+        En mode incrémental, une saison déjà synchronisée n'est relue que sur la fenêtre
+        [dernière sync - 1 jour, aujourd'hui + MATCH_SYNC_LOOKAHEAD_DAYS] si elle est en cours
+        (ou terminée depuis la dernière sync), puis les matchs non terminés restés en retard
+        sont rechargés par ids. Sinon chaque saison est relue entièrement.
+        Si le quota API quotidien est atteint, la sync s'arrête sur une seule erreur :
+        les saisons non relues le seront au prochain passage.
+        """
         try:
             current_time = datetime.utcnow()
 
@@ -23,12 +302,15 @@ class MatchSyncService:
                 .where(League.is_active.is_(True))
             )
             leagues_map = {league.api_id: league.id for league in result.fetchall()}
-            
+
             if not leagues_map:
                 raise Exception("Aucune league en base. Synchronisez d'abord les leagues.")
 
             league_season_query = (
-                select(League.api_id, League.id, Season.id, Season.year)
+                select(
+                    League.api_id, League.id, Season.id, Season.year, Season.current,
+                    Season.matches_synced, Season.last_match_sync, Season.end_date
+                )
                 .join(Season, League.id == Season.league_id)
                 .where(Season.has_predictions.is_(True))
             )
@@ -40,80 +322,32 @@ class MatchSyncService:
             created_matches = 0
             updated_matches = 0
             errors = []
+            fetched_ids: Set[int] = set()
+            quota_exhausted = False
 
-            for league_api_id, league_id, season_id, season_year in league_season_pairs:
+            for index, (league_api_id, league_id, season_id, season_year, current,
+                    matches_synced, last_match_sync, end_date) in enumerate(league_season_pairs):
+                report_progress(index, len(league_season_pairs), f"league={league_api_id}, season={season_year}")
+                date_from = date_to = None
+                if incremental:
+                    window = self._sync_window(matches_synced, current, last_match_sync, end_date, current_time)
+                    if window is None:
+                        continue
+                    date_from, date_to = window
                 try:
-                    api_data = await self.client.get_matches(league_id=league_api_id, season=season_year)
+                    # Une fenêtre incrémentale est relue pour ses changements : jamais servie par le cache
+                    api_data = await self.client.get_matches(
+                        league_id=league_api_id, season=season_year, date_from=date_from, date_to=date_to,
+                        cache_ttl=DEFAULT_CACHE_TTL if date_from is None else 0
+                    )
                     api_response = ApiResponse(**api_data)
+                    fetched_ids.update(f.fixture.id for f in api_response.response)
 
-                    for match_data in api_response.response:
-                        fixture = match_data.fixture
-                        teams = match_data.teams
-                        goals = match_data.goals
-                        score = match_data.score
-
-                        match_date = self.parse_date(fixture.date)
-                        
-                        stmt = select(Match).where(Match.api_fixture_id == fixture.id)
-                        result = await self.db.execute(stmt)
-                        db_match = result.scalar_one_or_none()
-
-                        if db_match:
-                            db_match.date = match_date
-                            db_match.status = fixture.status.short
-                            db_match.home_team = teams.home.name
-                            db_match.away_team = teams.away.name
-                            db_match.round = match_data.league.round
-                            db_match.updated_at = current_time
-                            updated_matches += 1
-
-                            if fixture.status.short == "FT":
-                                result_stmt = select(MatchResult).where(MatchResult.match_id == db_match.id)
-                                result_obj = await self.db.execute(result_stmt)
-                                match_result = result_obj.scalar_one_or_none()
-
-                                if match_result:
-                                    match_result.home_score = goals.home or 0
-                                    match_result.away_score = goals.away or 0
-                                else:
-                                    match_result = MatchResult(
-                                        match_id=db_match.id,
-                                        home_score=goals.home or 0,
-                                        away_score=goals.away or 0
-                                    )
-                                    self.db.add(match_result)
-                        else:
-                            new_match = Match(
-                                api_fixture_id=fixture.id,
-                                league_id=league_id,
-                                date=match_date,
-                                status=fixture.status.short,
-                                home_team=teams.home.name,
-                                home_team_id=teams.home.id,
-                                home_team_logo=teams.home.logo,
-                                away_team=teams.away.name,
-                                away_team_id=teams.away.id,
-                                away_team_logo=teams.away.logo,
-                                venue=fixture.venue.name if fixture.venue else None,
-                                round=match_data.league.round,
-                                created_at=current_time,
-                                updated_at=current_time
-                            )
-                            self.db.add(new_match)
-                            created_matches += 1
-
-                            if fixture.status.short == "FT":
-                                await self.db.flush()
-                                match_result = MatchResult(
-                                    match_id=new_match.id,
-                                    home_score=goals.home or 0,
-                                    away_score=goals.away or 0
-                                )
-                                self.db.add(match_result)
-
-                        await self.db.commit()
-                        synced_matches += 1
-                        total_matches += 1
+                    created, updated = await self._upsert_fixtures(
+                        api_response.response,
+                        {league_api_id: league_id},
+                        current_time
+                    )
 
                     await self.db.execute(
                         update(Season)
@@ -121,13 +355,37 @@ class MatchSyncService:
                         .values(matches_synced=True, last_match_sync=current_time)
                     )
                     await self.db.commit()
+                    invalidate_dashboard_stats()
+
+                    created_matches += created
+                    updated_matches += updated
+                    synced_matches += len(api_response.response)
+                    total_matches += len(api_response.response)
 
+                except ApiQuotaExceeded:
+                    # Les saisons restantes (et les matchs en retard) attendent le prochain passage
+                    await self.db.rollback()
+                    print(QUOTA_EXHAUSTED_ERROR)
+                    errors.append(QUOTA_EXHAUSTED_ERROR)
+                    quota_exhausted = True
+                    break
                 except Exception as e:
                     await self.db.rollback()
                     error_msg = f"Erreur pour league={league_api_id}, season={season_year}: {str(e)}"
                     print(error_msg)
                     errors.append(error_msg)
 
+            if incremental and not quota_exhausted:
+                received, created, updated = await self._refresh_overdue_matches(
+                    leagues_map, fetched_ids, current_time, errors
+                )
+                if received:
+                    invalidate_dashboard_stats()
+                synced_matches += received
+                total_matches += received
+                created_matches += created
+                updated_matches += updated
+
             return MatchSyncResponse(
                 total_matches=total_matches,
                 synced_matches=synced_matches,
@@ -138,4 +396,4 @@ class MatchSyncService:
 
         except Exception as e:
             await self.db.rollback()
-            raise Exception(f"Erreur globale: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Erreur globale: {str(e)}")
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.upsert import upsert_rows
+from app.models.league import League
+from app.models.match import Match
+from app.models.sync_state import SyncState
+
+# Classes de priorité, dans l'ordre de traitement
+IMMINENT = "imminent"  # Coup d'envoi dans les PREDICTION_IMMINENT_HOURS prochaines heures
+UPCOMING = "upcoming"  # Coup d'envoi dans les PREDICTION_UPCOMING_DAYS prochains jours
+RECENT = "recent"  # Joués depuis moins de PREDICTION_RECENT_DAYS jours (évaluation)
+HISTORY = "history"  # Plus anciens, du plus récent au plus ancien
+PRIORITY_CLASSES = [IMMINENT, UPCOMING, RECENT, HISTORY]
+
+# Préfixe des lignes sync_state du budget : watermark = jour, position = appels consommés
+BUDGET_STATE_PREFIX = "prediction_budget_"
+
+
+class PredictionPrefetchPlanner:
+    """
+    Ordonne les matchs sans prédiction par proximité du coup d'envoi et importance de la league,
+    dans la limite d'un budget d'appels quotidien par classe (PREDICTION_DAILY_BUDGETS).
+    Les matchs au-delà de PREDICTION_UPCOMING_DAYS ne sont pas planifiés : leurs prédictions
+    évoluent jusqu'au match. La consommation est persistée dans sync_state, un passage
+    interrompu reprend donc avec le budget restant du jour.
+    """
+
+    def __init__(self, db: AsyncSession, now: Optional[datetime] = None):
+        self.db = db
+        self.now = now or datetime.utcnow()
+        self.day = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.used: Dict[str, int] = {priority: 0 for priority in PRIORITY_CLASSES}
+
+    def _window(self, priority: str) -> Tuple[list, list]:
+        """Filtres de date et tri (hors importance) d'une classe"""
+        imminent_end = self.now + timedelta(hours=settings.PREDICTION_IMMINENT_HOURS)
+        upcoming_end = self.now + timedelta(days=settings.PREDICTION_UPCOMING_DAYS)
+        recent_start = self.now - timedelta(days=settings.PREDICTION_RECENT_DAYS)
+        if priority == IMMINENT:
+            return [Match.date >= self.now, Match.date < imminent_end], [Match.date.asc()]
+        if priority == UPCOMING:
+            return [Match.date >= imminent_end, Match.date < upcoming_end], [Match.date.asc()]
+        if priority == RECENT:
+            return [Match.date >= recent_start, Match.date < self.now], [Match.date.desc()]
+        return [Match.date < recent_start], [Match.date.desc()]
+
+    def _importance(self):
+        """Rang de la league dans PREDICTION_PRIORITY_LEAGUES (ids API), les autres ensuite"""
+        leagues = settings.PREDICTION_PRIORITY_LEAGUES
+        if not leagues:
+            return None
+        return case(
+            {api_id: rank for rank, api_id in enumerate(leagues)},
+            value=League.api_id,
+            else_=len(leagues)
+        )
+
+    def budget(self, priority: str) -> int:
+        return max(0, settings.PREDICTION_DAILY_BUDGETS.get(priority, 0))
+
+    def remaining(self, priority: str) -> int:
+        return max(0, self.budget(priority) - self.used[priority])
+
+    def consume(self, priority: str) -> None:
+        self.used[priority] += 1
+
+    async def load(self) -> None:
+        """Charge la consommation du jour (remise à zéro au changement de jour)"""
+        result = await self.db.execute(
+            select(SyncState.name, SyncState.watermark, SyncState.position)
+            .where(SyncState.name.in_([BUDGET_STATE_PREFIX + priority for priority in PRIORITY_CLASSES]))
+        )
+        for name, day, used in result.all():
+            if day is not None and day.replace(tzinfo=None) == self.day:
+                self.used[name[len(BUDGET_STATE_PREFIX):]] = used or 0
+
+    async def save(self) -> None:
+        """Enregistre la consommation du jour (sans commit)"""
+        now = datetime.utcnow()
+        await upsert_rows(
+            self.db, SyncState,
+            [
+                {
+                    "name": BUDGET_STATE_PREFIX + priority, "watermark": self.day, "position": used,
+                    "created_at": now, "updated_at": now
+                }
+                for priority, used in self.used.items()
+            ],
+            index_elements=["name"],
+            update_columns=["watermark", "position", "updated_at"]
+        )
+
+    async def pending(self, priority: str, limit: int) -> List[Tuple[int, int, datetime]]:
+        """Matchs sans prédiction de la classe, par ordre de priorité (au plus limit)"""
+        if limit <= 0:
+            return []
+        filters, order_by = self._window(priority)
+        importance = self._importance()
+        if importance is not None:
+            order_by = [importance, *order_by]
+        result = await self.db.execute(
+            select(Match.id, Match.api_fixture_id, Match.date)
+            .join(League, League.id == Match.league_id)
+            .where(Match.predictions_synced.is_(False), *filters)
+            .order_by(*order_by, Match.id)
+            .limit(limit)
+        )
+        return result.all()
@@ -1,128 +1,410 @@
+import asyncio
+from collections import OrderedDict
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Dict, Any, List
+from sqlalchemy import select, update, func
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
 
+from app.core.config import settings
 from app.models.match import Match
 from app.models.prediction import (
     Prediction, PredictionTeam, PredictionComparison
 )
 from app.api.football.prediction_client import PredictionAPIClient
+from app.services.matches_stats_services import invalidate_dashboard_stats
+from app.services.sync_stats_service import SyncStatsDelta
+from app.services.sync_state_service import get_position, set_position, PREDICTION_SYNC
+from app.services.job_service import report_progress
+from app.services.apiRate_limiter_service import ApiQuotaExceeded
+from app.services.sync.prediction_planner import PredictionPrefetchPlanner, PRIORITY_CLASSES
+
+def parse_advice(advice: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Sépare l'advice API en catégorie et sélection :
+    "Combo Winner : Arsenal and -3.5 goals" -> ("Combo Winner", "Arsenal and -3.5 goals").
+    Sans ':' (ex : "No predictions available"), tout le texte est la catégorie.
+    """
+    if not advice or not advice.strip():
+        return None, None
+    category, separator, selection = advice.partition(':')
+    if not separator:
+        return advice.strip(), None
+    return category.strip() or None, selection.strip() or None
+
+# Erreur unique remontée quand le quota quotidien est épuisé en cours de parcours
+QUOTA_EXHAUSTED_ERROR = "Quota API quotidien épuisé : matchs restants reportés au prochain passage"
+
+class _ResumeTracker:
+    """
+    Point de reprise du parcours : plus grand id tel que tous les matchs
+    d'id inférieur ou égal ont été traités (les workers terminent dans le désordre).
+    """
+    def __init__(self, position: int):
+        self.position = position
+        self._pending: "OrderedDict[int, bool]" = OrderedDict()
+
+    def start(self, match_id: int) -> None:
+        self._pending[match_id] = False
+
+    def done(self, match_id: int) -> None:
+        self._pending[match_id] = True
+        while self._pending and next(iter(self._pending.values())):
+            self.position, _ = self._pending.popitem(last=False)
 
 class PredictionSyncService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.client = PredictionAPIClient()
+        # La session est partagée entre la lecture paginée et le writer
+        self._db_lock = asyncio.Lock()
+        self._tracker: Optional[_ResumeTracker] = None
+        self._planner: Optional[PredictionPrefetchPlanner] = None
+
+    def _build_prediction(self, match_id: int, prediction_data: Dict[str, Any]) -> Prediction:
+        """Construit la prédiction et ses relations à partir de la réponse API"""
+        predictions = prediction_data['predictions']
+        teams = prediction_data['teams']
+        comparison = prediction_data['comparison']
+
+        advice_category, advice_selection = parse_advice(predictions.get('advice'))
+        new_prediction = Prediction(
+            match_id=match_id,
+            winner_id=predictions['winner'].get('id'),
+            winner_name=predictions['winner'].get('name'),
+            winner_comment=predictions['winner'].get('comment'),
+            win_or_draw=predictions.get('win_or_draw', False),
+            under_over=predictions.get('under_over'),
+            goals_home=predictions['goals'].get('home'),
+            goals_away=predictions['goals'].get('away'),
+            advice=predictions.get('advice'),
+            advice_category=advice_category,
+            advice_selection=advice_selection,
+            percent_home=float(predictions['percent']['home'].rstrip('%')),
+            percent_draw=float(predictions['percent']['draw'].rstrip('%')),
+            percent_away=float(predictions['percent']['away'].rstrip('%'))
+        )
+
+        # Ajouter les équipes
+        for side, team_data in teams.items():
+            new_prediction.teams_data.append(PredictionTeam(
+                is_home=(side == 'home'),
+                team_id=team_data['id'],
+                team_name=team_data['name'],
+                team_logo=team_data['logo'],
+                last_5_played=team_data['last_5']['played'],
+                last_5_form=float(team_data['last_5']['form'].rstrip('%')),
+                last_5_att=float(team_data['last_5']['att'].rstrip('%')),
+                last_5_def=float(team_data['last_5']['def'].rstrip('%')),
+                goals_for_total=team_data['last_5']['goals']['for']['total'],
+                goals_for_avg=float(team_data['last_5']['goals']['for']['average']),
+                goals_against_total=team_data['last_5']['goals']['against']['total'],
+                goals_against_avg=float(team_data['last_5']['goals']['against']['average']),
+                league_form=team_data['league']['form'],
+                clean_sheet_total=team_data['league']['clean_sheet']['total'],
+                failed_to_score_total=team_data['league']['failed_to_score']['total']
+            ))
+
+        # Ajouter la comparaison
+        new_prediction.comparison = PredictionComparison(
+            form_home=float(comparison['form']['home'].rstrip('%')),
+            form_away=float(comparison['form']['away'].rstrip('%')),
+            att_home=float(comparison['att']['home'].rstrip('%')),
+            att_away=float(comparison['att']['away'].rstrip('%')),
+            def_home=float(comparison['def']['home'].rstrip('%')),
+            def_away=float(comparison['def']['away'].rstrip('%')),
+            poisson_distribution_home=float(comparison['poisson_distribution']['home'].rstrip('%')),
+            poisson_distribution_away=float(comparison['poisson_distribution']['away'].rstrip('%')),
+            h2h_home=float(comparison['h2h']['home'].rstrip('%')),
+            h2h_away=float(comparison['h2h']['away'].rstrip('%')),
+            goals_home=float(comparison['goals']['home'].rstrip('%')),
+            goals_away=float(comparison['goals']['away'].rstrip('%')),
+            total_home=float(comparison['total']['home'].rstrip('%')),
+            total_away=float(comparison['total']['away'].rstrip('%'))
+        )
+
+        return new_prediction
 
     async def _save_prediction(self, match_id: int, prediction_data: Dict[str, Any]) -> bool:
         """Sauvegarde les données de prédiction en base"""
         try:
-            predictions = prediction_data['predictions']
-            teams = prediction_data['teams']
-            comparison = prediction_data['comparison']
-
-            # Créer la nouvelle prédiction
-            new_prediction = Prediction(
-                match_id=match_id,
-                winner_id=predictions['winner'].get('id'),
-                winner_name=predictions['winner'].get('name'),
-                winner_comment=predictions['winner'].get('comment'),
-                win_or_draw=predictions.get('win_or_draw', False),
-                under_over=predictions.get('under_over'),
-                goals_home=predictions['goals'].get('home'),
-                goals_away=predictions['goals'].get('away'),
-                advice=predictions.get('advice'),
-                percent_home=float(predictions['percent']['home'].rstrip('%')),
-                percent_draw=float(predictions['percent']['draw'].rstrip('%')),
-                percent_away=float(predictions['percent']['away'].rstrip('%'))
-            )
-            self.db.add(new_prediction)
+            self.db.add(self._build_prediction(match_id, prediction_data))
             await self.db.flush()
-
-            # Ajouter les équipes
-            for side, team_data in teams.items():
-                team = PredictionTeam(
-                    prediction_id=new_prediction.id,
-                    is_home=(side == 'home'),
-                    team_id=team_data['id'],
-                    team_name=team_data['name'],
-                    team_logo=team_data['logo'],
-                    last_5_played=team_data['last_5']['played'],
-                    last_5_form=float(team_data['last_5']['form'].rstrip('%')),
-                    last_5_att=float(team_data['last_5']['att'].rstrip('%')),
-                    last_5_def=float(team_data['last_5']['def'].rstrip('%')),
-                    goals_for_total=team_data['last_5']['goals']['for']['total'],
-                    goals_for_avg=float(team_data['last_5']['goals']['for']['average']),
-                    goals_against_total=team_data['last_5']['goals']['against']['total'],
-                    goals_against_avg=float(team_data['last_5']['goals']['against']['average']),
-                    league_form=team_data['league']['form'],
-                    clean_sheet_total=team_data['league']['clean_sheet']['total'],
-                    failed_to_score_total=team_data['league']['failed_to_score']['total']
-                )
-                self.db.add(team)
-
-            # Ajouter la comparaison
-            comp = PredictionComparison(
-                prediction_id=new_prediction.id,
-                form_home=float(comparison['form']['home'].rstrip('%')),
-                form_away=float(comparison['form']['away'].rstrip('%')),
-                att_home=float(comparison['att']['home'].rstrip('%')),
-                att_away=float(comparison['att']['away'].rstrip('%')),
-                def_home=float(comparison['def']['home'].rstrip('%')),
-                def_away=float(comparison['def']['away'].rstrip('%')),
-                poisson_distribution_home=float(comparison['poisson_distribution']['home'].rstrip('%')),
-                poisson_distribution_away=float(comparison['poisson_distribution']['away'].rstrip('%')),
-                h2h_home=float(comparison['h2h']['home'].rstrip('%')),
-                h2h_away=float(comparison['h2h']['away'].rstrip('%')),
-                goals_home=float(comparison['goals']['home'].rstrip('%')),
-                goals_away=float(comparison['goals']['away'].rstrip('%')),
-                total_home=float(comparison['total']['home'].rstrip('%')),
-                total_away=float(comparison['total']['away'].rstrip('%'))
-            )
-            self.db.add(comp)
-
             return True
 
         except Exception as e:
             print(f"Erreur sauvegarde prédiction: {str(e)}")
             raise
 
-    async def sync_predictions(self) -> Dict[str, Any]:
-        """Synchronise les prédictions pour tous les matchs non synchronisés"""
+    async def _record_synced_predictions(self, match_ids: List[int], sync_time: datetime) -> None:
+        """Met à jour sync_stats pour les matchs qui passent en predictions_synced (avant l'UPDATE)"""
+        result = await self.db.execute(
+            select(Match.league_id, Match.season, func.count(Match.id))
+            .where(Match.id.in_(match_ids), Match.predictions_synced.is_(False))
+            .group_by(Match.league_id, Match.season)
+        )
+        stats = SyncStatsDelta()
+        for league_id, season, count in result.all():
+            stats.add_synced_predictions(league_id, season, count)
+        await stats.apply(self.db, predictions_synced_at=sync_time)
+
+    async def _write_batch(self, batch: List[Tuple[int, int, Dict[str, Any]]], errors: List[str]) -> int:
+        """Persiste un lot de prédictions en une seule transaction"""
+        sync_time = datetime.utcnow()
+        synced_ids = []
+        for match_id, fixture_id, prediction_data in batch:
+            try:
+                self.db.add(self._build_prediction(match_id, prediction_data))
+                synced_ids.append(match_id)
+            except Exception as e:
+                error_msg = f"Erreur match {fixture_id}: {str(e)}"
+                print(error_msg)
+                errors.append(error_msg)
+
+        if not synced_ids:
+            return 0
+
         try:
-            query = select(Match).where(Match.predictions_synced == False)
-            result = await self.db.execute(query)
-            matches_to_sync = result.scalars().all()
+            await self._record_synced_predictions(synced_ids, sync_time)
+            await self.db.execute(
+                update(Match)
+                .where(Match.id.in_(synced_ids))
+                .values(predictions_synced=True, last_predictions_sync=sync_time)
+            )
+            if self._tracker is not None:
+                await set_position(self.db, PREDICTION_SYNC, self._tracker.position)
+            if self._planner is not None:
+                await self._planner.save()
+            await self.db.commit()
+            invalidate_dashboard_stats()
+            print(f"Lot de {len(synced_ids)} prédictions sauvegardé")
+            return len(synced_ids)
+        except Exception as e:
+            await self.db.rollback()
+            if len(batch) == 1:
+                error_msg = f"Erreur match {batch[0][1]}: {str(e)}"
+                print(error_msg)
+                errors.append(error_msg)
+                return 0
+            # Rejouer le lot élément par élément pour isoler la ligne fautive
+            print(f"Échec du lot ({str(e)}), sauvegarde unitaire")
+            synced = 0
+            for item in batch:
+                synced += await self._write_batch([item], errors)
+            return synced
 
-            total_matches = len(matches_to_sync)
-            synced_matches = 0
-            errors: List[str] = []
+    async def _prediction_writer(self, save_queue: asyncio.Queue, errors: List[str]) -> int:
+        """Writer unique : vide la file des prédictions récupérées et les persiste par lots"""
+        batch_size = max(1, settings.PREDICTION_SYNC_BATCH_SIZE)
+        batch: List[Tuple[int, int, Dict[str, Any]]] = []
+        synced_matches = 0
+        done = False
+
+        while not done:
+            try:
+                item = await asyncio.wait_for(save_queue.get(), timeout=settings.PREDICTION_SYNC_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                item = False  # Pas de nouvelle donnée : on vide le lot en cours
+
+            if item is None:
+                done = True
+            elif item:
+                batch.append(item)
 
-            print(f"Début synchronisation pour {total_matches} matchs")
+            if batch and (done or item is False or len(batch) >= batch_size):
+                async with self._db_lock:
+                    synced_matches += await self._write_batch(batch, errors)
+                if self._tracker is not None:
+                    for match_id, _, _ in batch:
+                        self._tracker.done(match_id)
+                batch = []
 
-            for match in matches_to_sync:
+        return synced_matches
+
+    async def _pending_matches_page(self, after_id: int) -> List[Tuple[int, int, datetime]]:
+        """Page suivante des matchs sans prédiction, par id croissant (keyset sur l'index predictions_synced, id)"""
+        async with self._db_lock:
+            result = await self.db.execute(
+                select(Match.id, Match.api_fixture_id, Match.date)
+                .where(Match.predictions_synced.is_(False), Match.id > after_id)
+                .order_by(Match.id)
+                .limit(max(1, settings.PREDICTION_SYNC_PAGE_SIZE))
+            )
+            rows = result.all()
+            # Ne pas garder la transaction de lecture ouverte pendant les appels API
+            await self.db.commit()
+        return rows
+
+    async def _run_pipeline(
+        self,
+        produce: Callable[[Callable[[Tuple[int, int, datetime]], Awaitable[None]]], Awaitable[None]],
+        errors: List[str],
+        total: Optional[int] = None,
+        on_fetched: Optional[Callable[[Tuple[int, int, datetime]], None]] = None
+    ) -> Tuple[int, bool]:
+        """
+        Exécute la file producteur -> workers API -> writer.
+        Quota quotidien épuisé : le producteur s'arrête, la file est vidée sans appel
+        et les matchs non récupérés ne sont pas marqués traités (repris au passage suivant).
+        Args:
+            produce: Coroutine qui pousse les (match_id, fixture_id, kickoff) à synchroniser
+            errors: Liste complétée par les erreurs
+            total: Nombre de matchs attendus (avancement de la tâche en cours)
+            on_fetched: Appelé pour chaque appel API abouti (matchs vidés ou en échec exclus)
+        Returns:
+            (nombre de matchs synchronisés, quota épuisé)
+        """
+        workers_count = max(1, settings.PREDICTION_SYNC_WORKERS)
+        fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=workers_count * 2)
+        save_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.PREDICTION_SYNC_BATCH_SIZE * 2)
+        quota_exhausted = asyncio.Event()
+        fetched = 0
+
+        async def put(item: Tuple[int, int, datetime]) -> None:
+            if quota_exhausted.is_set():
+                raise ApiQuotaExceeded(QUOTA_EXHAUSTED_ERROR)
+            await fetch_queue.put(item)
+
+        async def producer() -> None:
+            try:
+                await produce(put)
+            except ApiQuotaExceeded:
+                pass
+            finally:
+                for _ in range(workers_count):
+                    await fetch_queue.put(None)
+
+        async def fetch_worker() -> None:
+            nonlocal fetched
+            while True:
+                item = await fetch_queue.get()
+                if item is None:
+                    return
+                if quota_exhausted.is_set():
+                    continue  # Vidage de la file : ni appel, ni match marqué traité
+                match_id, fixture_id, kickoff = item
+                fetched += 1
+                report_progress(fetched, total)
                 try:
-                    print(f"Synchro match {match.api_fixture_id}")
-                    response = await self.client.get_predictions(match.api_fixture_id)
-                    
+                    response = await self.client.get_predictions(fixture_id, kickoff=kickoff)
+                    if on_fetched is not None:
+                        on_fetched(item)
                     if response['response']:
-                        await self._save_prediction(match.id, response['response'][0])
-                        match.predictions_synced = True
-                        match.last_predictions_sync = datetime.utcnow()
-                        synced_matches += 1
-                        await self.db.commit()
-                        print(f"Match {match.api_fixture_id} sync ok")
-                    
+                        await save_queue.put((match_id, fixture_id, response['response'][0]))
+                        continue
+                except ApiQuotaExceeded:
+                    if not quota_exhausted.is_set():
+                        quota_exhausted.set()
+                        print(QUOTA_EXHAUSTED_ERROR)
+                        errors.append(QUOTA_EXHAUSTED_ERROR)
+                    continue
                 except Exception as e:
-                    await self.db.rollback()
-                    error_msg = f"Erreur match {match.api_fixture_id}: {str(e)}"
+                    error_msg = f"Erreur match {fixture_id}: {str(e)}"
                     print(error_msg)
                     errors.append(error_msg)
-                    continue
+                if self._tracker is not None:
+                    self._tracker.done(match_id)
+
+        writer = asyncio.create_task(self._prediction_writer(save_queue, errors))
+        try:
+            await asyncio.gather(producer(), *(fetch_worker() for _ in range(workers_count)))
+        finally:
+            await save_queue.put(None)
+            synced_matches = await writer
+        return synced_matches, quota_exhausted.is_set()
+
+    async def sync_predictions(self, resume: bool = True) -> Dict[str, Any]:
+        """
+        Synchronise les prédictions pour tous les matchs non synchronisés.
+        Les matchs sont lus par pages (keyset sur id) : la mémoire ne dépend pas du backlog.
+        Les appels API sont faits par PREDICTION_SYNC_WORKERS workers en parallèle
+        (cadencés par le limiteur partagé), un writer unique sauvegarde par lots.
+        Args:
+            resume: Reprendre après le dernier id traité d'un passage interrompu
+        """
+        try:
+            start_after = (await get_position(self.db, PREDICTION_SYNC) if resume else None) or 0
+            total_matches = await self.db.scalar(
+                select(func.count(Match.id))
+                .where(Match.predictions_synced.is_(False), Match.id > start_after)
+            )
+            self._tracker = _ResumeTracker(start_after)
+            errors: List[str] = []
+
+            resumed = f", reprise après l'id {start_after}" if start_after else ""
+            print(f"Début synchronisation pour {total_matches} matchs ({settings.PREDICTION_SYNC_WORKERS} workers{resumed})")
+
+            async def produce(put) -> None:
+                last_id = start_after
+                while True:
+                    page = await self._pending_matches_page(last_id)
+                    if not page:
+                        break
+                    for match_id, fixture_id, kickoff in page:
+                        self._tracker.start(match_id)
+                        await put((match_id, fixture_id, kickoff))
+                    last_id = page[-1][0]
+
+            synced_matches, quota_exhausted = await self._run_pipeline(produce, errors, total_matches)
+
+            # Parcours terminé : le prochain passage repart du début (matchs en échec compris) ;
+            # quota épuisé : il reprend avant le premier match non récupéré
+            await set_position(self.db, PREDICTION_SYNC, self._tracker.position if quota_exhausted else None)
+            await self.db.commit()
 
             return {
                 "total_matches": total_matches,
                 "synced_matches": synced_matches,
+                "resumed_after_id": start_after,
+                "quota_exhausted": quota_exhausted,
+                "errors": errors
+            }
+
+        except Exception as e:
+            await self.db.rollback()
+            print(f"Erreur globale: {str(e)}")
+            raise
+        finally:
+            self._tracker = None
+
+    async def prefetch_predictions(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Synchronise les prédictions par ordre de priorité (voir PredictionPrefetchPlanner) :
+        matchs imminents, à venir, récents puis historiques, chaque classe dans la limite
+        de son budget quotidien. Seuls les appels API aboutis sont décomptés du budget :
+        un passage interrompu ou relancé le même jour reprend avec le budget restant.
+        """
+        try:
+            planner = PredictionPrefetchPlanner(self.db, now)
+            await planner.load()
+            self._planner = planner
+            errors: List[str] = []
+            planned = {priority: 0 for priority in PRIORITY_CLASSES}
+            priorities: Dict[int, str] = {}
+
+            async def produce(put) -> None:
+                for priority in PRIORITY_CLASSES:
+                    async with self._db_lock:
+                        matches = await planner.pending(priority, planner.remaining(priority))
+                        await self.db.commit()
+                    print(f"Classe {priority} : {len(matches)} matchs planifiés")
+                    for item in matches:
+                        priorities[item[0]] = priority
+                        await put(tuple(item))
+                        planned[priority] += 1
+
+            def charge(item: Tuple[int, int, datetime]) -> None:
+                planner.consume(priorities[item[0]])
+
+            synced_matches, quota_exhausted = await self._run_pipeline(produce, errors, on_fetched=charge)
+            await planner.save()
+            await self.db.commit()
+
+            return {
+                "total_matches": sum(planned.values()),
+                "synced_matches": synced_matches,
+                "planned": planned,
+                "remaining_budgets": {priority: planner.remaining(priority) for priority in PRIORITY_CLASSES},
+                "quota_exhausted": quota_exhausted,
                 "errors": errors
             }
 
@@ -130,16 +412,21 @@ class PredictionSyncService:
             await self.db.rollback()
             print(f"Erreur globale: {str(e)}")
             raise
+        finally:
+            self._planner = None
 
     async def sync_single_match(self, match: Match) -> bool:
         """Synchronise les prédictions pour un match spécifique"""
         try:
-            response = await self.client.get_predictions(match.api_fixture_id)
+            response = await self.client.get_predictions(match.api_fixture_id, kickoff=match.date)
             if response['response']:
                 await self._save_prediction(match.id, response['response'][0])
+                sync_time = datetime.utcnow()
+                await self._record_synced_predictions([match.id], sync_time)
                 match.predictions_synced = True
-                match.last_predictions_sync = datetime.utcnow()
+                match.last_predictions_sync = sync_time
                 await self.db.commit()
+                invalidate_dashboard_stats()
                 return True
             return False
             
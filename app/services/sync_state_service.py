@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.upsert import upsert_rows
+from app.models.sync_state import SyncState
+
+# Noms des traitements incrémentaux
+PREDICTION_EVALUATION = "prediction_evaluation"
+PREDICTION_SYNC = "prediction_sync"
+
+
+async def get_watermark(db: AsyncSession, name: str) -> Optional[datetime]:
+    """Retourne le watermark du traitement, None s'il n'a jamais abouti"""
+    result = await db.execute(select(SyncState.watermark).where(SyncState.name == name))
+    return result.scalar_one_or_none()
+
+
+async def set_watermark(db: AsyncSession, name: str, watermark: Optional[datetime]) -> None:
+    """Enregistre le watermark (sans commit, à valider avec les écritures du traitement)"""
+    now = datetime.utcnow()
+    await upsert_rows(
+        db, SyncState,
+        [{"name": name, "watermark": watermark, "created_at": now, "updated_at": now}],
+        index_elements=["name"],
+        update_columns=["watermark", "updated_at"]
+    )
+
+
+async def get_position(db: AsyncSession, name: str) -> Optional[int]:
+    """Retourne le point de reprise (dernier id traité) du parcours, None s'il est terminé"""
+    result = await db.execute(select(SyncState.position).where(SyncState.name == name))
+    return result.scalar_one_or_none()
+
+
+async def set_position(db: AsyncSession, name: str, position: Optional[int]) -> None:
+    """Enregistre le point de reprise (sans commit) ; None une fois le parcours terminé"""
+    now = datetime.utcnow()
+    await upsert_rows(
+        db, SyncState,
+        [{"name": name, "position": position, "created_at": now, "updated_at": now}],
+        index_elements=["name"],
+        update_columns=["position", "updated_at"]
+    )
@@ -0,0 +1,115 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, delete, insert, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.upsert import upsert_rows, chunked
+from app.models.match import Match
+from app.models.sync_stats import SyncStats
+
+# Ligne globale (toutes ligues / toutes saisons)
+GLOBAL_SCOPE = (0, 0)
+
+COUNT_COLUMNS = ["total_matches", "finished_matches", "upcoming_matches", "synced_predictions"]
+
+Scope = Tuple[int, int]
+
+
+def _scope(league_id: Optional[int], season: Optional[int]) -> Scope:
+    return league_id or 0, season or 0
+
+
+class SyncStatsDelta:
+    """Variations des compteurs accumulées pendant une écriture, appliquées dans la même transaction"""
+
+    def __init__(self):
+        self.counts: Dict[Scope, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+
+    def add_match(self, league_id: Optional[int], season: Optional[int], status: Optional[str],
+                  predictions_synced: bool = False, sign: int = 1) -> None:
+        """Ajoute (sign=1) ou retire (sign=-1) un match des compteurs de sa portée"""
+        counts = self.counts[_scope(league_id, season)]
+        counts["total_matches"] += sign
+        counts["finished_matches"] += sign if status == 'FT' else 0
+        counts["upcoming_matches"] += sign if status == 'NS' else 0
+        counts["synced_predictions"] += sign if predictions_synced else 0
+
+    def add_synced_predictions(self, league_id: Optional[int], season: Optional[int], count: int) -> None:
+        self.counts[_scope(league_id, season)]["synced_predictions"] += count
+
+    async def apply(self, db: AsyncSession, matches_synced_at: Optional[datetime] = None,
+                    predictions_synced_at: Optional[datetime] = None) -> None:
+        """Écrit les deltas (portées concernées + ligne globale) sans commit"""
+        if not self.counts:
+            return
+
+        totals = dict.fromkeys(COUNT_COLUMNS, 0)
+        for counts in self.counts.values():
+            for column, value in counts.items():
+                totals[column] += value
+        scopes = {**self.counts, GLOBAL_SCOPE: totals}
+
+        timestamps = {}
+        if matches_synced_at is not None:
+            timestamps["matches_last_sync"] = matches_synced_at
+        if predictions_synced_at is not None:
+            timestamps["predictions_last_sync"] = predictions_synced_at
+
+        now = datetime.utcnow()
+        rows = [
+            {"league_id": league_id, "season": season, **counts, **timestamps, "created_at": now, "updated_at": now}
+            for (league_id, season), counts in scopes.items()
+        ]
+        await upsert_rows(
+            db, SyncStats, rows,
+            index_elements=["league_id", "season"],
+            update_columns=[*timestamps, "updated_at"],
+            increment_columns=COUNT_COLUMNS
+        )
+        self.counts.clear()
+
+
+async def get_sync_stats(db: AsyncSession, league_id: int = 0, season: int = 0) -> Optional[SyncStats]:
+    """Lecture des compteurs d'une portée (ligne globale par défaut)"""
+    result = await db.execute(
+        select(SyncStats).where(SyncStats.league_id == league_id, SyncStats.season == season)
+    )
+    return result.scalar_one_or_none()
+
+
+async def rebuild_sync_stats(db: AsyncSession) -> None:
+    """Recalcule tous les compteurs à partir de la table matches (sans commit)"""
+    season = func.coalesce(Match.season, 0)
+    result = await db.execute(
+        select(
+            Match.league_id,
+            season,
+            func.count(Match.id),
+            func.count(case((Match.status == 'FT', 1))),
+            func.count(case((Match.status == 'NS', 1))),
+            func.count(case((Match.predictions_synced.is_(True), 1))),
+            func.max(Match.updated_at),
+            func.max(Match.last_predictions_sync)
+        ).group_by(Match.league_id, season)
+    )
+
+    rows = []
+    totals = {column: 0 for column in COUNT_COLUMNS}
+    last_syncs = [None, None]
+    for league_id, season_year, *values in result.all():
+        counts = dict(zip(COUNT_COLUMNS, values[:4]))
+        rows.append({
+            "league_id": league_id, "season": season_year, **counts,
+            "matches_last_sync": values[4], "predictions_last_sync": values[5]
+        })
+        for column, value in counts.items():
+            totals[column] += value
+        last_syncs = [max(filter(None, (current, new)), default=None) for current, new in zip(last_syncs, values[4:])]
+    rows.append({
+        "league_id": 0, "season": 0, **totals,
+        "matches_last_sync": last_syncs[0], "predictions_last_sync": last_syncs[1]
+    })
+
+    await db.execute(delete(SyncStats))
+    for chunk in chunked(rows):
+        await db.execute(insert(SyncStats).execution_options(render_nulls=True), list(chunk))
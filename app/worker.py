@@ -0,0 +1,42 @@
+"""
+Worker des tâches de synchronisation : python -m app.worker
+Exécute les tâches enregistrées dans sync_jobs par l'application web
+(à lancer avec JOB_RUNNER_ENABLED=false côté web) et, si SCHEDULER_ENABLED,
+celles du planificateur.
+"""
+import asyncio
+import signal
+
+from app.core.config import settings
+from app.api.football.http_client import init_http_client, close_http_client
+from app.api.football.response_cache import close_response_cache
+from app.services.apiRate_limiter_service import get_rate_limiter
+from app.services.job_service import get_job_runner
+from app.services.scheduler_service import get_scheduler
+
+
+async def main() -> None:
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await init_http_client()
+    await get_rate_limiter().start()
+    await get_job_runner().start()
+    if settings.SCHEDULER_ENABLED:
+        await get_scheduler().start()
+    print("Worker démarré")
+    try:
+        await stop_event.wait()
+    finally:
+        await get_scheduler().stop()
+        await get_job_runner().stop()
+        await get_rate_limiter().stop()
+        await close_http_client()
+        close_response_cache()
+        print("Worker arrêté")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,255 @@
+"""
+Benchmark de bout en bout des synchronisations et de l'évaluation.
+
+Lance sync_leagues, sync_matches, sync_predictions et evaluate_all_predictions
+sur une base SQLite temporaire alimentée par le faux serveur API-Football,
+puis écrit les mesures en JSON pour comparer les commits entre eux.
+
+    python -m benchmarks.sync_benchmark --leagues 5 --output bench.json
+    python -m benchmarks.sync_benchmark --baseline bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Configuration minimale avant l'import de l'application
+for _key in ("API_KEY", "API_BASE_URL", "SECRET_KEY", "ADMIN_USERNAME", "ADMIN_PASSWORD"):
+    os.environ.setdefault(_key, "benchmark")
+os.environ.setdefault("CACHE_ENABLED", "false")
+os.environ.setdefault("API_RATE_LIMIT", "1000000")
+os.environ.setdefault("API_MAX_CALLS_PER_DAY", "100000000")
+os.environ.setdefault("API_RETRY_BACKOFF_BASE", "0.01")
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.api.football import http_client
+from app.api.football.fake_server import FakeFootballAPI, SyntheticDataset
+from app.db.session import apply_sqlite_pragmas
+from app.models import Base
+from app.services.sync.league_service import LeagueSyncService
+from app.services.sync.match_service import MatchSyncService
+from app.services.sync.predictions_service import PredictionSyncService
+from prediction_outcome_service import PredictionEvaluationService
+
+PHASES = ("leagues", "matches", "predictions", "evaluation")
+
+
+class TimingTransport(httpx.AsyncBaseTransport):
+    """Mesure la durée de chaque requête API (latence par élément des phases de sync)"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+        self.durations = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            return await self.inner.handle_async_request(request)
+        finally:
+            self.durations.append(time.perf_counter() - start)
+
+
+class SqlCounters:
+    """Compte requêtes SQL et commits, et mesure la durée de chaque requête"""
+
+    def __init__(self, sync_engine):
+        self.statements = 0
+        self.commits = 0
+        self.durations = []
+        event.listen(sync_engine, "before_cursor_execute", self._before)
+        event.listen(sync_engine, "after_cursor_execute", self._after)
+        event.listen(sync_engine, "commit", self._commit)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        conn.info["bench_start"] = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        self.durations.append(time.perf_counter() - conn.info.pop("bench_start", time.perf_counter()))
+
+    def _commit(self, conn):
+        self.commits += 1
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    return round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_phase(name, coro_factory, session_factory, sql, timing, fake, verbose):
+    sql_before, commits_before = sql.statements, sql.commits
+    sql_durations_before, api_durations_before = len(sql.durations), len(timing.durations)
+    api_calls_before = sum(fake.calls.values())
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with output:
+        async with session_factory() as db:
+            items = await coro_factory(db)
+    elapsed = time.perf_counter() - start
+
+    api_durations = timing.durations[api_durations_before:]
+    if api_durations:
+        latency_source, durations = "api_request", api_durations
+    else:
+        latency_source, durations = "sql_statement", sql.durations[sql_durations_before:]
+
+    return {
+        "items": items,
+        "seconds": round(elapsed, 3),
+        "items_per_sec": round(items / elapsed, 1) if elapsed > 0 else None,
+        "latency_source": latency_source,
+        "latency_ms": {
+            "p50": round(percentile(durations, 50) * 1000, 3) if durations else None,
+            "p99": round(percentile(durations, 99) * 1000, 3) if durations else None
+        },
+        "sql_statements": sql.statements - sql_before,
+        "commits": sql.commits - commits_before,
+        "api_calls": sum(fake.calls.values()) - api_calls_before,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+async def sync_leagues(db):
+    return (await LeagueSyncService(db).sync_leagues()).total_leagues
+
+
+async def sync_matches(db):
+    return (await MatchSyncService(db).sync_matches()).total_matches
+
+
+async def sync_predictions(db):
+    return (await PredictionSyncService(db).sync_predictions())["synced_matches"]
+
+
+async def evaluate_predictions(db):
+    return (await PredictionEvaluationService(db).evaluate_all_predictions())["total_processed"]
+
+
+async def run_benchmark(args) -> dict:
+    dataset = SyntheticDataset(
+        leagues=args.leagues,
+        seasons=tuple(args.seasons),
+        fixtures_per_season=args.fixtures_per_season
+    )
+    fake = FakeFootballAPI(dataset, latency=args.latency, error_rate=args.error_rate)
+    timing = TimingTransport(fake.transport())
+
+    db_dir = tempfile.TemporaryDirectory()
+    db_path = args.db or str(Path(db_dir.name) / "benchmark.db")
+    engine = apply_sqlite_pragmas(create_async_engine(f"sqlite+aiosqlite:///{db_path}"))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    sql = SqlCounters(engine.sync_engine)
+
+    await http_client.init_http_client(transport=timing)
+    phases = {}
+    try:
+        steps = {
+            "leagues": sync_leagues,
+            "matches": sync_matches,
+            "predictions": sync_predictions,
+            "evaluation": evaluate_predictions
+        }
+        for name in args.phases:
+            print(f"Phase {name}...", file=sys.stderr)
+            phases[name] = await run_phase(name, steps[name], session_factory, sql, timing, fake, args.verbose)
+            print(f"  {json.dumps(phases[name])}", file=sys.stderr)
+    finally:
+        await http_client.close_http_client()
+        await engine.dispose()
+        db_dir.cleanup()
+
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "dataset": {
+            "leagues": args.leagues,
+            "seasons": list(args.seasons),
+            "fixtures_per_season": args.fixtures_per_season,
+            "total_fixtures": dataset.total_fixtures,
+            "latency": args.latency,
+            "error_rate": args.error_rate
+        },
+        "phases": phases
+    }
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """Affiche l'évolution du débit par phase par rapport à un run précédent"""
+    print(f"\nComparaison {baseline.get('revision')} -> {current.get('revision')}", file=sys.stderr)
+    for name, phase in current["phases"].items():
+        previous = baseline.get("phases", {}).get(name)
+        if not previous or not previous.get("items_per_sec") or not phase.get("items_per_sec"):
+            continue
+        ratio = phase["items_per_sec"] / previous["items_per_sec"]
+        print(
+            f"  {name:<12} {previous['items_per_sec']:>10} -> {phase['items_per_sec']:>10} items/s "
+            f"(x{ratio:.2f}), SQL {previous['sql_statements']} -> {phase['sql_statements']}",
+            file=sys.stderr
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark des synchronisations LoneWolfCast")
+    parser.add_argument("--leagues", type=int, default=5)
+    parser.add_argument("--seasons", type=int, nargs="+", default=[2022, 2023, 2024])
+    parser.add_argument("--fixtures-per-season", type=int, default=380)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence simulée par appel API (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Proportion d'erreurs 500 simulées")
+    parser.add_argument("--phases", nargs="+", choices=PHASES, default=list(PHASES))
+    parser.add_argument("--db", help="Fichier SQLite à utiliser (temporaire par défaut)")
+    parser.add_argument("--output", help="Fichier JSON de résultats (stdout par défaut)")
+    parser.add_argument("--baseline", help="Résultats JSON d'un run précédent à comparer")
+    parser.add_argument("--verbose", action="store_true", help="Affiche les logs des services")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = asyncio.run(run_benchmark(args))
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(report, encoding="utf-8")
+    else:
+        print(report)
+
+    if args.baseline:
+        compare(results, json.loads(Path(args.baseline).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
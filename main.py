@@ -2,14 +2,41 @@ from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 from app.core.config import Settings
-from app.routers import admin, league_sync, match_sync, prediction_sync
+from app.routers import admin, jobs, league_sync, match_sync, prediction_sync
+from app.api.football.http_client import init_http_client, close_http_client
+from app.api.football.response_cache import close_response_cache
+from app.services.apiRate_limiter_service import get_rate_limiter
+from app.services.sync.live_service import get_live_poller
+from app.services.job_service import get_job_runner
+from app.services.scheduler_service import get_scheduler
 from fastapi.templating import Jinja2Templates
+from contextlib import asynccontextmanager
 import os
 from pathlib import Path
 
 # Configuration
 settings = Settings()
-app = FastAPI(title=settings.APP_NAME)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pool HTTP et limiteur d'appels partagés par les clients API-Football
+    await init_http_client()
+    await get_rate_limiter().start()
+    if settings.LIVE_POLL_ENABLED:
+        await get_live_poller().start()
+    if settings.JOB_RUNNER_ENABLED:
+        await get_job_runner().start()
+    if settings.SCHEDULER_ENABLED:
+        await get_scheduler().start()
+    yield
+    await get_scheduler().stop()
+    await get_job_runner().stop()
+    await get_live_poller().stop()
+    await get_rate_limiter().stop()
+    await close_http_client()
+    close_response_cache()
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
 # Utiliser le même BASE_DIR que dans config.py
 BASE_DIR = Path(__file__).parent
@@ -49,6 +76,7 @@ async def root():
 
 # Include routers
 app.include_router(admin.router)
+app.include_router(jobs.router)
 app.include_router(league_sync.router)
 app.include_router(match_sync.router)
 app.include_router(prediction_sync.router)
@@ -1,12 +1,19 @@
+import argparse
 import asyncio
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy import select, func, case
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, or_
+from sqlalchemy.orm import aliased
 from typing import Dict, Any, Optional, Tuple, List
+import numpy as np
 
-from app.models.prediction import Prediction, PredictionOutcome, PredictionComparison
+from app.models.prediction import Prediction, PredictionOutcome, PredictionComparison, PredictionTeam
 from app.models.match import Match, MatchResult
+from app.api.football.fixture_status import PLAYED_STATUSES
+from app.db.upsert import chunked
+from app.db.session import apply_sqlite_pragmas
+from app.services.prediction_accuracy_service import PredictionAccuracyRollup
+from app.services.sync_state_service import get_watermark, set_watermark, PREDICTION_EVALUATION
 from app.core.config import settings
 
 class PredictionType:
@@ -15,12 +22,54 @@ class PredictionType:
     WINNER = "Winner"
     COMBO_WINNER = "Combo Winner"
 
+# Pondération des écarts de comparaison dans la confiance pré-match
+CONFIDENCE_WEIGHTS = {
+    ("form_home", "form_away"): 0.25,
+    ("att_home", "att_away"): 0.2,
+    ("def_home", "def_away"): 0.2,
+    ("h2h_home", "h2h_away"): 0.15,
+    ("poisson_distribution_home", "poisson_distribution_away"): 0.2
+}
+
+# Colonnes texte chargées telles quelles (les autres deviennent des float, None = NaN)
+TEXT_COLUMNS = {"winner_name", "under_over", "goals_home", "goals_away", "advice_category", "home_team", "away_team"}
+
+# Colonnes d'outcome conservées si elles ne sont pas recalculées
+OUTCOME_COLUMNS = [
+    "both_teams_scored",
+    "winner_prediction_correct",
+    "win_or_draw_prediction_correct",
+    "under_over_prediction_correct",
+    "goals_prediction_accuracy",
+    "pre_match_confidence",
+    "form_difference",
+    "historical_accuracy"
+]
+
+# Les updated_at sont posés à l'écriture, avant le commit de leur lot (et à la seconde près
+# sous SQLite) : la marge couvre un lot validé après le début d'un passage d'évaluation
+WATERMARK_MARGIN = timedelta(seconds=60)
+
+HomeTeam = aliased(PredictionTeam)
+AwayTeam = aliased(PredictionTeam)
+
 class PredictionEvaluationService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.accuracy = PredictionAccuracyRollup(db)
 
-    async def evaluate_all_predictions(self) -> Dict[str, Any]:
-        """Évalue ou met à jour toutes les prédictions terminées."""
+    async def evaluate_all_predictions(self, full: bool = False, match_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Évalue ou met à jour les prédictions terminées.
+        Prédictions, résultats et comparaisons sont chargés en colonnes par une seule requête,
+        les indicateurs sont calculés avec NumPy puis les outcomes écrits en masse.
+        Args:
+            full: Réévalue tout l'historique et reconstruit le cumul de précision.
+                  Par défaut, seules les prédictions sans outcome ou dont le match, le résultat
+                  ou la prédiction ont changé depuis le dernier passage sont traitées.
+            match_ids: Restreint l'évaluation à ces matchs (ex : passés FT en direct),
+                       sans lire ni avancer le watermark.
+        """
         try:
             stats = {
                 "total_processed": 0,
@@ -28,36 +77,40 @@ class PredictionEvaluationService:
                 "errors": []
             }
 
-            # Sélectionner toutes les prédictions avec leurs relations
-            query = (
-                select(Prediction, MatchResult, Match)
-                .join(Match, Prediction.match_id == Match.id)
-                .join(MatchResult, Match.id == MatchResult.match_id)
-                .where(Match.status == 'FT')
-                .options(
-                    selectinload(Prediction.comparison),
-                    selectinload(Prediction.teams_data)
-                )
-            )
-            
-            result = await self.db.execute(query)
-            predictions = result.fetchall()
-
-            # Traitement par lots
-            batch_size = 100
-            for i in range(0, len(predictions), batch_size):
-                batch = predictions[i:i + batch_size]
-                for prediction, match_result, match in batch:
-                    try:
-                        await self._evaluate_single_prediction(prediction, match_result, match)
-                        stats["successful_evaluations"] += 1
-                    except Exception as e:
-                        error_msg = f"Erreur prédiction {prediction.id}: {str(e)}"
-                        stats["errors"].append(error_msg)
-                        print(error_msg)
-                    stats["total_processed"] += 1
+            # Début du passage : les modifications concurrentes seront reprises au suivant
+            run_started = datetime.utcnow()
+            targeted = match_ids is not None
+            watermark = None if full or targeted else await get_watermark(self.db, PREDICTION_EVALUATION)
+
+            if full:
+                await self.accuracy.rebuild()
+            else:
+                await self.accuracy.load()
+            columns = await self._load_evaluation_columns(watermark, match_ids)
+            if columns is None:
+                if not targeted:
+                    await set_watermark(self.db, PREDICTION_EVALUATION, run_started)
                 await self.db.commit()
+                return stats
+
+            outcomes, errors = self._evaluate_columns(columns)
+            historical_accuracy = await self._calculate_historical_accuracy(
+                columns, outcomes["winner_prediction_correct"][0]
+            )
+            outcomes["historical_accuracy"] = (historical_accuracy, outcomes["historical_accuracy"][1])
+            await self._write_outcomes(columns, outcomes)
+            await self.accuracy.flush()
+            if not targeted:
+                await set_watermark(self.db, PREDICTION_EVALUATION, run_started)
+            await self.db.commit()
+
+            for prediction_id, message in errors:
+                error_msg = f"Erreur prédiction {prediction_id}: {message}"
+                stats["errors"].append(error_msg)
+                print(error_msg)
 
+            stats["total_processed"] = len(columns["prediction_id"])
+            stats["successful_evaluations"] = stats["total_processed"] - len(errors)
             return stats
 
         except Exception as e:
@@ -65,178 +118,260 @@ class PredictionEvaluationService:
             print(f"Erreur globale: {str(e)}")
             raise
 
-    async def _evaluate_single_prediction(self, prediction: Prediction, match_result: MatchResult, match: Match) -> None:
-        """Évalue une prédiction et met à jour ou crée son outcome."""
-        outcome = await self._get_or_create_outcome(prediction.id)
-        winner_id, winner_name = self._get_match_winner(match_result, match)
-
-        # Mise à jour de l'outcome
-        outcome.updated_at = datetime.now(UTC)
-        outcome.both_teams_scored = match_result.home_score > 0 and match_result.away_score > 0
-        outcome.winner_prediction_correct = self._is_winner_prediction_correct(
-            prediction, winner_id, winner_name
+    async def _load_evaluation_columns(
+        self,
+        watermark: Optional[datetime] = None,
+        match_ids: Optional[List[int]] = None
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Charge en une requête les données à évaluer, une colonne NumPy par champ.
+        Avec un watermark, seules les prédictions sans outcome ou modifiées depuis sont chargées ;
+        avec match_ids, seules celles de ces matchs.
+        """
+        query = (
+            select(
+                Prediction.id.label("prediction_id"),
+                Prediction.winner_id,
+                Prediction.winner_name,
+                Prediction.win_or_draw,
+                Prediction.under_over,
+                Prediction.goals_home,
+                Prediction.goals_away,
+                Prediction.advice_category,
+                Match.league_id,
+                Match.season,
+                Match.home_team_id,
+                Match.home_team,
+                Match.away_team_id,
+                Match.away_team,
+                MatchResult.home_score,
+                MatchResult.away_score,
+                PredictionComparison.id.label("comparison_id"),
+                *[getattr(PredictionComparison, name) for pair in CONFIDENCE_WEIGHTS for name in pair],
+                HomeTeam.id.label("home_team_data_id"),
+                HomeTeam.last_5_form.label("home_form"),
+                AwayTeam.id.label("away_team_data_id"),
+                AwayTeam.last_5_form.label("away_form"),
+                PredictionOutcome.id.label("outcome_id"),
+                *[getattr(PredictionOutcome, name).label(f"existing_{name}") for name in OUTCOME_COLUMNS]
+            )
+            .join(Match, Prediction.match_id == Match.id)
+            .join(MatchResult, Match.id == MatchResult.match_id)
+            .outerjoin(PredictionComparison, PredictionComparison.prediction_id == Prediction.id)
+            .outerjoin(HomeTeam, (HomeTeam.prediction_id == Prediction.id) & HomeTeam.is_home.is_(True))
+            .outerjoin(AwayTeam, (AwayTeam.prediction_id == Prediction.id) & AwayTeam.is_home.is_(False))
+            .outerjoin(PredictionOutcome, PredictionOutcome.prediction_id == Prediction.id)
+            .where(Match.status.in_(PLAYED_STATUSES))
+            .order_by(Prediction.id)
         )
+        if match_ids is not None:
+            if not match_ids:
+                return None
+            query = query.where(Match.id.in_(match_ids))
+        if watermark is not None:
+            watermark -= WATERMARK_MARGIN
+            query = query.where(or_(
+                PredictionOutcome.id.is_(None),
+                MatchResult.updated_at >= watermark,
+                Match.updated_at >= watermark,
+                Prediction.updated_at >= watermark
+            ))
 
-        if prediction.win_or_draw:
-            outcome.win_or_draw_prediction_correct = (
-                winner_id is None or outcome.winner_prediction_correct
-            )
+        result = await self.db.execute(query)
+        keys = list(result.keys())
+        rows = result.all()
+        if not rows:
+            return None
 
-        if prediction.under_over:
-            outcome.under_over_prediction_correct = self._is_under_over_correct(
-                prediction.under_over, 
-                match_result.home_score + match_result.away_score
-            )
+        columns = {}
+        for key, values in zip(keys, zip(*rows)):
+            if key in TEXT_COLUMNS or key.startswith("existing_"):
+                columns[key] = np.array(values, dtype=object)
+            else:
+                columns[key] = np.array(values, dtype=float)
 
-        # Calcul des métriques
-        outcome.goals_prediction_accuracy = self._calculate_goals_accuracy(
-            prediction, match_result
-        )
-        outcome.pre_match_confidence = self._calculate_pre_match_confidence(prediction)
-        outcome.form_difference = self._calculate_form_difference(prediction)
-        outcome.historical_accuracy = await self._calculate_historical_accuracy(
-            self._get_prediction_type(prediction.advice)
-        )
+        # Une ligne par prédiction même en cas de doublons dans les jointures
+        _, first = np.unique(columns["prediction_id"], return_index=True)
+        if len(first) != len(rows):
+            columns = {key: values[first] for key, values in columns.items()}
+        return columns
 
-    async def _get_or_create_outcome(self, prediction_id: int) -> PredictionOutcome:
-        """Récupère l'outcome existant ou en crée un nouveau."""
-        query = select(PredictionOutcome).where(
-            PredictionOutcome.prediction_id == prediction_id
-        )
-        result = await self.db.execute(query)
-        outcome = result.scalar_one_or_none()
-        
-        if not outcome:
-            outcome = PredictionOutcome(
-                prediction_id=prediction_id, 
-                created_at=datetime.now(UTC)
-            )
-            self.db.add(outcome)
-        
-        return outcome
-
-    def _get_match_winner(self, match_result: MatchResult, match: Match) -> Tuple[Optional[int], Optional[str]]:
-        """Détermine l'équipe gagnante du match."""
-        if match_result.home_score > match_result.away_score:
-            return match.home_team_id, match.home_team
-        elif match_result.away_score > match_result.home_score:
-            return match.away_team_id, match.away_team
-        return None, None
-
-    def _is_winner_prediction_correct(self, prediction: Prediction, winner_id: Optional[int], winner_name: Optional[str]) -> bool:
-        """Vérifie si la prédiction du vainqueur est correcte."""
-        if winner_id is None:
-            return prediction.winner_id is None
-        if prediction.winner_id is None:
-            return False
-        
-        return (prediction.winner_id == winner_id or 
-                prediction.winner_name == winner_name)
-
-    def _is_under_over_correct(self, prediction: str, total_goals: int) -> bool:
-        """Vérifie si la prédiction under/over est correcte."""
+    def _evaluate_columns(self, c: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], List[Tuple[int, str]]]:
+        """
+        Calcule les indicateurs de toutes les prédictions.
+        Retourne les valeurs par colonne (None = colonne non recalculée) et les erreurs par prédiction.
+        """
+        home_score, away_score = c["home_score"], c["away_score"]
+
+        # Vainqueur réel (NaN = match nul ou équipe inconnue)
+        winner_id = np.where(home_score > away_score, c["home_team_id"],
+                             np.where(away_score > home_score, c["away_team_id"], np.nan))
+        winner_name = np.where(home_score > away_score, c["home_team"],
+                               np.where(away_score > home_score, c["away_team"], None))
+        no_winner = np.isnan(winner_id)
+        predicted_no_winner = np.isnan(c["winner_id"])
+
+        winner_correct = np.where(
+            no_winner,
+            predicted_no_winner,
+            ~predicted_no_winner & ((c["winner_id"] == winner_id) | (c["winner_name"] == winner_name))
+        ).astype(bool)
+
+        # Under/Over : seuil et sens parsés une fois par valeur distincte
+        under_over = c["under_over"]
+        has_under_over = np.array([bool(value) for value in under_over])
+        thresholds, is_over = self._map_distinct(under_over, self._parse_under_over, (np.nan, False))
+        total_goals = home_score + away_score
+        under_over_correct = np.where(is_over.astype(bool), total_goals > thresholds, total_goals < thresholds)
+
+        # Précision des buts (0-100%), 0 si une prédiction n'est pas numérique
+        pred_home = self._map_distinct(c["goals_home"], self._parse_goals, 0.0)
+        pred_away = self._map_distinct(c["goals_away"], self._parse_goals, 0.0)
+        max_error = np.maximum(np.maximum(home_score, away_score), 1)
+        goals_accuracy = (1 - (np.abs(pred_home - home_score) + np.abs(pred_away - away_score)) / (2 * max_error)) * 100
+        goals_accuracy = np.where(np.isnan(goals_accuracy), 0.0, np.clip(goals_accuracy, 0, 100))
+
+        # Confiance pré-match : somme pondérée des écarts de comparaison (0 sans comparaison)
+        has_comparison = ~np.isnan(c["comparison_id"])
+        confidence = sum(np.abs(c[home] - c[away]) * weight for (home, away), weight in CONFIDENCE_WEIGHTS.items())
+        comparison_error = has_comparison & np.isnan(confidence)
+        confidence = np.where(has_comparison, np.clip(confidence, 0, 100), 0.0)
+
+        # Différence de forme : 0 sans les données des deux équipes
+        has_teams = ~np.isnan(c["home_team_data_id"]) & ~np.isnan(c["away_team_data_id"])
+        form_difference = np.abs(c["home_form"] - c["away_form"])
+        form_error = has_teams & np.isnan(form_difference)
+        form_difference = np.where(has_teams, form_difference, 0.0)
+
+        # Comme auparavant, une donnée manquante interrompt l'évaluation après les champs déjà calculés
+        errors = []
+        for index in np.flatnonzero(comparison_error):
+            errors.append((int(c["prediction_id"][index]), "comparaison incomplète"))
+        for index in np.flatnonzero(form_error & ~comparison_error):
+            errors.append((int(c["prediction_id"][index]), "forme des équipes manquante"))
+        errors.sort()
+        complete = ~comparison_error & ~form_error
+
+        outcomes = {
+            "both_teams_scored": ((home_score > 0) & (away_score > 0), None),
+            "winner_prediction_correct": (winner_correct, None),
+            "win_or_draw_prediction_correct": (no_winner | winner_correct, c["win_or_draw"] == 1),
+            "under_over_prediction_correct": (under_over_correct, has_under_over),
+            "goals_prediction_accuracy": (goals_accuracy, None),
+            "pre_match_confidence": (confidence, ~comparison_error),
+            "form_difference": (form_difference, complete),
+            "historical_accuracy": (None, complete)
+        }
+        return outcomes, errors
+
+    @staticmethod
+    def _map_distinct(values: np.ndarray, parse, default):
+        """Applique parse à chaque valeur distincte puis redistribue le résultat sur toutes les lignes."""
+        keys = np.array(["" if value is None else str(value) for value in values], dtype=object)
+        distinct, inverse = np.unique(keys, return_inverse=True)
+        parsed = [parse(value) if value else default for value in distinct]
+        if isinstance(default, tuple):
+            return tuple(np.array(part, dtype=float)[inverse] for part in zip(*parsed))
+        return np.array(parsed, dtype=float)[inverse]
+
+    @staticmethod
+    def _parse_under_over(prediction: str) -> Tuple[float, bool]:
+        """Seuil et sens d'une prédiction under/over ("2.5 over"), NaN si invalide."""
         try:
             value, prediction_type = prediction.split()
-            threshold = float(value)
-            if prediction_type.lower() == "over":
-                return total_goals > threshold
-            return total_goals < threshold
+            return float(value), prediction_type.lower() == "over"
         except (ValueError, AttributeError):
-            return False
+            return np.nan, False
 
-    def _calculate_goals_accuracy(self, prediction: Prediction, result: MatchResult) -> float:
-        """Calcule la précision de la prédiction des buts (0-100%)."""
+    @staticmethod
+    def _parse_goals(value: str) -> float:
         try:
-            pred_home = float(prediction.goals_home or 0)
-            pred_away = float(prediction.goals_away or 0)
-            
-            home_diff = abs(pred_home - result.home_score)
-            away_diff = abs(pred_away - result.away_score)
-            
-            max_error = max(result.home_score, result.away_score, 1)
-            accuracy = (1 - ((home_diff + away_diff) / (2 * max_error))) * 100
-            
-            return max(0, min(100, accuracy))
-        except (ValueError, ZeroDivisionError):
-            return 0
-
-    def _calculate_pre_match_confidence(self, prediction: Prediction) -> float:
-        """Calcule le niveau de confiance pré-match (0-100%)."""
-        if not prediction.comparison:
-            return 0
-
-        weights = {
-            'form': 0.25,
-            'attack': 0.2,
-            'defense': 0.2,
-            'h2h': 0.15,
-            'poisson': 0.2
-        }
+            return float(value or 0)
+        except ValueError:
+            return np.nan
 
-        metrics = {
-            'form': abs(prediction.comparison.form_home - prediction.comparison.form_away),
-            'attack': abs(prediction.comparison.att_home - prediction.comparison.att_away),
-            'defense': abs(prediction.comparison.def_home - prediction.comparison.def_away),
-            'h2h': abs(prediction.comparison.h2h_home - prediction.comparison.h2h_away),
-            'poisson': abs(prediction.comparison.poisson_distribution_home - 
-                          prediction.comparison.poisson_distribution_away)
-        }
+    async def _calculate_historical_accuracy(self, c: Dict[str, np.ndarray], winner_correct: np.ndarray) -> np.ndarray:
+        """
+        Précision historique par type de prédiction (0-100%), lue dans le cumul en mémoire
+        après application des résultats de cette évaluation.
+        """
+        if not self.accuracy.counts:
+            # Table de cumul vide (base neuve ou créée hors migration) : la reconstruire
+            await self.accuracy.rebuild()
 
-        confidence = sum(metrics[key] * weight for key, weight in weights.items())
-        return min(100, max(0, confidence))
+        # L'ancien outcome est compté avec le type actuel de l'advice
+        categories = c["advice_category"]
+        types_by_category = {category: self._get_prediction_type(category) for category in set(categories)}
+        prediction_types = [types_by_category[category] for category in categories]
+        existing = [value is not None for value in c["existing_both_teams_scored"]]
+        previous_correct = [value is True for value in c["existing_winner_prediction_correct"]]
+        league_ids = np.nan_to_num(c["league_id"]).astype(int).tolist()
+        seasons = np.nan_to_num(c["season"]).astype(int).tolist()
+        for prediction_type, league_id, season, was_present, was_correct, is_correct in zip(
+            prediction_types, league_ids, seasons, existing, previous_correct, winner_correct.tolist()
+        ):
+            self.accuracy.add(
+                prediction_type, league_id, season,
+                correct_delta=int(is_correct) - int(was_correct),
+                total_delta=0 if was_present else 1
+            )
 
-    def _calculate_form_difference(self, prediction: Prediction) -> float:
-        """Calcule la différence de forme entre les équipes (0-100%)."""
-        if not prediction.teams_data or len(prediction.teams_data) != 2:
-            return 0
+        by_type = {prediction_type: self.accuracy.accuracy(prediction_type) for prediction_type in set(prediction_types)}
+        return np.array([by_type[prediction_type] for prediction_type in prediction_types], dtype=float)
 
-        teams = sorted(prediction.teams_data, key=lambda x: x.is_home)
-        return abs(teams[0].last_5_form - teams[1].last_5_form)
+    async def _write_outcomes(self, c: Dict[str, np.ndarray], outcomes: Dict[str, Tuple]) -> None:
+        """Insère les nouveaux outcomes et met à jour les existants par lots."""
+        now = datetime.now(UTC)
+        values = {}
+        for name, (computed, mask) in outcomes.items():
+            computed = np.asarray(computed).astype(object)
+            existing = c[f"existing_{name}"]
+            values[name] = (computed if mask is None else np.where(mask, computed, existing)).tolist()
 
-    async def _calculate_historical_accuracy(self, prediction_type: str) -> float:
-        """Calcule la précision historique pour ce type de prédiction (0-100%)."""
-        try:
-            query = (
-                select(
-                    func.count(case((PredictionOutcome.winner_prediction_correct.is_(True), 1))).label('correct'),
-                    func.count(PredictionOutcome.id).label('total')
-                )
-                .join(Prediction)
-                .where(Prediction.advice.ilike(f"%{prediction_type}%"))
-            )
-            
-            result = await self.db.execute(query)
-            stats = result.first()
-            
-            if not stats or not stats.total:
-                return 0
-            
-            return (stats.correct / stats.total) * 100
-            
-        except Exception:
-            return 0
+        is_new = np.isnan(c["outcome_id"])
+        prediction_ids = c["prediction_id"].astype(int).tolist()
+        outcome_ids = np.nan_to_num(c["outcome_id"]).astype(int).tolist()
+
+        new_outcomes = []
+        changed_outcomes = []
+        for index, new in enumerate(is_new.tolist()):
+            row = {name: values[name][index] for name in OUTCOME_COLUMNS}
+            row["updated_at"] = now
+            if new:
+                row["prediction_id"] = prediction_ids[index]
+                row["created_at"] = now
+                new_outcomes.append(row)
+            else:
+                row["id"] = outcome_ids[index]
+                changed_outcomes.append(row)
+
+        # render_nulls : sans lui l'ORM regroupe les lignes selon leurs colonnes NULL (un INSERT par groupe)
+        for chunk in chunked(new_outcomes):
+            await self.db.execute(insert(PredictionOutcome).execution_options(render_nulls=True), list(chunk))
+        for chunk in chunked(changed_outcomes):
+            await self.db.execute(update(PredictionOutcome), list(chunk))
 
-    def _get_prediction_type(self, advice: Optional[str]) -> str:
-        """Détermine le type de prédiction basé sur l'advice."""
-        if not advice:
+    def _get_prediction_type(self, advice_category: Optional[str]) -> str:
+        """Détermine le type de prédiction à partir de la catégorie d'advice (Prediction.advice_category)."""
+        if not advice_category:
             return "Unknown"
             
-        advice = advice.lower()
-        if "double chance" in advice:
-            return "Combo Double chance" if "combo" in advice else "Double chance"
-        elif "winner" in advice:
-            return "Combo Winner" if "combo" in advice else "Winner"
+        category = advice_category.lower()
+        if "double chance" in category:
+            return "Combo Double chance" if "combo" in category else "Double chance"
+        elif "winner" in category:
+            return "Combo Winner" if "combo" in category else "Winner"
         return "Unknown"
 
-async def main():
+async def main(full: bool = False):
     """Point d'entrée principal du script."""
-    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+    engine = apply_sqlite_pragmas(create_async_engine(settings.ASYNC_DATABASE_URL, **settings.engine_kwargs))
     async_session = async_sessionmaker(engine, expire_on_commit=False)
 
     async with async_session() as session:
         service = PredictionEvaluationService(session)
         try:
-            stats = await service.evaluate_all_predictions()
+            stats = await service.evaluate_all_predictions(full=full)
             print("\nStatistiques d'évaluation:")
             print(f"Total traité: {stats['total_processed']}")
             print(f"Évaluations réussies: {stats['successful_evaluations']}")
@@ -252,4 +387,7 @@ async def main():
             await engine.dispose()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Évaluation des prédictions terminées")
+    parser.add_argument("--full", action="store_true", help="Réévalue tout l'historique au lieu des seuls changements")
+    args = parser.parse_args()
+    asyncio.run(main(full=args.full))
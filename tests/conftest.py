@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+# Valeurs minimales pour instancier Settings sans fichier .env
+for key in ("API_KEY", "API_BASE_URL", "SECRET_KEY", "ADMIN_USERNAME", "ADMIN_PASSWORD"):
+    os.environ.setdefault(key, "test")
+
+# Pas de cache disque des réponses API pendant les tests
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+
+@pytest.fixture
+def create_test_db():
+    """Fabrique async d'une base SQLite en mémoire avec le schéma complet : (engine, session_factory)"""
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.models import Base
+
+    async def factory():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+    return factory
@@ -0,0 +1,53 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.api.football.base_client import BaseAPIClient
+from app.core.config import settings
+from app.services import apiRate_limiter_service
+from app.services.apiRate_limiter_service import ApiRateLimiter
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "API_RETRY_ATTEMPTS", 3)
+    monkeypatch.setattr(settings, "API_RETRY_BACKOFF_BASE", 0.0)
+    monkeypatch.setattr(apiRate_limiter_service, "_limiter", ApiRateLimiter(10000, 10000))
+
+
+def request_with(handler):
+    calls = []
+
+    def counting_handler(request):
+        calls.append(request)
+        return handler(len(calls), request)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(counting_handler)) as http:
+            return await BaseAPIClient(http_client=http)._make_request("fixtures", {"league": 39})
+
+    return asyncio.run(run()), calls
+
+
+def test_transient_errors_are_retried():
+    def handler(call, request):
+        if call == 1:
+            raise httpx.ReadTimeout("timeout", request=request)
+        if call == 2:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"response": [1]})
+
+    data, calls = request_with(handler)
+    assert data == {"response": [1]}
+    assert len(calls) == 3
+
+
+def test_client_errors_are_not_retried():
+    with pytest.raises(Exception, match="Error fetching data from API"):
+        request_with(lambda call, request: httpx.Response(404))
+
+
+def test_gives_up_after_max_attempts():
+    with pytest.raises(Exception, match="Error fetching data from API"):
+        request_with(lambda call, request: httpx.Response(500))
@@ -0,0 +1,53 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.models import League, Season, Match
+from app.services.matches_stats_services import get_dashboard_stats, invalidate_dashboard_stats
+from app.services.sync.league_service import LeagueSyncService
+from app.services.sync_stats_service import rebuild_sync_stats
+
+
+def test_dashboard_stats_single_query_and_snapshot(create_test_db):
+    async def run():
+        engine, session_factory = await create_test_db()
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        async with session_factory() as db:
+            league = League(api_id=1, name="League", type="League")
+            db.add(league)
+            await db.flush()
+            db.add(Season(league_id=league.id, year=2024, start_date=datetime(2024, 8, 1),
+                          end_date=datetime(2025, 5, 31), current=True, has_predictions=True))
+            for fixture_id, status in enumerate(["FT", "FT", "NS", "PST"], start=1):
+                db.add(Match(api_fixture_id=fixture_id, league_id=league.id, date=datetime(2024, 9, 1),
+                             status=status, home_team="Home", away_team="Away",
+                             predictions_synced=status == "FT"))
+            await rebuild_sync_stats(db)
+            await db.commit()
+            invalidate_dashboard_stats()
+
+            statements.clear()
+            stats = await get_dashboard_stats(db)
+            league_stats = await LeagueSyncService(db).get_dashboard_stats_league()
+            assert len(statements) == 2
+            assert stats["total_matches"] == 4
+            assert stats["match_status"]["Terminés"] == {"count": 2, "percentage": 50.0}
+            assert stats["match_status"]["À venir"]["count"] == 1
+            assert stats["predictions_status"]["En attente"]["count"] == 2
+            assert league_stats["leagues_count"] == 1
+            assert league_stats["last_sync"] != "Jamais"
+
+            # Servi depuis l'instantané, puis recalculé après invalidation
+            statements.clear()
+            assert await get_dashboard_stats(db) == stats
+            assert statements == []
+            invalidate_dashboard_stats()
+            await get_dashboard_stats(db)
+            assert len(statements) == 1
+        invalidate_dashboard_stats()
+        await engine.dispose()
+
+    asyncio.run(run())
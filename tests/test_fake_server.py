@@ -0,0 +1,515 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, func, update
+
+from app.api.football import http_client, response_cache
+from app.api.football.fake_server import FakeFootballAPI, SyntheticDataset
+from app.api.football.match_schemas import ApiResponse
+from app.core.config import settings
+from app.models import League, Season, Match, MatchResult, Prediction, SyncStats, SyncJob
+from app.models.prediction import PredictionOutcome
+from app.services import apiRate_limiter_service
+from app.services.apiRate_limiter_service import ApiRateLimiter
+from app.services.job_service import JobRunner, JobAlreadyActive, submit_job, request_cancel, job_as_dict
+from app.services.sync.league_service import LeagueSyncService
+from app.services.sync.live_service import LiveMatchPoller
+from app.services.sync.match_service import MatchSyncService, QUOTA_EXHAUSTED_ERROR as MATCH_QUOTA_EXHAUSTED_ERROR
+from app.services.sync.predictions_service import PredictionSyncService, QUOTA_EXHAUSTED_ERROR
+from app.services.sync_state_service import (
+    get_position, set_position, set_watermark, PREDICTION_SYNC, PREDICTION_EVALUATION
+)
+from app.services.sync_stats_service import rebuild_sync_stats
+from prediction_outcome_service import PredictionEvaluationService
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch):
+    monkeypatch.setattr(settings, "API_RETRY_BACKOFF_BASE", 0.0)
+    monkeypatch.setattr(apiRate_limiter_service, "_limiter", ApiRateLimiter(100000, 100000))
+
+
+def test_synthetic_dataset_is_deterministic():
+    dataset = SyntheticDataset(leagues=2, fixtures_per_season=20)
+    fixture_id = dataset.fixture_id(2, 2023, 7)
+    assert dataset.parse_fixture_id(fixture_id) == (2, 2023, 7)
+    assert dataset.fixture(fixture_id) == SyntheticDataset(leagues=2, fixtures_per_season=20).fixture(fixture_id)
+    assert len(dataset.fixtures({"league": "1", "season": "2024"})) == 20
+
+
+def test_full_sync_against_fake_api(create_test_db):
+    fake = FakeFootballAPI(
+        SyntheticDataset(leagues=2, fixtures_per_season=20),
+        error_rate=0.1,
+        rate_limit_per_minute=100000,
+        daily_limit=100000,
+    )
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                matches = await MatchSyncService(db).sync_matches()
+                predictions = await PredictionSyncService(db).sync_predictions()
+                counts = [
+                    await db.scalar(select(func.count()).select_from(model))
+                    for model in (League, Season, Match, MatchResult, Prediction)
+                ]
+                # Les compteurs maintenus par les syncs égalent un recalcul complet
+                maintained = {
+                    (row.league_id, row.season): (row.total_matches, row.finished_matches, row.synced_predictions)
+                    for row in (await db.execute(select(SyncStats))).scalars()
+                }
+                await rebuild_sync_stats(db)
+                rebuilt = {
+                    (row.league_id, row.season): (row.total_matches, row.finished_matches, row.synced_predictions)
+                    for row in (await db.execute(select(SyncStats))).scalars()
+                }
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+        return matches, predictions, counts, maintained, rebuilt
+
+    matches, predictions, counts, maintained, rebuilt = asyncio.run(run())
+    assert matches.errors == []
+    assert predictions["synced_matches"] == 120
+    assert counts[:3] == [2, 6, 120]
+    assert counts[4] == 120
+    assert maintained == rebuilt and maintained[(0, 0)][0] == 120
+    assert fake.errors_returned > 0  # Les erreurs 500 ont été absorbées par les retries
+
+
+def test_prediction_sync_pages_and_resumes(create_test_db, monkeypatch):
+    monkeypatch.setattr(settings, "PREDICTION_SYNC_PAGE_SIZE", 7)
+    fake = FakeFootballAPI(
+        SyntheticDataset(leagues=1, fixtures_per_season=10),
+        rate_limit_per_minute=100000,
+        daily_limit=100000,
+    )
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                await MatchSyncService(db).sync_matches()
+                match_ids = (await db.execute(select(Match.id).order_by(Match.id))).scalars().all()
+
+                # Passage interrompu après le 12e match : la reprise ne relit que la suite
+                await set_position(db, PREDICTION_SYNC, match_ids[11])
+                await db.commit()
+                resumed = await PredictionSyncService(db).sync_predictions()
+                synced = (await db.execute(
+                    select(Match.id).where(Match.predictions_synced.is_(True)).order_by(Match.id)
+                )).scalars().all()
+                position = await get_position(db, PREDICTION_SYNC)
+
+                restarted = await PredictionSyncService(db).sync_predictions()
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+        return match_ids, resumed, synced, position, restarted
+
+    match_ids, resumed, synced, position, restarted = asyncio.run(run())
+    assert resumed["resumed_after_id"] == match_ids[11]
+    assert resumed["synced_matches"] == len(match_ids) - 12
+    assert synced == match_ids[12:]
+    assert position is None  # Parcours terminé : repart du début
+    assert restarted["total_matches"] == restarted["synced_matches"] == 12
+
+
+def test_prediction_sync_stops_when_daily_quota_exhausted(create_test_db, monkeypatch):
+    monkeypatch.setattr(settings, "PREDICTION_SYNC_WORKERS", 3)
+    fake = FakeFootballAPI(
+        SyntheticDataset(leagues=1, fixtures_per_season=20),
+        rate_limit_per_minute=100000,
+        daily_limit=100000,
+    )
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                await MatchSyncService(db).sync_matches()
+                match_ids = (await db.execute(select(Match.id).order_by(Match.id))).scalars().all()
+
+                # Plus que 5 appels dans la journée
+                limiter = apiRate_limiter_service.get_rate_limiter()
+                limiter.configured_max_calls_per_day = limiter.max_calls_per_day = limiter.calls_made_today + 5
+                exhausted = await PredictionSyncService(db).sync_predictions()
+                synced = set((await db.execute(
+                    select(Match.id).where(Match.predictions_synced.is_(True))
+                )).scalars())
+                position = await get_position(db, PREDICTION_SYNC)
+
+                # Quota renouvelé : la reprise récupère tous les matchs restants
+                limiter.configured_max_calls_per_day = limiter.max_calls_per_day = 100000
+                resumed = await PredictionSyncService(db).sync_predictions()
+                remaining = await db.scalar(select(func.count()).where(Match.predictions_synced.is_(False)))
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+        return match_ids, exhausted, synced, position, resumed, remaining
+
+    match_ids, exhausted, synced, position, resumed, remaining = asyncio.run(run())
+    assert fake.calls["predictions"] == len(match_ids)
+    assert exhausted["quota_exhausted"] is True
+    assert exhausted["synced_matches"] == len(synced) == 5
+    assert exhausted["errors"] == [QUOTA_EXHAUSTED_ERROR]
+    # Le point de reprise ne dépasse aucun match non récupéré
+    assert position is not None
+    assert all(match_id in synced for match_id in match_ids if match_id <= position)
+    assert resumed["quota_exhausted"] is False and resumed["errors"] == []
+    assert remaining == 0
+
+
+def test_match_sync_stops_when_daily_quota_exhausted(create_test_db):
+    fake = FakeFootballAPI(
+        SyntheticDataset(leagues=2, fixtures_per_season=10),
+        rate_limit_per_minute=100000,
+        daily_limit=100000,
+    )
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                seasons = await db.scalar(select(func.count()).where(Season.has_predictions.is_(True)))
+
+                # Plus que 2 appels dans la journée
+                limiter = apiRate_limiter_service.get_rate_limiter()
+                limiter.configured_max_calls_per_day = limiter.max_calls_per_day = limiter.calls_made_today + 2
+                before = fake.calls["fixtures"]
+                exhausted = await MatchSyncService(db).sync_matches()
+                calls = fake.calls["fixtures"] - before
+                pending = await db.scalar(select(func.count()).where(Season.matches_synced.is_(False)))
+
+                # Quota renouvelé : le passage suivant lit les saisons restantes
+                limiter.configured_max_calls_per_day = limiter.max_calls_per_day = 100000
+                resumed = await MatchSyncService(db).sync_matches()
+                remaining = await db.scalar(select(func.count()).where(Season.matches_synced.is_(False)))
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+        return seasons, exhausted, calls, pending, resumed, remaining
+
+    seasons, exhausted, calls, pending, resumed, remaining = asyncio.run(run())
+    assert calls == 2
+    assert exhausted.errors == [MATCH_QUOTA_EXHAUSTED_ERROR]
+    assert exhausted.synced_matches == 20
+    assert pending == seasons - 2
+    assert resumed.errors == []
+    assert remaining == 0
+
+
+def test_incremental_match_sync_fetches_only_changes(create_test_db):
+    year = datetime.utcnow().year
+    dataset = SyntheticDataset(leagues=2, seasons=(year - 2, year), fixtures_per_season=20)
+    fake = FakeFootballAPI(dataset, rate_limit_per_minute=100000, daily_limit=100000)
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        calls = []
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                service = MatchSyncService(db)
+                for _ in range(2):
+                    before = fake.calls["fixtures"]
+                    await service.sync_matches()
+                    calls.append(fake.calls["fixtures"] - before)
+
+                # Match d'une saison close resté "NS" en base : rechargé par ids
+                stale = await db.scalar(select(Match).where(Match.season == year - 2).limit(1))
+                stale.status = "NS"
+                await db.commit()
+                before = fake.calls["fixtures"]
+                result = await service.sync_matches()
+                calls.append(fake.calls["fixtures"] - before)
+                await db.refresh(stale)
+
+                before = fake.calls["fixtures"]
+                await service.sync_matches(incremental=False)
+                calls.append(fake.calls["fixtures"] - before)
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+        return calls, result, stale.status
+
+    calls, result, status = asyncio.run(run())
+    # Complet, puis une fenêtre par saison en cours, puis + 1 appel ids ; le mode complet relit tout
+    assert calls == [4, 2, 3, 4]
+    assert result.updated_matches == 1 and status == "FT"
+
+
+def test_incremental_match_sync_bypasses_response_cache(create_test_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "CACHE_PATH", str(tmp_path / "api_cache.db"))
+    monkeypatch.setattr(response_cache, "_cache", None)
+    year = datetime.utcnow().year
+    dataset = SyntheticDataset(leagues=1, seasons=(year - 2, year), fixtures_per_season=20)
+    fake = FakeFootballAPI(dataset, rate_limit_per_minute=100000, daily_limit=100000)
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        calls = []
+        statuses = []
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                service = MatchSyncService(db)
+                for _ in range(3):
+                    before = fake.calls["fixtures"]
+                    await service.sync_matches()
+                    calls.append(fake.calls["fixtures"] - before)
+
+                # Match d'une saison close reporté puis joué : chaque rechargement par ids relit l'API
+                stale = await db.scalar(select(Match).where(Match.season == year - 2).limit(1))
+                for status in ("PST", "FT"):
+                    stale.status = "NS"
+                    await db.commit()
+                    dataset.set_fixture_state(stale.api_fixture_id, status, 1, 0)
+                    await service.sync_matches()
+                    await db.refresh(stale)
+                    statuses.append(stale.status)
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+            response_cache.close_response_cache()
+        return calls, statuses
+
+    calls, statuses = asyncio.run(run())
+    # Complet, puis la fenêtre de la saison en cours relue à chaque passage
+    assert calls == [2, 1, 1]
+    assert statuses == ["PST", "FT"]
+
+
+def test_score_correction_from_long_sync_is_reevaluated(create_test_db):
+    dataset = SyntheticDataset(leagues=1, fixtures_per_season=10)
+    fake = FakeFootballAPI(dataset, rate_limit_per_minute=100000, daily_limit=100000)
+    fixture_id = dataset.fixture_id(1, 2024, 3)
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                service = MatchSyncService(db)
+                await service.sync_matches()
+                await PredictionSyncService(db).sync_predictions()
+                await PredictionEvaluationService(db).evaluate_all_predictions()
+                # Dernier passage d'évaluation il y a une heure, données antérieures
+                day_ago = datetime.utcnow() - timedelta(days=1)
+                for model in (Match, MatchResult, Prediction):
+                    await db.execute(update(model).values(updated_at=day_ago))
+                await set_watermark(db, PREDICTION_EVALUATION, datetime.utcnow() - timedelta(hours=1))
+                await db.commit()
+
+                # Correction de score écrite par une sync démarrée 3 h plus tôt, donc avant ce passage
+                dataset.set_fixture_state(fixture_id, "FT", 9, 9)
+                fixtures = ApiResponse(**await service.client.get_matches_by_ids([fixture_id], cache_ttl=0)).response
+                leagues_map = {api_id: id_ for api_id, id_ in (await db.execute(select(League.api_id, League.id))).all()}
+                await service.apply_fixtures(fixtures, leagues_map, datetime.utcnow() - timedelta(hours=3))
+                await db.commit()
+
+                evaluation = await PredictionEvaluationService(db).evaluate_all_predictions()
+                match = await db.scalar(select(Match).where(Match.api_fixture_id == fixture_id))
+                result = await db.scalar(select(MatchResult).where(MatchResult.match_id == match.id))
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+        return evaluation, (result.home_score, result.away_score)
+
+    evaluation, score = asyncio.run(run())
+    assert score == (9, 9)
+    assert evaluation["total_processed"] == 1
+
+
+@pytest.mark.parametrize("final_status", ["FT", "PEN"])
+def test_live_poller_applies_deltas_and_evaluates(create_test_db, final_status):
+    dataset = SyntheticDataset(leagues=1, fixtures_per_season=10)
+    fake = FakeFootballAPI(dataset, rate_limit_per_minute=100000, daily_limit=100000)
+    fixture_id = dataset.fixture_id(1, 2024, 3)
+    dataset.set_fixture_state(fixture_id, "NS")
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        poller = LiveMatchPoller(session_factory=session_factory)
+        ticks = []
+
+        async def state():
+            async with session_factory() as db:
+                match = await db.scalar(select(Match).where(Match.api_fixture_id == fixture_id))
+                result = await db.scalar(select(MatchResult).where(MatchResult.match_id == match.id))
+                outcomes = await db.scalar(
+                    select(func.count(PredictionOutcome.id))
+                    .join(Prediction, Prediction.id == PredictionOutcome.prediction_id)
+                    .where(Prediction.match_id == match.id)
+                )
+                return match.status, (result.home_score, result.away_score) if result else None, outcomes
+
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                await MatchSyncService(db).sync_matches()
+                await PredictionSyncService(db).sync_predictions()
+
+            for status, score in (("1H", (1, 0)), (final_status, (2, 0))):
+                dataset.set_fixture_state(fixture_id, status, *score)
+                before = fake.calls["fixtures"]
+                stats = await poller.poll_once()
+                ticks.append((fake.calls["fixtures"] - before, stats, await state()))
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+        return ticks
+
+    (live_calls, live_stats, live_state), (end_calls, end_stats, end_state) = asyncio.run(run())
+    assert live_calls == 1 and live_stats["live_matches"] == 1
+    assert live_state == ("1H", (1, 0), 0)
+    # Sorti du live : relu par ids, passé à un statut joué (FT, AET, PEN) et évalué
+    assert end_calls == 2 and end_stats["finished_matches"] == 1
+    assert end_stats["evaluated_predictions"] == 1
+    assert end_state == (final_status, (2, 0), 1)
+
+
+def test_prefetch_planner_orders_by_kickoff_within_budgets(create_test_db, monkeypatch):
+    monkeypatch.setattr(settings, "PREDICTION_PRIORITY_LEAGUES", [2])
+    monkeypatch.setattr(settings, "PREDICTION_DAILY_BUDGETS", {"imminent": 5, "upcoming": 100, "recent": 100, "history": 3})
+    now = datetime(2024, 8, 14)
+    dataset = SyntheticDataset(leagues=2, fixtures_per_season=40, now=now.replace(tzinfo=timezone.utc))
+    fake = FakeFootballAPI(dataset, rate_limit_per_minute=100000, daily_limit=100000)
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                await MatchSyncService(db).sync_matches(incremental=False)
+                service = PredictionSyncService(db)
+                first = await service.prefetch_predictions(now=now)
+                synced = (await db.execute(
+                    select(Match.api_fixture_id).where(Match.predictions_synced.is_(True))
+                )).scalars().all()
+                # Relance le même jour : budgets imminent et history épuisés
+                second = await service.prefetch_predictions(now=now)
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+        return first, set(synced), second
+
+    first, synced, second = asyncio.run(run())
+    assert first["planned"] == {"imminent": 5, "upcoming": 20, "recent": 0, "history": 3}
+    assert first["synced_matches"] == 28
+    # Imminents : league prioritaire, coups d'envoi les plus proches
+    assert {dataset.fixture_id(2, 2024, index) for index in (20, 24, 28, 21, 25)} <= synced
+    # Historique : les matchs joués le plus récemment
+    assert len({dataset.fixture_id(league, 2024, index) for league in (1, 2) for index in range(10, 20)} & synced) == 3
+    assert second["total_matches"] == 0 and second["remaining_budgets"]["history"] == 0
+
+
+def test_prefetch_budget_charges_only_fetched_predictions(create_test_db, monkeypatch):
+    monkeypatch.setattr(settings, "PREDICTION_SYNC_WORKERS", 2)
+    monkeypatch.setattr(settings, "PREDICTION_DAILY_BUDGETS", {"imminent": 5})
+    now = datetime(2024, 8, 14)
+    dataset = SyntheticDataset(leagues=2, fixtures_per_season=40, now=now.replace(tzinfo=timezone.utc))
+    fake = FakeFootballAPI(dataset, rate_limit_per_minute=100000, daily_limit=100000)
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                await MatchSyncService(db).sync_matches(incremental=False)
+                service = PredictionSyncService(db)
+
+                # Quota épuisé après 2 appels : les matchs planifiés non récupérés gardent leur budget
+                limiter = apiRate_limiter_service.get_rate_limiter()
+                limiter.configured_max_calls_per_day = limiter.max_calls_per_day = limiter.calls_made_today + 2
+                exhausted = await service.prefetch_predictions(now=now)
+
+                limiter.configured_max_calls_per_day = limiter.max_calls_per_day = 100000
+                resumed = await service.prefetch_predictions(now=now)
+        finally:
+            await http_client.close_http_client()
+            await engine.dispose()
+        return exhausted, resumed
+
+    exhausted, resumed = asyncio.run(run())
+    assert exhausted["planned"]["imminent"] == 5 and exhausted["quota_exhausted"] is True
+    assert exhausted["synced_matches"] == 2
+    assert exhausted["remaining_budgets"]["imminent"] == 3
+    assert resumed["planned"]["imminent"] == resumed["synced_matches"] == 3
+    assert resumed["remaining_budgets"]["imminent"] == 0
+
+
+def test_job_runner_runs_tracks_and_cancels(create_test_db):
+    fake = FakeFootballAPI(
+        SyntheticDataset(leagues=2, fixtures_per_season=20),
+        rate_limit_per_minute=100000,
+        daily_limit=100000,
+    )
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        await http_client.init_http_client(transport=fake.transport())
+        runner = JobRunner(session_factory, poll_interval=0.01, worker_name="test")
+        try:
+            async with session_factory() as db:
+                for job_type in ("leagues", "matches"):
+                    job = await submit_job(db, job_type)
+                    await runner.run_once()
+                    await runner.join()
+                    await db.refresh(job)
+                    if job_type == "matches":
+                        matches_job = job_as_dict(job)
+
+                # Une seule tâche active par type
+                first = await submit_job(db, "predictions")
+                try:
+                    await submit_job(db, "predictions")
+                    duplicate = None
+                except JobAlreadyActive as e:
+                    duplicate = e.job_id
+
+                # Annulation d'une tâche en cours, prise en compte au tick suivant
+                fake.latency = 0.02
+                await runner.run_once()
+                while not fake.calls["predictions"]:
+                    await asyncio.sleep(0.01)
+                await request_cancel(db, first.id)
+                await runner.run_once()
+                await runner.join()
+                await db.refresh(first)
+                cancelled = job_as_dict(first)
+                synced = await db.scalar(select(func.count()).where(Match.predictions_synced.is_(True)))
+                total = await db.scalar(select(func.count()).select_from(Match))
+                statuses = (await db.execute(select(SyncJob.status).order_by(SyncJob.id))).scalars().all()
+        finally:
+            await runner.stop()
+            await http_client.close_http_client()
+            await engine.dispose()
+        return matches_job, duplicate, first.id, cancelled, synced, total, statuses
+
+    matches_job, duplicate, first_id, cancelled, synced, total, statuses = asyncio.run(run())
+    assert matches_job["status"] == "succeeded"
+    assert matches_job["result"]["synced_matches"] == 2 * len(SyntheticDataset().seasons) * 20
+    assert matches_job["progress"]["total"] == matches_job["progress"]["done"] + 1
+    assert duplicate == first_id
+    assert cancelled["status"] == "cancelled" and cancelled["finished_at"] is not None
+    assert synced < total
+    assert statuses == ["succeeded", "succeeded", "cancelled"]
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app.models import SyncJob
+from app.services.job_service import JobAlreadyActive, submit_job, SUCCEEDED
+
+
+def test_one_active_job_per_type_enforced_by_database(create_test_db):
+    async def run():
+        engine, session_factory = await create_test_db()
+        try:
+            async with session_factory() as db:
+                first_id = (await submit_job(db, "matches", {"incremental": True})).id
+                other_id = (await submit_job(db, "leagues")).id
+
+                # Écriture concurrente qui aurait passé une vérification préalable
+                db.add(SyncJob(job_type="matches", status="pending", progress_done=0, cancel_requested=False))
+                with pytest.raises(IntegrityError):
+                    await db.commit()
+                await db.rollback()
+
+                with pytest.raises(JobAlreadyActive) as duplicate:
+                    await submit_job(db, "matches")
+
+                await db.execute(update(SyncJob).where(SyncJob.id == first_id).values(status=SUCCEEDED))
+                await db.commit()
+                second_id = (await submit_job(db, "matches")).id
+        finally:
+            await engine.dispose()
+        return first_id, other_id, duplicate.value.job_id, second_id
+
+    first_id, other_id, duplicate_id, second_id = asyncio.run(run())
+    assert duplicate_id == first_id
+    assert len({first_id, other_id, second_id}) == 3
@@ -0,0 +1,162 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.models import League, Match, MatchResult, Prediction, PredictionAccuracy
+from app.models.prediction import PredictionComparison, PredictionOutcome, PredictionTeam
+from app.services.prediction_accuracy_service import PredictionAccuracyRollup
+from app.services.sync.predictions_service import parse_advice
+from prediction_outcome_service import PredictionEvaluationService
+
+
+async def _add_prediction(db, league, fixture_id, score, **prediction_fields):
+    match = Match(
+        api_fixture_id=fixture_id, league_id=league.id, date=datetime(2024, 1, 1), status="FT",
+        home_team="Home", home_team_id=1, away_team="Away", away_team_id=2
+    )
+    db.add(match)
+    await db.flush()
+    db.add(MatchResult(match_id=match.id, home_score=score[0], away_score=score[1]))
+    advice_category, advice_selection = parse_advice(prediction_fields.get("advice"))
+    prediction = Prediction(
+        match_id=match.id, advice_category=advice_category, advice_selection=advice_selection, **prediction_fields
+    )
+    db.add(prediction)
+    await db.flush()
+    return prediction
+
+
+def test_bulk_evaluation_matches_row_semantics(create_test_db):
+    async def run():
+        engine, session_factory = await create_test_db()
+        async with session_factory() as db:
+            league = League(api_id=1, name="League", type="League")
+            db.add(league)
+            await db.flush()
+
+            home_win = await _add_prediction(
+                db, league, 1, (2, 1), winner_id=1, winner_name="Home", win_or_draw=True,
+                under_over="2.5 over", goals_home="2", goals_away="1", advice="Winner : Home"
+            )
+            db.add(PredictionComparison(
+                prediction_id=home_win.id, form_home=60, form_away=40, att_home=50, att_away=50,
+                def_home=50, def_away=50, h2h_home=50, h2h_away=50,
+                poisson_distribution_home=70, poisson_distribution_away=30
+            ))
+            db.add(PredictionTeam(prediction_id=home_win.id, is_home=True, team_id=1, team_name="Home", last_5_form=80))
+            db.add(PredictionTeam(prediction_id=home_win.id, is_home=False, team_id=2, team_name="Away", last_5_form=30))
+
+            draw = await _add_prediction(
+                db, league, 2, (1, 1), winner_id=1, winner_name="Home", win_or_draw=False,
+                under_over="-1.5", goals_home="abc", advice="Combo Winner : Home and -2.5 goals"
+            )
+            db.add(PredictionOutcome(
+                prediction_id=draw.id, both_teams_scored=False, winner_prediction_correct=True,
+                win_or_draw_prediction_correct=True
+            ))
+
+            # Comparaison incomplète : erreur, mais les premiers champs sont écrits
+            incomplete = await _add_prediction(db, league, 3, (0, 3), winner_id=2, advice="Double chance : draw or Away")
+            db.add(PredictionComparison(prediction_id=incomplete.id, form_home=50))
+            await db.commit()
+
+            stats = await PredictionEvaluationService(db).evaluate_all_predictions()
+            assert stats["total_processed"] == 3
+            assert stats["successful_evaluations"] == 2
+            assert len(stats["errors"]) == 1 and str(incomplete.id) in stats["errors"][0]
+
+            result = await db.execute(select(PredictionOutcome).order_by(PredictionOutcome.prediction_id))
+            outcomes = {outcome.prediction_id: outcome for outcome in result.scalars()}
+            assert len(outcomes) == 3
+
+            first = outcomes[home_win.id]
+            assert first.both_teams_scored is True
+            assert first.winner_prediction_correct is True
+            assert first.win_or_draw_prediction_correct is True
+            assert first.under_over_prediction_correct is True
+            assert first.goals_prediction_accuracy == 100
+            assert first.pre_match_confidence == 0.25 * 20 + 0.2 * 40
+            assert first.form_difference == 50
+            # "Combo Winner" n'est plus compté avec "Winner"
+            assert first.historical_accuracy == 100
+
+            second = outcomes[draw.id]
+            assert second.winner_prediction_correct is False
+            assert second.win_or_draw_prediction_correct is True  # Conservé : win_or_draw faux
+            assert second.under_over_prediction_correct is False  # "-1.5" ne se parse pas
+            assert second.goals_prediction_accuracy == 0
+            assert second.pre_match_confidence == 0 and second.form_difference == 0
+
+            third = outcomes[incomplete.id]
+            assert third.winner_prediction_correct is True
+            assert third.goals_prediction_accuracy == 50
+            assert third.pre_match_confidence is None and third.historical_accuracy is None
+
+            # Cumul par type / ligue / saison, puis mise à jour incrémentale après correction d'un score
+            result = await db.execute(select(PredictionAccuracy))
+            rollup = {(row.prediction_type, row.league_id, row.season): (row.correct, row.total) for row in result.scalars()}
+            assert rollup[("Winner", 0, 0)] == (1, 1)
+            assert rollup[("Combo Winner", league.id, 0)] == (0, 1)
+            assert rollup[("Double chance", 0, 0)] == (1, 1)
+
+            draw_result = await db.scalar(select(MatchResult).where(MatchResult.match_id == draw.match_id))
+            draw_result.home_score = 2
+            await db.commit()
+            await PredictionEvaluationService(db).evaluate_all_predictions()
+
+            incremental = PredictionAccuracyRollup(db)
+            await incremental.load()
+            assert incremental.counts[("Combo Winner", 0, 0)] == [1, 1]
+            rebuilt = PredictionAccuracyRollup(db)
+            await rebuilt.rebuild()
+            assert rebuilt.counts == incremental.counts
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_parse_advice():
+    assert parse_advice("Combo Winner : Arsenal and -3.5 goals") == ("Combo Winner", "Arsenal and -3.5 goals")
+    assert parse_advice("Double chance : draw or Lyon") == ("Double chance", "draw or Lyon")
+    assert parse_advice("No predictions available") == ("No predictions available", None)
+    assert parse_advice("  ") == (None, None)
+    assert parse_advice(None) == (None, None)
+
+
+def test_incremental_evaluation_only_touches_changes(create_test_db):
+    async def run():
+        engine, session_factory = await create_test_db()
+        async with session_factory() as db:
+            league = League(api_id=1, name="League", type="League")
+            db.add(league)
+            await db.flush()
+            predictions = [
+                await _add_prediction(db, league, fixture_id, (1, 0), winner_id=1, advice="Winner : Home")
+                for fixture_id in range(1, 6)
+            ]
+            await db.commit()
+
+            service = PredictionEvaluationService(db)
+            assert (await service.evaluate_all_predictions())["total_processed"] == 5
+            assert (await service.evaluate_all_predictions())["total_processed"] == 0
+
+            # Un score corrigé et un nouveau match terminé
+            changed = await db.scalar(select(MatchResult).where(MatchResult.match_id == predictions[0].match_id))
+            changed.home_score = 0
+            changed.updated_at = datetime.utcnow()
+            await _add_prediction(db, league, 6, (2, 0), winner_id=1, advice="Winner : Home")
+            await db.commit()
+
+            stats = await service.evaluate_all_predictions()
+            assert stats["total_processed"] == 2
+            outcome = await db.scalar(
+                select(PredictionOutcome).where(PredictionOutcome.prediction_id == predictions[0].id)
+            )
+            assert outcome.winner_prediction_correct is False
+
+            assert (await service.evaluate_all_predictions(full=True))["total_processed"] == 6
+            assert service.accuracy.counts[("Winner", 0, 0)] == [5, 6]
+        await engine.dispose()
+
+    asyncio.run(run())
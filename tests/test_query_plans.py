@@ -0,0 +1,84 @@
+import asyncio
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app.api.football import http_client
+from app.api.football.fake_server import FakeFootballAPI, SyntheticDataset
+from app.core.config import settings
+from app.services import apiRate_limiter_service
+from app.services.apiRate_limiter_service import ApiRateLimiter
+from app.services.sync.league_service import LeagueSyncService
+from app.services.sync.match_service import MatchSyncService
+from app.services.sync.predictions_service import PredictionSyncService
+from prediction_outcome_service import PredictionEvaluationService
+
+# Tables qui grossissent avec le nombre de matchs : jamais de parcours complet sur une requête filtrée
+LARGE_TABLES = {
+    "matches", "match_results", "predictions",
+    "prediction_teams", "prediction_comparisons", "prediction_outcomes",
+}
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch):
+    monkeypatch.setattr(settings, "API_RETRY_BACKOFF_BASE", 0.0)
+    monkeypatch.setattr(apiRate_limiter_service, "_limiter", ApiRateLimiter(100000, 100000))
+
+
+def _full_scans(plan_rows, statement):
+    """Tables volumineuses parcourues sans index (alias SQLAlchemy "table_1" compris)"""
+    scans = []
+    for row in plan_rows:
+        match = re.fullmatch(r"SCAN (\w+)", row[3])
+        if match and re.sub(r"_\d+$", "", match.group(1)) in LARGE_TABLES:
+            scans.append(f"{row[3]} :: {statement[:200]}")
+    return scans
+
+
+def test_sync_and_evaluation_queries_use_indexes(create_test_db):
+    fake = FakeFootballAPI(
+        SyntheticDataset(leagues=2, fixtures_per_season=20),
+        rate_limit_per_minute=100000,
+        daily_limit=100000,
+    )
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            # Seules les requêtes filtrées sont vérifiées : un rebuild sans WHERE lit toute la table par construction
+            if not executemany and re.search(r"\bWHERE\b", statement) and statement.split()[0] in ("SELECT", "UPDATE", "DELETE"):
+                captured.append((statement, parameters))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        await http_client.init_http_client(transport=fake.transport())
+        try:
+            async with session_factory() as db:
+                await LeagueSyncService(db).sync_leagues()
+                await MatchSyncService(db).sync_matches()
+                await PredictionSyncService(db).sync_predictions()
+                service = PredictionEvaluationService(db)
+                await service.evaluate_all_predictions()
+                await service.evaluate_all_predictions()  # Passage incrémental (watermark)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+            await http_client.close_http_client()
+
+        scans = []
+        explained = set()
+        async with engine.connect() as conn:
+            for statement, parameters in captured:
+                if statement in explained:
+                    continue
+                explained.add(statement)
+                plan = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                scans.extend(_full_scans(plan.all(), statement))
+        await engine.dispose()
+        return explained, scans
+
+    explained, scans = asyncio.run(run())
+    assert any("prediction_outcomes" in statement for statement in explained)
+    assert scans == []
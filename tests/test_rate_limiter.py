@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import select
+
+from app.models import ApiUsage
+from app.services.apiRate_limiter_service import ApiRateLimiter, ApiQuotaExceeded
+
+
+def test_acquire_waits_when_bucket_is_empty():
+    async def run():
+        limiter = ApiRateLimiter(calls_per_minute=600, max_calls_per_day=1000)
+        limiter.tokens = 0.0  # Bucket vide : 10 jetons/s
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        return time.monotonic() - start, limiter.calls_made_today
+
+    elapsed, calls = asyncio.run(run())
+    assert elapsed >= 0.25
+    assert calls == 3
+
+
+def test_daily_quota_raises():
+    async def run():
+        limiter = ApiRateLimiter(calls_per_minute=100, max_calls_per_day=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        await limiter.acquire()
+
+    with pytest.raises(ApiQuotaExceeded):
+        asyncio.run(run())
+
+
+def test_counter_is_flushed_and_reloaded(create_test_db):
+    async def run():
+        engine, session_factory = await create_test_db()
+
+        limiter = ApiRateLimiter(100, 1000, session_factory=session_factory)
+        for _ in range(5):
+            await limiter.acquire()
+        await limiter.flush()
+
+        async with session_factory() as db:
+            stored = (await db.execute(select(ApiUsage.calls_made))).scalar_one()
+
+        restarted = ApiRateLimiter(100, 1000, session_factory=session_factory)
+        await restarted.load()
+        await engine.dispose()
+        return stored, restarted.calls_made_today
+
+    assert asyncio.run(run()) == (5, 5)
+
+
+def test_counter_is_shared_between_processes(create_test_db):
+    async def run():
+        engine, session_factory = await create_test_db()
+
+        # Web et worker : chacun ajoute ses appels au compteur commun, aucun n'écrase l'autre
+        web = ApiRateLimiter(100, 1000, session_factory=session_factory)
+        worker = ApiRateLimiter(100, 1000, session_factory=session_factory)
+        for _ in range(3):
+            await web.acquire()
+        for _ in range(4):
+            await worker.acquire()
+        await web.flush()
+        await worker.flush()
+        await web.acquire()
+        await web.flush()
+
+        async with session_factory() as db:
+            stored = (await db.execute(select(ApiUsage.calls_made))).scalar_one()
+        await engine.dispose()
+        return stored, web.calls_made_today, worker.calls_made_today
+
+    assert asyncio.run(run()) == (8, 8, 7)
+
+
+def test_limiter_follows_quota_headers_from_api(monkeypatch):
+    import httpx
+    from app.api.football.base_client import BaseAPIClient
+    from app.services import apiRate_limiter_service
+
+    limiter = ApiRateLimiter(calls_per_minute=450, max_calls_per_day=75000, headroom=2)
+    monkeypatch.setattr(apiRate_limiter_service, "_limiter", limiter)
+
+    def handler(request):
+        return httpx.Response(
+            200,
+            json={"response": []},
+            headers={
+                "X-RateLimit-Limit": "300",
+                "X-RateLimit-Remaining": "3",
+                "x-ratelimit-requests-limit": "7500",
+                "x-ratelimit-requests-remaining": "100",
+            },
+        )
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            await BaseAPIClient(http_client=http)._make_request("status")
+
+    asyncio.run(run())
+
+    assert limiter.calls_per_minute == 300
+    assert limiter.max_calls_per_day == 7500
+    assert limiter.tokens <= 1.0  # 3 restants - 2 de réserve
+    assert limiter.calls_made_today == 7500 - 98
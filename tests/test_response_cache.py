@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from app.api.football.response_cache import ResponseCache, default_ttl
+
+
+def test_key_ignores_param_order(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=10_000)
+    assert cache.make_key("fixtures", {"league": 39, "season": 2024}) == cache.make_key(
+        "fixtures", {"season": 2024, "league": 39}
+    )
+
+
+def test_expired_entries_are_not_returned(tmp_path):
+    async def run():
+        cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=10_000)
+        await cache.set("leagues", {}, {"response": [1]}, ttl=0.05)
+        await cache.set("fixtures", {"league": 1}, {"response": [2]}, ttl=None)
+        fresh = await cache.get("leagues", {})
+        time.sleep(0.1)
+        return fresh, await cache.get("leagues", {}), await cache.get("fixtures", {"league": 1})
+
+    assert asyncio.run(run()) == ({"response": [1]}, None, {"response": [2]})
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    async def run():
+        cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=250)
+        payload = {"response": ["x" * 80]}
+        await cache.set("predictions", {"fixture": 1}, payload, ttl=None)
+        await cache.set("predictions", {"fixture": 2}, payload, ttl=None)
+        await cache.get("predictions", {"fixture": 1})
+        await cache.set("predictions", {"fixture": 3}, payload, ttl=None)
+        return [await cache.get("predictions", {"fixture": i}) is not None for i in (1, 2, 3)]
+
+    assert asyncio.run(run()) == [True, False, True]
+
+
+def test_finished_fixtures_never_expire_and_live_is_not_cached():
+    finished = {"response": [{"fixture": {"status": {"short": "FT"}}}]}
+    upcoming = {"response": [{"fixture": {"status": {"short": "NS"}}}]}
+    assert default_ttl("fixtures", {"league": 39, "season": 2019}, finished) is None
+    assert default_ttl("fixtures", {"league": 39, "season": 2024}, upcoming) > 0
+    assert default_ttl("fixtures", {"live": "all"}, finished) == 0
@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models import SyncJob
+from app.services.scheduler_service import CronSchedule, SyncScheduler
+
+
+def test_cron_next_after():
+    moment = datetime(2026, 10, 18, 10, 7, 30)  # Dimanche
+    assert CronSchedule("5 * * * *").next_after(moment) == datetime(2026, 10, 18, 11, 5)
+    assert CronSchedule("*/15 * * * *").next_after(moment) == datetime(2026, 10, 18, 10, 15)
+    assert CronSchedule("0 4 * * 1").next_after(moment) == datetime(2026, 10, 19, 4, 0)
+    assert CronSchedule("0 4 * * 7").next_after(moment) == datetime(2026, 10, 25, 4, 0)
+    assert CronSchedule("30 9-17/4 * * *").next_after(moment) == datetime(2026, 10, 18, 13, 30)
+    assert CronSchedule("0 0 29 2 *").next_after(moment) == datetime(2028, 2, 29, 0, 0)
+    # Jour du mois et jour de la semaine restreints : l'un ou l'autre
+    assert CronSchedule("0 0 1 * 1").next_after(moment) == datetime(2026, 10, 19, 0, 0)
+
+    for expression in ("* * * *", "60 * * * *", "5-1 * * * *", "*/0 * * * *", "0 0 31 2 *"):
+        with pytest.raises(ValueError):
+            CronSchedule(expression).next_after(moment)
+
+
+def test_scheduler_fires_once_per_due_without_overlap(create_test_db):
+    start = datetime(2026, 10, 18, 10, 7)
+
+    async def run():
+        engine, session_factory = await create_test_db()
+        scheduler = SyncScheduler(
+            session_factory, schedules={"matches": "5 * * * *", "leagues": "0 4 * * 1"}, jitter=600
+        )
+        jitter = scheduler._jitter("matches", datetime(2026, 10, 18, 11, 5))
+        try:
+            ticks = [
+                await scheduler.run_once(start),  # Initialisation, pas de rattrapage
+                await scheduler.run_once(datetime(2026, 10, 18, 11, 5) + jitter - timedelta(seconds=1)),
+                await scheduler.run_once(datetime(2026, 10, 18, 11, 5) + jitter),
+                await scheduler.run_once(datetime(2026, 10, 18, 11, 30)),
+                # Échéance suivante alors que la tâche précédente est encore en attente
+                await scheduler.run_once(datetime(2026, 10, 18, 12, 30)),
+                # Arrêt de plusieurs heures : une seule exécution
+                await scheduler.run_once(datetime(2026, 10, 19, 9, 0)),
+            ]
+            async with session_factory() as db:
+                jobs = (await db.execute(select(SyncJob.job_type, SyncJob.params).order_by(SyncJob.id))).all()
+        finally:
+            await engine.dispose()
+        return ticks, jitter, jobs
+
+    ticks, jitter, jobs = asyncio.run(run())
+    assert timedelta(0) <= jitter <= timedelta(seconds=600)
+    assert ticks == [[], [], ["matches"], [], [], ["leagues"]]
+    assert jobs == [("matches", '{"incremental": true}'), ("leagues", "{}")]
@@ -0,0 +1,30 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.session import apply_sqlite_pragmas
+
+
+def test_profile_applied_and_readers_not_blocked(tmp_path):
+    async def run():
+        engine = apply_sqlite_pragmas(create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"))
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+            await conn.execute(text("INSERT INTO items (id) VALUES (1)"))
+
+        async with engine.connect() as writer, engine.connect() as reader:
+            pragmas = {
+                name: (await reader.execute(text(f"PRAGMA {name}"))).scalar()
+                for name in ("journal_mode", "synchronous", "temp_store", "busy_timeout")
+            }
+            # Transaction d'écriture ouverte : le lecteur voit le dernier état validé sans attendre
+            await writer.execute(text("INSERT INTO items (id) VALUES (2)"))
+            count = await asyncio.wait_for(reader.scalar(text("SELECT count(*) FROM items")), timeout=1)
+            await writer.rollback()
+        await engine.dispose()
+        return pragmas, count
+
+    pragmas, count = asyncio.run(run())
+    assert pragmas == {"journal_mode": "wal", "synchronous": 1, "temp_store": 2, "busy_timeout": 5000}
+    assert count == 1